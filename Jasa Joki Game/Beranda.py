@@ -8,14 +8,25 @@
 
 import streamlit as st
 from datetime import datetime
+from profiler import profil_halaman
+from backup_db import mulai_penjadwal_dari_env
 
 
+# Penjadwal backup opsional (aktif jika env JOKI_BACKUP_INTERVAL di-set).
+# cache_resource menjamin hanya satu thread untuk seluruh sesi.
+@st.cache_resource
+def get_penjadwal_backup():
+    return mulai_penjadwal_dari_env()
+
+
+@profil_halaman("Beranda")
 def main():
     # ------------------------------------------------------------
     # Konfigurasi awal halaman Streamlit
     # - Judul halaman, ikon, dan tata letak lebar penuh
     # ------------------------------------------------------------
     st.set_page_config(page_title="Beranda", page_icon="🏠", layout="wide")
+    get_penjadwal_backup()
 
     # Header utama
     st.title("👋 Selamat Datang di Aplikasi Joki Game")
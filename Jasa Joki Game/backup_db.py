@@ -0,0 +1,398 @@
+# ================================================================
+# File: backup_db.py
+# Deskripsi:
+# Alat backup online untuk database orders_joki. Snapshot diambil
+# dengan VACUUM INTO dalam satu transaksi baca, sehingga hasilnya
+# konsisten dan tidak diulang dari awal ketika ada order baru masuk
+# (berbeda dengan Backup API bertahap). DB dipastikan dalam mode WAL
+# sebelum snapshot (setup sudah mengaktifkannya); dalam mode WAL
+# transaksi baca tidak memblokir penulis. Jika WAL tidak bisa
+# diaktifkan, snapshot dibatalkan alih-alih mengunci form pemesanan.
+# Snapshot dikompresi (gzip), disertai manifest checksum, dirotasi
+# sesuai kebijakan retensi, dan dapat dipulihkan dengan verifikasi.
+#
+# Contoh:
+#   python backup_db.py backup
+#   python backup_db.py daftar
+#   python backup_db.py restore data/backup/orders_joki_20250101_120000.db.gz
+#   python backup_db.py jadwal --interval 60
+# ================================================================
+
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from konfigurasi import DB_PATH, FOLDER_BACKUP
+from database import aktifkan_wal
+
+# Jumlah halaman SQLite yang disalin per langkah saat restore
+HALAMAN_PER_LANGKAH = 256
+
+# Kebijakan retensi default: N snapshot terbaru + 1 per hari + 1 per minggu
+RETENSI_DEFAULT = {"terbaru": 24, "harian": 7, "mingguan": 4}
+
+# Env untuk menyalakan penjadwal backup dari dalam aplikasi Streamlit
+ENV_INTERVAL_BACKUP = "JOKI_BACKUP_INTERVAL"
+
+PREFIX_SNAPSHOT = "orders_joki_"
+EKSTENSI_SNAPSHOT = ".db.gz"
+FORMAT_WAKTU = "%Y%m%d_%H%M%S_%f"
+# Nama snapshot lama (sebelum presisi mikrodetik) tetap dikenali
+FORMAT_WAKTU_LAMA = "%Y%m%d_%H%M%S"
+
+
+# ================================================================
+# UTILITAS
+# ================================================================
+
+def _sha256_file(path: str, ukuran_blok: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(ukuran_blok), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def _salin_snapshot(db_path: str, path_tujuan: str):
+    """Salinan konsisten DB dalam satu transaksi baca.
+
+    Backup API bertahap (pages=N) mengulang dari halaman 0 setiap kali
+    koneksi lain menulis ke sumber, sehingga pada DB besar dengan order
+    yang terus masuk backup bisa tidak pernah selesai. Transaksi baca
+    tunggal hanya aman bagi penulis dalam mode WAL; dalam mode rollback
+    journal ia menahan lock SHARED selama penyalinan.
+    """
+    sumber = sqlite3.connect(db_path, timeout=10)
+    try:
+        if not aktifkan_wal(sumber):
+            raise sqlite3.OperationalError(
+                "DB tidak dalam mode WAL; snapshot dibatalkan agar order baru tidak terkunci")
+        if sqlite3.sqlite_version_info >= (3, 27, 0):
+            # path_tujuan harus belum ada untuk VACUUM INTO
+            if os.path.exists(path_tujuan):
+                os.remove(path_tujuan)
+            sumber.execute("VACUUM INTO ?", (path_tujuan,))
+        else:
+            tujuan = sqlite3.connect(path_tujuan)
+            try:
+                sumber.backup(tujuan)  # satu langkah: tidak bisa diulang di tengah jalan
+            finally:
+                tujuan.close()
+    finally:
+        sumber.close()
+
+
+def _cek_integritas(path: str) -> bool:
+    conn = sqlite3.connect(path)
+    try:
+        hasil = conn.execute("PRAGMA integrity_check").fetchone()
+        return hasil is not None and hasil[0] == "ok"
+    finally:
+        conn.close()
+
+
+def _path_manifest(path_snapshot: str) -> str:
+    return path_snapshot[:-len(EKSTENSI_SNAPSHOT)] + ".json"
+
+
+def _waktu_snapshot(nama_file: str) -> datetime.datetime | None:
+    inti = nama_file[len(PREFIX_SNAPSHOT):-len(EKSTENSI_SNAPSHOT)]
+    inti = inti.split("-", 1)[0]  # buang penghitung "-N" jika ada
+    for fmt in (FORMAT_WAKTU, FORMAT_WAKTU_LAMA):
+        try:
+            return datetime.datetime.strptime(inti, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+# ================================================================
+# BACKUP
+# ================================================================
+
+def _nama_snapshot_unik(folder: str, waktu: datetime.datetime) -> str:
+    """Nama snapshot dengan presisi mikrodetik, ditambah "-N" jika tetap bentrok."""
+    dasar = f"{PREFIX_SNAPSHOT}{waktu.strftime(FORMAT_WAKTU)}"
+    nama, nomor = dasar, 1
+    while os.path.exists(os.path.join(folder, nama + EKSTENSI_SNAPSHOT)):
+        nama = f"{dasar}-{nomor}"
+        nomor += 1
+    return nama
+
+
+def buat_snapshot(db_path: str = DB_PATH, folder: str = FOLDER_BACKUP) -> str | None:
+    """Membuat snapshot terkompresi dari DB yang sedang berjalan.
+
+    Mengembalikan path file .db.gz, atau None jika gagal.
+    """
+    os.makedirs(folder, exist_ok=True)
+    waktu = datetime.datetime.now()
+    nama = _nama_snapshot_unik(folder, waktu)
+    path_gz = os.path.join(folder, nama + EKSTENSI_SNAPSHOT)
+    fd, path_tmp = tempfile.mkstemp(prefix=nama, suffix=".db", dir=folder)
+    os.close(fd)
+
+    mulai = time.perf_counter()
+    try:
+        _salin_snapshot(db_path, path_tmp)
+
+        if not _cek_integritas(path_tmp):
+            print("❌ ERROR [backup_db.py] Snapshot gagal integrity_check.")
+            return None
+
+        # Kompresi dilakukan setelah backup selesai: tidak menahan lock DB
+        checksum = _sha256_file(path_tmp)
+        with open(path_tmp, "rb") as f_in, gzip.open(path_gz + ".tmp", "wb", compresslevel=6) as f_out:
+            shutil.copyfileobj(f_in, f_out, 1 << 20)
+        os.replace(path_gz + ".tmp", path_gz)
+
+        manifest = {
+            "sumber": os.path.abspath(db_path),
+            "dibuat": waktu.isoformat(timespec="microseconds"),
+            "ukuran_byte": os.path.getsize(path_tmp),
+            "ukuran_gz_byte": os.path.getsize(path_gz),
+            "sha256": checksum,
+            "durasi_detik": round(time.perf_counter() - mulai, 3),
+        }
+        with open(_path_manifest(path_gz), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        print(f"✅ Snapshot dibuat: {path_gz} "
+              f"({manifest['ukuran_byte']:,} → {manifest['ukuran_gz_byte']:,} byte, "
+              f"{manifest['durasi_detik']} detik)")
+        return path_gz
+    except (sqlite3.Error, OSError) as e:
+        print(f"❌ ERROR [backup_db.py] Backup gagal: {e}")
+        return None
+    finally:
+        for sisa in (path_tmp, path_gz + ".tmp"):
+            if os.path.exists(sisa):
+                os.remove(sisa)
+
+
+def daftar_snapshot(folder: str = FOLDER_BACKUP) -> list[tuple[datetime.datetime, str]]:
+    """Daftar snapshot (waktu, path) terurut dari yang terbaru."""
+    if not os.path.isdir(folder):
+        return []
+    hasil = []
+    for nama in os.listdir(folder):
+        if nama.startswith(PREFIX_SNAPSHOT) and nama.endswith(EKSTENSI_SNAPSHOT):
+            waktu = _waktu_snapshot(nama)
+            if waktu:
+                hasil.append((waktu, os.path.join(folder, nama)))
+    return sorted(hasil, reverse=True)
+
+
+# ================================================================
+# RETENSI
+# ---------------------------------------------------------------
+# Menyimpan N snapshot terbaru, ditambah snapshot terbaru pada setiap
+# hari (untuk H hari terakhir) dan setiap minggu (untuk M minggu).
+# ================================================================
+
+def pilih_snapshot_disimpan(snapshot: list[tuple[datetime.datetime, str]],
+                            terbaru: int, harian: int, mingguan: int) -> set[str]:
+    simpan = {path for _, path in snapshot[:terbaru]}
+    hari_terlihat, minggu_terlihat = set(), set()
+    for waktu, path in snapshot:  # sudah terurut terbaru → terlama
+        hari = waktu.date()
+        minggu = waktu.isocalendar()[:2]
+        if hari not in hari_terlihat and len(hari_terlihat) < harian:
+            hari_terlihat.add(hari)
+            simpan.add(path)
+        if minggu not in minggu_terlihat and len(minggu_terlihat) < mingguan:
+            minggu_terlihat.add(minggu)
+            simpan.add(path)
+    return simpan
+
+
+def terapkan_retensi(folder: str = FOLDER_BACKUP, terbaru: int = RETENSI_DEFAULT["terbaru"],
+                     harian: int = RETENSI_DEFAULT["harian"],
+                     mingguan: int = RETENSI_DEFAULT["mingguan"]) -> list[str]:
+    """Menghapus snapshot di luar kebijakan retensi. Mengembalikan path terhapus."""
+    snapshot = daftar_snapshot(folder)
+    simpan = pilih_snapshot_disimpan(snapshot, terbaru, harian, mingguan)
+    terhapus = []
+    for _, path in snapshot:
+        if path not in simpan:
+            os.remove(path)
+            if os.path.exists(_path_manifest(path)):
+                os.remove(_path_manifest(path))
+            terhapus.append(path)
+    if terhapus:
+        print(f"🧹 Retensi: {len(terhapus)} snapshot lama dihapus.")
+    return terhapus
+
+
+# ================================================================
+# RESTORE
+# ================================================================
+
+def verifikasi_snapshot(path_gz: str, path_tujuan_tmp: str) -> bool:
+    """Dekompresi snapshot lalu cek checksum manifest dan integrity_check."""
+    with gzip.open(path_gz, "rb") as f_in, open(path_tujuan_tmp, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out, 1 << 20)
+
+    path_manifest = _path_manifest(path_gz)
+    if os.path.exists(path_manifest):
+        with open(path_manifest, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if _sha256_file(path_tujuan_tmp) != manifest.get("sha256"):
+            print("❌ Checksum snapshot tidak cocok dengan manifest.")
+            return False
+    else:
+        print("⚠️  Manifest tidak ditemukan, hanya integrity_check yang dijalankan.")
+
+    if not _cek_integritas(path_tujuan_tmp):
+        print("❌ Snapshot gagal integrity_check.")
+        return False
+    return True
+
+
+def restore_snapshot(path_gz: str, db_path: str = DB_PATH,
+                     halaman_per_langkah: int = HALAMAN_PER_LANGKAH) -> bool:
+    """Memulihkan snapshot ke db_path setelah diverifikasi.
+
+    Penulisan memakai Backup API ke koneksi tujuan, sehingga koneksi
+    aplikasi lain melihat DB lama atau DB baru secara utuh (bukan file
+    setengah tersalin).
+    """
+    folder_tmp = tempfile.mkdtemp(prefix="joki_restore_")
+    path_tmp = os.path.join(folder_tmp, "restore.db")
+    try:
+        if not verifikasi_snapshot(path_gz, path_tmp):
+            return False
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        sumber = sqlite3.connect(path_tmp)
+        tujuan = sqlite3.connect(db_path, timeout=30)
+        try:
+            sumber.backup(tujuan, pages=halaman_per_langkah)
+        finally:
+            tujuan.close()
+            sumber.close()
+
+        if not _cek_integritas(db_path):
+            print("❌ DB hasil restore gagal integrity_check.")
+            return False
+        print(f"✅ Restore selesai: {path_gz} → {db_path}")
+        return True
+    except (sqlite3.Error, OSError) as e:
+        print(f"❌ ERROR [backup_db.py] Restore gagal: {e}")
+        return False
+    finally:
+        shutil.rmtree(folder_tmp, ignore_errors=True)
+
+
+# ================================================================
+# PENJADWAL (thread latar belakang opsional)
+# ================================================================
+
+class PenjadwalBackup(threading.Thread):
+    """Thread daemon yang membuat snapshot + retensi setiap interval."""
+
+    def __init__(self, interval_menit: float, db_path: str = DB_PATH,
+                 folder: str = FOLDER_BACKUP, retensi: dict | None = None):
+        super().__init__(name="PenjadwalBackup", daemon=True)
+        self.interval_detik = interval_menit * 60
+        self.db_path = db_path
+        self.folder = folder
+        self.retensi = retensi or RETENSI_DEFAULT
+        self._berhenti = threading.Event()
+
+    def run(self):
+        print(f"⏰ Penjadwal backup aktif (setiap {self.interval_detik / 60:g} menit).")
+        while not self._berhenti.is_set():
+            if buat_snapshot(self.db_path, self.folder):
+                terapkan_retensi(self.folder, **self.retensi)
+            self._berhenti.wait(self.interval_detik)
+
+    def hentikan(self):
+        self._berhenti.set()
+
+
+def mulai_penjadwal_dari_env() -> PenjadwalBackup | None:
+    """Menyalakan penjadwal jika env JOKI_BACKUP_INTERVAL (menit) di-set."""
+    interval = os.environ.get(ENV_INTERVAL_BACKUP, "").strip()
+    if not interval:
+        return None
+    try:
+        penjadwal = PenjadwalBackup(float(interval))
+    except ValueError:
+        print(f"⚠️  {ENV_INTERVAL_BACKUP}='{interval}' bukan angka, penjadwal tidak aktif.")
+        return None
+    penjadwal.start()
+    return penjadwal
+
+
+# ================================================================
+# CLI
+# ================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backup/restore online database orders_joki.")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    p_backup = sub.add_parser("backup", help="Buat satu snapshot sekarang")
+    p_backup.add_argument("--tanpa-retensi", action="store_true",
+                          help="Jangan hapus snapshot lama setelah backup")
+
+    sub.add_parser("daftar", help="Tampilkan snapshot yang tersedia")
+
+    p_restore = sub.add_parser("restore", help="Pulihkan snapshot terverifikasi")
+    p_restore.add_argument("snapshot", help="Path file .db.gz")
+    p_restore.add_argument("--tujuan", default=DB_PATH,
+                           help="Path DB tujuan (default: DB aplikasi)")
+
+    p_jadwal = sub.add_parser("jadwal", help="Jalankan penjadwal backup di foreground")
+    p_jadwal.add_argument("--interval", type=float, default=60,
+                          help="Interval backup dalam menit (default: 60)")
+
+    for p in (p_backup, p_jadwal):
+        p.add_argument("--simpan-terbaru", type=int, default=RETENSI_DEFAULT["terbaru"])
+        p.add_argument("--simpan-harian", type=int, default=RETENSI_DEFAULT["harian"])
+        p.add_argument("--simpan-mingguan", type=int, default=RETENSI_DEFAULT["mingguan"])
+
+    args = parser.parse_args()
+
+    if args.perintah == "daftar":
+        snapshot = daftar_snapshot()
+        if not snapshot:
+            print("Belum ada snapshot.")
+        for waktu, path in snapshot:
+            print(f"{waktu:%Y-%m-%d %H:%M:%S}  {os.path.getsize(path):>12,} byte  {path}")
+        return
+
+    if args.perintah == "restore":
+        raise SystemExit(0 if restore_snapshot(args.snapshot, args.tujuan) else 1)
+
+    retensi = {"terbaru": args.simpan_terbaru, "harian": args.simpan_harian,
+               "mingguan": args.simpan_mingguan}
+    if args.perintah == "backup":
+        path = buat_snapshot()
+        if path and not args.tanpa_retensi:
+            terapkan_retensi(**retensi)
+        raise SystemExit(0 if path else 1)
+
+    if args.perintah == "jadwal":
+        penjadwal = PenjadwalBackup(args.interval, retensi=retensi)
+        penjadwal.start()
+        try:
+            while penjadwal.is_alive():
+                penjadwal.join(1)
+        except KeyboardInterrupt:
+            penjadwal.hentikan()
+            print("\nPenjadwal backup dihentikan.")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,47 @@ def get_db_connection() -> sqlite3.Connection | None:
         print(f"ERROR [database.py] Koneksi DB gagal: {e}")
         return None
 
+# Mengaktifkan journal_mode=WAL (tersimpan permanen di file DB). Dalam
+# mode WAL pembaca, termasuk snapshot backup_db.py, tidak memblokir
+# penulis form pemesanan.
+
+
+def aktifkan_wal(conn: sqlite3.Connection) -> bool:
+    try:
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        return str(mode).lower() == "wal"
+    except sqlite3.Error as e:
+        print(f"ERROR [database.py] Gagal mengaktifkan WAL: {e}")
+        return False
+
+# Pelacak perubahan untuk mirror Parquet (mirror_analitik.py): trigger
+# mencatat bulan (YYYY-MM) lama dan baru dari setiap order yang diubah
+# atau dihapus. Bulan NULL (tanggal tidak valid) diabaikan saat sinkron.
+SKEMA_PELACAK_MIRROR = """
+CREATE TABLE IF NOT EXISTS mirror_perubahan (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    bulan TEXT
+);
+CREATE TRIGGER IF NOT EXISTS mirror_orders_update AFTER UPDATE ON orders_joki
+BEGIN
+    INSERT INTO mirror_perubahan (bulan) VALUES (strftime('%Y-%m', OLD.tanggal_order));
+    INSERT INTO mirror_perubahan (bulan) VALUES (strftime('%Y-%m', NEW.tanggal_order));
+END;
+CREATE TRIGGER IF NOT EXISTS mirror_orders_delete AFTER DELETE ON orders_joki
+BEGIN
+    INSERT INTO mirror_perubahan (bulan) VALUES (strftime('%Y-%m', OLD.tanggal_order));
+END;
+"""
+
+
+def pasang_pelacak_mirror(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.executescript(SKEMA_PELACAK_MIRROR)
+        return True
+    except sqlite3.Error as e:
+        print(f"ERROR [database.py] Gagal memasang pelacak mirror: {e}")
+        return False
+
 # Menjalankan query umum (insert, update, delete)
 
 
@@ -109,6 +150,8 @@ def setup_database_initial() -> bool:
         """
         cursor.execute(query)
         conn.commit()
+        aktifkan_wal(conn)
+        pasang_pelacak_mirror(conn)
         print("✅ Tabel 'orders_joki' siap digunakan.")
         return True
     except sqlite3.Error as e:
@@ -147,6 +190,16 @@ def get_all_orders() -> list[sqlite3.Row] | None:
     query = "SELECT * FROM orders_joki ORDER BY tanggal_order DESC;"
     return fetch_query(query)
 
+# Mengambil tanggal order paling awal dan paling akhir (untuk filter)
+
+
+def get_rentang_tanggal_order() -> tuple[str, str] | None:
+    query = "SELECT MIN(tanggal_order), MAX(tanggal_order) FROM orders_joki;"
+    row = fetch_query(query, fetch_all=False)
+    if not row or row[0] is None:
+        return None
+    return str(row[0]), str(row[1])
+
 # Mengubah baris data menjadi objek OrderJoki (berbasis class OOP)
 
 
@@ -180,32 +233,70 @@ def delete_order_by_id(order_id: int) -> bool:
     affected = execute_query(query, (order_id,), return_type="rowcount")
     return affected is not None and affected > 0
 
+# Kolom yang boleh diupdate (urutan tetap agar teks SQL selalu sama
+# untuk kombinasi field yang sama -> statement cache SQLite terpakai)
+ALLOWED_UPDATE_KEYS = (
+    "nama_pelanggan", "email", "password", "no_hp", "game",
+    "rank_awal", "rank_tujuan", "harga_total", "metode_pembayaran"
+)
+
+# Menyusun query UPDATE kanonik untuk sekumpulan field
+
+
+def _fields_valid(data: dict) -> tuple[str, ...]:
+    return tuple(key for key in ALLOWED_UPDATE_KEYS if key in data)
+
+
+def _query_update(fields: tuple[str, ...]) -> str:
+    set_clause = ", ".join(f"{key} = ?" for key in fields)
+    return f"UPDATE orders_joki SET {set_clause} WHERE id = ?;"
+
 # Melakukan update terhadap data pesanan tertentu
 
 
 def update_order(order_id: int, data: dict) -> bool:
-    allowed_keys = {
-        "nama_pelanggan", "email", "password", "no_hp", "game",
-        "rank_awal", "rank_tujuan", "harga_total", "metode_pembayaran"
-    }
-    update_fields = []
-    params = []
-
-    for key in data:
-        if key in allowed_keys:
-            update_fields.append(f"{key} = ?")
-            params.append(data[key])
-
-    if not update_fields:
+    fields = _fields_valid(data)
+    if not fields:
         print("Tidak ada field yang valid untuk diupdate.")
         return False
 
-    query = f"""
-        UPDATE orders_joki
-        SET {', '.join(update_fields)}
-        WHERE id = ?;
-    """
-    params.append(order_id)
-
-    result = execute_query(query, tuple(params))
+    params = tuple(data[key] for key in fields) + (order_id,)
+    result = execute_query(_query_update(fields), params)
     return result is not None and result > 0
+
+# Melakukan update banyak pesanan sekaligus dalam satu transaksi.
+# changes: {order_id: {field: nilai, ...}, ...}
+# Update dikelompokkan berdasarkan kombinasi field, lalu tiap kelompok
+# dijalankan dengan satu executemany (satu prepared statement).
+# Mengembalikan jumlah baris yang terupdate, atau None jika gagal.
+
+
+def update_orders_bulk(changes: dict[int, dict]) -> int | None:
+    kelompok: dict[tuple[str, ...], list[tuple]] = {}
+    for order_id, data in changes.items():
+        fields = _fields_valid(data)
+        if not fields:
+            print(f"Order ID {order_id}: tidak ada field valid, dilewati.")
+            continue
+        params = tuple(data[key] for key in fields) + (order_id,)
+        kelompok.setdefault(fields, []).append(params)
+
+    if not kelompok:
+        print("Tidak ada field yang valid untuk diupdate.")
+        return 0
+
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        total = 0
+        with conn:  # Satu transaksi: commit jika sukses, rollback jika error
+            for fields, daftar_params in kelompok.items():
+                cursor = conn.executemany(_query_update(fields), daftar_params)
+                total += cursor.rowcount
+        return total
+    except sqlite3.Error as e:
+        print(f"ERROR [database.py] Bulk update gagal: {e}")
+        return None
+    finally:
+        conn.close()
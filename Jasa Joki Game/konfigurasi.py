@@ -14,7 +14,20 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 NAMA_DB = 'orders_joki.db'
 
 # Path absolut ke file database SQLite
-DB_PATH = os.path.join(BASE_DIR, 'data', NAMA_DB)
+# (dapat dialihkan lewat env JOKI_DB_PATH, misal untuk uji beban/backup)
+DB_PATH = os.environ.get("JOKI_DB_PATH") or os.path.join(BASE_DIR, 'data', NAMA_DB)
+
+# Folder penyimpanan snapshot backup database (lihat backup_db.py)
+FOLDER_BACKUP = os.path.join(BASE_DIR, 'data', 'backup')
+
+# Folder mirror Parquet untuk laporan berat (lihat mirror_analitik.py)
+FOLDER_ANALITIK = os.path.join(BASE_DIR, 'data', 'analitik')
+
+# Rentang tanggal (hari) mulai dari mana statistik memakai mirror Parquet
+AMBANG_HARI_MIRROR = 90
+
+# Interval sinkronisasi mirror Parquet di thread latar aplikasi (detik)
+INTERVAL_SINKRON_MIRROR = 60
 
 # Daftar game yang didukung dalam layanan joki
 DAFTAR_GAMES = ["Mobile Legends", "PUBG Mobile", "Free Fire"]
@@ -90,6 +90,13 @@ class ManajerOrderJoki(BaseOrderManager):
             self.refresh_data()
         return success
 
+    def update_orders_bulk(self, changes: dict[int, dict]) -> int | None:
+        """Update banyak order dalam satu transaksi, cache di-refresh sekali."""
+        jumlah = database.update_orders_bulk(changes)
+        if jumlah:
+            self.refresh_data()
+        return jumlah
+
     def get_all_orders(self) -> List[OrderJoki]:
         """Mengembalikan semua order dalam bentuk list objek."""
         return self._semua_order
@@ -0,0 +1,389 @@
+# ================================================================
+# File: mirror_analitik.py
+# Deskripsi:
+# Mirror kolumnar (Parquet) dari tabel orders_joki untuk laporan
+# berat. Data dipartisi per bulan dengan gaya Hive
+# (bulan=YYYY-MM/part-*.parquet) sehingga bisa dibaca langsung oleh
+# pandas/pyarrow maupun DuckDB (read_parquet(..., hive_partitioning=1)).
+# Sinkronisasi bersifat inkremental:
+# - order baru: baris dengan id > watermark ditambahkan,
+# - order yang diubah/dihapus: trigger SQLite mencatat bulan yang
+#   terdampak ke tabel mirror_perubahan, lalu partisi bulan tersebut
+#   ditulis ulang dari SQLite pada sinkronisasi berikutnya.
+# Trigger menangkap semua jalur tulis (halaman Riwayat,
+# update_orders_bulk, maupun tool lain yang menulis ke DB) dan dipasang
+# oleh setup database (database.pasang_pelacak_mirror).
+#
+# Sinkronisasi TIDAK dijalankan di dalam request halaman: aplikasi
+# memakai thread latar (mulai_sinkron_latar) dengan interval
+# INTERVAL_SINKRON_MIRROR, atau jalankan CLI ini. Halaman statistik hanya
+# membaca mirror jika sinkronisasi terakhir berhasil (mirror_siap) dan
+# selain itu kembali ke SQLite.
+# ================================================================
+
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+import database
+from konfigurasi import FOLDER_ANALITIK, INTERVAL_SINKRON_MIRROR
+
+# pyarrow bersifat opsional: tanpa pyarrow, halaman statistik tetap
+# memakai jalur SQLite biasa.
+PARQUET_TERSEDIA = importlib.util.find_spec("pyarrow") is not None
+
+FOLDER_ORDERS = os.path.join(FOLDER_ANALITIK, "orders")
+PATH_WATERMARK = os.path.join(FOLDER_ANALITIK, "watermark.json")
+PATH_STATUS = os.path.join(FOLDER_ANALITIK, "status.json")
+FOLDER_TULIS_ULANG = os.path.join(FOLDER_ANALITIK, "tulis_ulang")
+
+# Kolom yang dicerminkan. Password sengaja tidak ikut disalin.
+KOLOM_MIRROR = (
+    "id", "nama_pelanggan", "email", "no_hp", "game", "rank_awal",
+    "rank_tujuan", "harga_total", "metode_pembayaran", "tanggal_order"
+)
+
+# Jumlah baris per potongan saat membaca dari SQLite
+UKURAN_CHUNK = 50_000
+
+# Mencegah dua sinkronisasi berjalan bersamaan dalam satu proses
+_lock_sinkron = threading.Lock()
+
+TRIGGER_PELACAK = ("mirror_orders_update", "mirror_orders_delete")
+
+
+# ================================================================
+# WATERMARK
+# ================================================================
+
+def _baca_info_watermark() -> dict:
+    try:
+        with open(PATH_WATERMARK, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def baca_watermark() -> int:
+    try:
+        return int(_baca_info_watermark().get("id_terakhir", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _tulis_watermark(id_terakhir: int):
+    os.makedirs(FOLDER_ANALITIK, exist_ok=True)
+    path_tmp = PATH_WATERMARK + ".tmp"
+    with open(path_tmp, "w", encoding="utf-8") as f:
+        # "lacak_perubahan" menandai mirror dibangun saat trigger sudah aktif
+        json.dump({"id_terakhir": id_terakhir, "lacak_perubahan": True,
+                   "diperbarui": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+    os.replace(path_tmp, PATH_WATERMARK)
+
+
+# ================================================================
+# STATUS SINKRONISASI
+# ---------------------------------------------------------------
+# Disimpan di file agar proses lain (aplikasi vs CLI) melihat hasil
+# sinkronisasi terakhir.
+# ================================================================
+
+def baca_status() -> dict:
+    try:
+        with open(PATH_STATUS, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _tulis_status(berhasil: bool, pesan: str = ""):
+    os.makedirs(FOLDER_ANALITIK, exist_ok=True)
+    path_tmp = PATH_STATUS + ".tmp"
+    with open(path_tmp, "w", encoding="utf-8") as f:
+        json.dump({"berhasil": berhasil, "pesan": pesan,
+                   "waktu": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+    os.replace(path_tmp, PATH_STATUS)
+
+
+def mirror_siap() -> bool:
+    """True jika mirror boleh dibaca: pyarrow ada, dibangun dengan pelacak
+    perubahan, dan sinkronisasi terakhir berhasil."""
+    return (PARQUET_TERSEDIA and bool(_baca_info_watermark().get("lacak_perubahan"))
+            and bool(baca_status().get("berhasil")))
+
+
+# ================================================================
+# SINKRONISASI
+# ================================================================
+
+def _tulis_partisi(df: pd.DataFrame, folder_dasar: str | None = None):
+    """Menulis satu file part per bulan untuk potongan data ini."""
+    folder_dasar = folder_dasar or FOLDER_ORDERS
+    bulan = df["tanggal_order"].dt.strftime("%Y-%m")
+    for nama_bulan, bagian in df.groupby(bulan, sort=False):
+        folder = os.path.join(folder_dasar, f"bulan={nama_bulan}")
+        os.makedirs(folder, exist_ok=True)
+        nama_file = f"part-{int(bagian['id'].min()):09d}-{int(bagian['id'].max()):09d}.parquet"
+        bagian.to_parquet(os.path.join(folder, nama_file), index=False)
+
+
+def _siapkan_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    chunk["tanggal_order"] = pd.to_datetime(chunk["tanggal_order"])
+    chunk["harga_total"] = chunk["harga_total"].astype("int64")
+    return chunk
+
+
+def _pelacak_terpasang(conn) -> bool:
+    placeholder = ", ".join("?" for _ in TRIGGER_PELACAK)
+    jumlah = conn.execute(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholder})",
+        TRIGGER_PELACAK).fetchone()[0]
+    return jumlah == len(TRIGGER_PELACAK)
+
+
+def sinkronkan_mirror(tunggu: bool = True) -> int | None:
+    """Menyelaraskan mirror Parquet dengan SQLite.
+
+    Partisi bulan yang berisi order yang diubah/dihapus ditulis ulang,
+    lalu order baru (id > watermark) ditambahkan. Mengembalikan jumlah
+    baris yang ditambahkan, atau None jika gagal (status dicatat dan
+    halaman statistik kembali ke SQLite). Dengan tunggu=False, langsung
+    kembali 0 jika sinkronisasi lain sedang berjalan.
+    """
+    if not PARQUET_TERSEDIA:
+        print("⚠️  pyarrow tidak terpasang, mirror analitik dilewati.")
+        return None
+
+    if not _lock_sinkron.acquire(blocking=tunggu):
+        return 0
+    try:
+        jumlah = _sinkronkan()
+        _tulis_status(True)
+        return jumlah
+    except Exception as e:
+        print(f"ERROR [mirror_analitik.py] Sinkronisasi gagal: {e}")
+        _tulis_status(False, str(e))
+        return None
+    finally:
+        _lock_sinkron.release()
+
+
+def _sinkronkan() -> int:
+    conn = database.get_db_connection()
+    if not conn:
+        raise RuntimeError("koneksi database gagal")
+    try:
+        if not _pelacak_terpasang(conn):
+            raise RuntimeError("pelacak perubahan belum terpasang "
+                               "(jalankan setup_db_joki.py atau mirror_analitik.py)")
+        if not _baca_info_watermark().get("lacak_perubahan"):
+            # Mirror lama (atau belum ada) dibangun tanpa trigger:
+            # perubahan sebelumnya tidak tercatat, jadi bangun dari awal.
+            # Selama proses ini mirror_siap() False (halaman memakai SQLite).
+            _tulis_status(False, "membangun ulang mirror")
+            shutil.rmtree(FOLDER_ORDERS, ignore_errors=True)
+            conn.execute("DELETE FROM mirror_perubahan")
+            conn.commit()
+            _tulis_watermark(0)
+        _tulis_ulang_bulan_berubah(conn, baca_watermark())
+    finally:
+        conn.close()
+    return _sinkronkan_dari(baca_watermark())
+
+
+def _tulis_ulang_bulan_berubah(conn, watermark: int) -> list[str]:
+    """Menulis ulang partisi bulan yang tercatat di mirror_perubahan.
+
+    Hanya order dengan id <= watermark yang ditulis ulang; order yang
+    lebih baru ikut masuk lewat jalur tambah biasa.
+    """
+    seq_akhir = conn.execute("SELECT MAX(seq) FROM mirror_perubahan").fetchone()[0]
+    if seq_akhir is None:
+        return []
+    daftar_bulan = [baris[0] for baris in conn.execute(
+        "SELECT DISTINCT bulan FROM mirror_perubahan WHERE seq <= ? AND bulan IS NOT NULL",
+        (seq_akhir,))]
+
+    if daftar_bulan:
+        shutil.rmtree(FOLDER_TULIS_ULANG, ignore_errors=True)
+        placeholder = ", ".join("?" for _ in daftar_bulan)
+        query = (f"SELECT {', '.join(KOLOM_MIRROR)} FROM orders_joki "
+                 f"WHERE id <= ? AND strftime('%Y-%m', tanggal_order) IN ({placeholder}) "
+                 "ORDER BY id")
+        for chunk in pd.read_sql_query(query, conn, params=(watermark, *daftar_bulan),
+                                       chunksize=UKURAN_CHUNK):
+            if not chunk.empty:
+                _tulis_partisi(_siapkan_chunk(chunk), FOLDER_TULIS_ULANG)
+
+        # Tukar partisi lama dengan hasil tulis ulang (bulan yang kini
+        # kosong cukup dihapus)
+        os.makedirs(FOLDER_ORDERS, exist_ok=True)
+        os.makedirs(FOLDER_TULIS_ULANG, exist_ok=True)
+        for nama_bulan in daftar_bulan:
+            folder = os.path.join(FOLDER_ORDERS, f"bulan={nama_bulan}")
+            baru = os.path.join(FOLDER_TULIS_ULANG, f"bulan={nama_bulan}")
+            lama = os.path.join(FOLDER_TULIS_ULANG, f"lama-{nama_bulan}")
+            if os.path.isdir(folder):
+                os.replace(folder, lama)
+            if os.path.isdir(baru):
+                os.replace(baru, folder)
+        shutil.rmtree(FOLDER_TULIS_ULANG, ignore_errors=True)
+
+    # Perubahan yang masuk selama proses ini punya seq lebih besar dan
+    # akan diproses pada sinkronisasi berikutnya
+    conn.execute("DELETE FROM mirror_perubahan WHERE seq <= ?", (seq_akhir,))
+    conn.commit()
+    return daftar_bulan
+
+
+def _sinkronkan_dari(watermark: int) -> int:
+    conn = database.get_db_connection()
+    if not conn:
+        raise RuntimeError("koneksi database gagal")
+    query = (f"SELECT {', '.join(KOLOM_MIRROR)} FROM orders_joki "
+             "WHERE id > ? ORDER BY id")
+    jumlah = 0
+    try:
+        for chunk in pd.read_sql_query(query, conn, params=(watermark,),
+                                       chunksize=UKURAN_CHUNK):
+            if chunk.empty:
+                continue
+            _tulis_partisi(_siapkan_chunk(chunk))
+            # Watermark dimajukan per chunk: jika proses terhenti, chunk
+            # berikutnya dilanjutkan tanpa menulis ulang data lama.
+            _tulis_watermark(int(chunk["id"].max()))
+            jumlah += len(chunk)
+    finally:
+        conn.close()
+    return jumlah
+
+
+def bangun_ulang_mirror() -> int | None:
+    """Menghapus mirror dan membangunnya dari awal."""
+    shutil.rmtree(FOLDER_ORDERS, ignore_errors=True)
+    if os.path.exists(PATH_WATERMARK):
+        os.remove(PATH_WATERMARK)
+    return sinkronkan_mirror()
+
+
+# ================================================================
+# SINKRONISASI LATAR
+# ---------------------------------------------------------------
+# Satu thread daemon per proses; aman dipanggil dari setiap rerun
+# halaman (thread hanya dibuat sekali).
+# ================================================================
+
+class SinkronLatar(threading.Thread):
+    """Thread daemon yang menyinkronkan mirror setiap interval."""
+
+    def __init__(self, interval_detik: float = INTERVAL_SINKRON_MIRROR):
+        super().__init__(name="SinkronMirror", daemon=True)
+        self.interval_detik = interval_detik
+        self._berhenti = threading.Event()
+
+    def run(self):
+        while not self._berhenti.is_set():
+            sinkronkan_mirror(tunggu=False)
+            self._berhenti.wait(self.interval_detik)
+
+    def hentikan(self):
+        self._berhenti.set()
+
+
+_sinkron_latar = None
+_lock_latar = threading.Lock()
+
+
+def mulai_sinkron_latar(interval_detik: float = INTERVAL_SINKRON_MIRROR) -> SinkronLatar | None:
+    global _sinkron_latar
+    if not PARQUET_TERSEDIA:
+        return None
+    with _lock_latar:
+        if _sinkron_latar is None or not _sinkron_latar.is_alive():
+            _sinkron_latar = SinkronLatar(interval_detik)
+            _sinkron_latar.start()
+    return _sinkron_latar
+
+
+# ================================================================
+# QUERY
+# ---------------------------------------------------------------
+# Hanya partisi bulan yang beririsan dengan rentang tanggal yang
+# dibuka, dan hanya kolom yang diminta yang dibaca dari file Parquet.
+# ================================================================
+
+def _bulan_dalam_rentang(mulai: date, akhir: date) -> list[str]:
+    hasil = []
+    tahun, bulan = mulai.year, mulai.month
+    while (tahun, bulan) <= (akhir.year, akhir.month):
+        hasil.append(f"{tahun:04d}-{bulan:02d}")
+        bulan += 1
+        if bulan > 12:
+            tahun, bulan = tahun + 1, 1
+    return hasil
+
+
+def query_mirror(kolom: list[str] | None = None, mulai: date | None = None,
+                 akhir: date | None = None) -> pd.DataFrame:
+    """Membaca order dari mirror untuk rentang tanggal [mulai, akhir]."""
+    kolom_baca = list(kolom) if kolom else list(KOLOM_MIRROR)
+    if "tanggal_order" not in kolom_baca:
+        kolom_baca.append("tanggal_order")  # Dibutuhkan untuk filter harian
+
+    if mulai and akhir:
+        file_list = []
+        for nama_bulan in _bulan_dalam_rentang(mulai, akhir):
+            file_list += sorted(glob.glob(
+                os.path.join(FOLDER_ORDERS, f"bulan={nama_bulan}", "*.parquet")))
+    else:
+        file_list = sorted(glob.glob(os.path.join(FOLDER_ORDERS, "*", "*.parquet")))
+
+    if not file_list:
+        return pd.DataFrame(columns=kolom_baca)
+
+    df = pd.concat([pd.read_parquet(path, columns=kolom_baca) for path in file_list],
+                   ignore_index=True)
+    if mulai and akhir:
+        tanggal = df["tanggal_order"].dt.date
+        df = df[(tanggal >= mulai) & (tanggal <= akhir)]
+    if kolom and "tanggal_order" not in kolom:
+        df = df.drop(columns="tanggal_order")
+    return df.reset_index(drop=True)
+
+
+# ================================================================
+# CLI
+# ================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sinkronisasi mirror Parquet orders_joki untuk analitik.")
+    parser.add_argument("--bangun-ulang", action="store_true",
+                        help="Hapus mirror lalu bangun dari awal")
+    args = parser.parse_args()
+
+    # Migrasi DB lama yang dibuat sebelum pelacak perubahan ada
+    conn = database.get_db_connection()
+    if not conn or not database.pasang_pelacak_mirror(conn):
+        raise SystemExit(1)
+    conn.close()
+
+    mulai = time.perf_counter()
+    jumlah = bangun_ulang_mirror() if args.bangun_ulang else sinkronkan_mirror()
+    if jumlah is None:
+        print(f"❌ Sinkronisasi mirror gagal: {baca_status().get('pesan', '')}")
+        raise SystemExit(1)
+    print(f"✅ {jumlah:,} baris ditambahkan ke mirror "
+          f"(watermark id={baca_watermark()}, {time.perf_counter() - mulai:.2f} detik)")
+
+
+if __name__ == "__main__":
+    main()
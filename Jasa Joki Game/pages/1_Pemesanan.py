@@ -11,8 +11,10 @@ from datetime import datetime
 from manajer_order import ManajerOrderJoki
 from model import OrderJoki  # Representasi data pesanan berbasis OOP
 from konfigurasi import DAFTAR_RANK_PER_GAME, METODE_PEMBAYARAN
+from profiler import profil_halaman, tahap  # Profiling tahap per rerun
 
 
+@profil_halaman("Pemesanan")
 def main():
     # ------------------------------------------------------------
     # Konfigurasi awal halaman Streamlit
@@ -23,7 +25,8 @@ def main():
     # ------------------------------------------------------------
     # Inisialisasi objek manajer sebagai jembatan ke database
     # ------------------------------------------------------------
-    manajer = ManajerOrderJoki()
+    with tahap("db"):
+        manajer = ManajerOrderJoki()
 
     st.title("📝 Pemesanan dan Pembayaran Joki")
 
@@ -104,7 +107,9 @@ def main():
                 )
 
                 # Simpan ke database melalui manajer
-                if manajer.tambah_order(order):
+                with tahap("db"):
+                    berhasil = manajer.tambah_order(order)
+                if berhasil:
                     st.success("✅ Order berhasil disimpan!")
                 else:
                     st.error("❌ Gagal menyimpan order.")
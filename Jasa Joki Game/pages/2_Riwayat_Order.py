@@ -9,8 +9,10 @@ import pandas as pd
 import streamlit as st
 from manajer_order import ManajerOrderJoki  # Manajemen data order
 from admin_auth import AdminAuthenticator   # Sistem autentikasi berbasis OOP
+from profiler import profil_halaman, tahap  # Profiling tahap per rerun
 
 
+@profil_halaman("Riwayat Order")
 def main():
     # ------------------------------------------------------------
     # Konfigurasi dasar halaman
@@ -40,15 +42,20 @@ def main():
     # ------------------------------------------------------------
     # Inisialisasi manajer order untuk mengambil data order
     # ------------------------------------------------------------
-    manajer = ManajerOrderJoki()
-    df = manajer.get_dataframe_order()
+    with tahap("db"):
+        manajer = ManajerOrderJoki()
+
+    with tahap("transform"):
+        df = manajer.get_dataframe_order()
 
     # ============================================================
     # SECTION: Tampilkan Data Order
     # ============================================================
     if df.empty:
         st.warning("Belum ada data order.")
-    else:
+        return
+
+    with tahap("transform"):
         # Format harga menjadi Rupiah (pemformatan numerik)
         df["harga_total"] = df["harga_total"].apply(
             lambda x: f"Rp {int(x):,}".replace(",", ".")
@@ -76,23 +83,26 @@ def main():
         # Jadikan kolom "ID" sebagai indeks tabel
         df = df.set_index("ID")
 
+    with tahap("render"):
         # Tampilkan tabel data menggunakan komponen Streamlit
         st.dataframe(df, use_container_width=True)
 
-        # ========================================================
-        # SECTION OPSIONAL: Hapus Order (CRUD Delete)
-        # ========================================================
-        with st.expander("🗑️ Hapus Order (Opsional)", expanded=False):
-            id_hapus = st.number_input(
-                "Masukkan ID Order yang ingin dihapus", min_value=1, step=1
-            )
-            if st.button("Hapus Order", key="hapus_riwayat_btn"):
-                if manajer.hapus_order(id_hapus):
-                    st.success(
-                        f"✅ Order dengan ID {id_hapus} berhasil dihapus.")
-                    st.rerun()  # Refresh halaman setelah penghapusan
-                else:
-                    st.error("❌ Gagal menghapus. ID tidak ditemukan.")
+    # ========================================================
+    # SECTION OPSIONAL: Hapus Order (CRUD Delete)
+    # ========================================================
+    with st.expander("🗑️ Hapus Order (Opsional)", expanded=False):
+        id_hapus = st.number_input(
+            "Masukkan ID Order yang ingin dihapus", min_value=1, step=1
+        )
+        if st.button("Hapus Order", key="hapus_riwayat_btn"):
+            with tahap("db"):
+                berhasil = manajer.hapus_order(id_hapus)
+            if berhasil:
+                st.success(
+                    f"✅ Order dengan ID {id_hapus} berhasil dihapus.")
+                st.rerun()  # Refresh halaman setelah penghapusan
+            else:
+                st.error("❌ Gagal menghapus. ID tidak ditemukan.")
 
 
 # Menjalankan fungsi utama jika file ini dipanggil
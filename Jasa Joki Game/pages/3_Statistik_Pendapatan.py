@@ -8,15 +8,29 @@
 # - Total pendapatan terhitung otomatis
 # - Riwayat transaksi dalam bentuk tabel
 # - Ekspor data ke format CSV
+# - Mirror Parquet opsional untuk rentang tanggal panjang
 # ===============================================================
 
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+import database
 from manajer_order import ManajerOrderJoki
 from admin_auth import AdminAuthenticator
+from konfigurasi import AMBANG_HARI_MIRROR, INTERVAL_SINKRON_MIRROR
+from mirror_analitik import (PARQUET_TERSEDIA, baca_status, mirror_siap,
+                             mulai_sinkron_latar, query_mirror)
+from profiler import profil_halaman, tahap
 
 
+# Sinkronisasi mirror berjalan di thread latar (satu untuk seluruh sesi),
+# bukan di dalam request halaman.
+@st.cache_resource
+def get_sinkron_mirror():
+    return mulai_sinkron_latar()
+
+
+@profil_halaman("Statistik Pendapatan")
 def main():
     # -----------------------------------------------------------
     # Konfigurasi dasar halaman Streamlit
@@ -43,29 +57,24 @@ def main():
     st.caption(f"Hai, admin **{auth.get_username()}**!")
 
     # -----------------------------------------------------------
-    # Ambil Data Order dari Manajer (OOP + Caching)
+    # Ambil rentang tanggal order (query ringan MIN/MAX, tanpa
+    # memuat seluruh order ke memori)
     # -----------------------------------------------------------
-    manajer = ManajerOrderJoki()
-    df = manajer.get_dataframe_order()
+    with tahap("db"):
+        rentang = database.get_rentang_tanggal_order()
 
-    if df.empty:
+    if not rentang:
         st.warning("Belum ada data.")
         return
 
-    # -----------------------------------------------------------
-    # Persiapan Data: Parsing waktu dan konversi harga
-    # -----------------------------------------------------------
-    df["harga_total"] = df["harga_total"].astype(float)
-    df["tanggal_order"] = pd.to_datetime(df["tanggal_order"])
-
     # ===========================================================
     # SECTION: Filter Rentang Tanggal Dinamis
     # Tujuan: Memungkinkan analisis per periode waktu tertentu
     # ===========================================================
     st.subheader("📅 Filter Tanggal")
 
-    min_date = df["tanggal_order"].min().date()
-    max_date = df["tanggal_order"].max().date()
+    min_date = pd.to_datetime(rentang[0]).date()
+    max_date = pd.to_datetime(rentang[1]).date()
 
     # Hindari error jika hanya ada 1 tanggal
     default_start = min_date
@@ -85,11 +94,57 @@ def main():
         st.warning("Silakan pilih *dua tanggal* sebagai rentang.")
         return
 
-    # Filter data sesuai rentang tanggal
-    df_filtered = df[
-        (df["tanggal_order"].dt.date >= start_date) &
-        (df["tanggal_order"].dt.date <= end_date)
-    ]
+    # -----------------------------------------------------------
+    # Sumber Data: mirror Parquet untuk rentang panjang (hanya
+    # partisi bulan yang relevan dibaca), SQLite untuk rentang pendek
+    # atau jika mirror belum siap / sinkronisasi terakhir gagal
+    # -----------------------------------------------------------
+    pakai_mirror = False
+    if PARQUET_TERSEDIA:
+        get_sinkron_mirror()
+        siap = mirror_siap()
+        status = baca_status()
+        pakai_mirror = st.toggle(
+            "⚡ Gunakan mirror analitik (Parquet)",
+            value=siap and (end_date - start_date).days >= AMBANG_HARI_MIRROR,
+            disabled=not siap,
+            help=(f"Otomatis aktif untuk rentang ≥ {AMBANG_HARI_MIRROR} hari. "
+                  f"Disinkronkan di latar setiap {INTERVAL_SINKRON_MIRROR} detik "
+                  f"(terakhir: {status.get('waktu', '-')}), jadi order beberapa "
+                  "detik terakhir bisa belum tercermin.")
+                 if siap else
+                 f"Mirror belum siap: {status.get('pesan') or 'menunggu sinkronisasi pertama'}."
+        )
+
+    df_filtered = None
+    if pakai_mirror:
+        with tahap("db"):
+            try:
+                df_filtered = query_mirror(mulai=start_date, akhir=end_date)
+            except Exception as e:
+                st.warning(f"Mirror analitik gagal dibaca ({e}); memakai SQLite.")
+        if df_filtered is not None:
+            with tahap("transform"):
+                df_filtered = df_filtered.rename(columns={"id": "id_order"})
+                df_filtered["harga_total"] = df_filtered["harga_total"].astype(float)
+
+    if df_filtered is None:
+        # Ambil Data Order dari Manajer (OOP + Caching)
+        with tahap("db"):
+            manajer = ManajerOrderJoki()
+
+        with tahap("transform"):
+            df = manajer.get_dataframe_order()
+
+            # Persiapan Data: Parsing waktu dan konversi harga
+            df["harga_total"] = df["harga_total"].astype(float)
+            df["tanggal_order"] = pd.to_datetime(df["tanggal_order"])
+
+            # Filter data sesuai rentang tanggal
+            df_filtered = df[
+                (df["tanggal_order"].dt.date >= start_date) &
+                (df["tanggal_order"].dt.date <= end_date)
+            ]
 
     if df_filtered.empty:
         st.warning("Tidak ada data pada rentang tanggal ini.")
@@ -99,7 +154,8 @@ def main():
     # SECTION: Total Pendapatan
     # Tujuan: Menyajikan total akumulasi harga dari data terfilter
     # ===========================================================
-    total = df_filtered["harga_total"].sum()
+    with tahap("transform"):
+        total = df_filtered["harga_total"].sum()
     st.metric(label="💰 Total Pendapatan",
               value=f"Rp {total:,.0f}".replace(",", "."))
 
@@ -108,9 +164,11 @@ def main():
     # Tujuan: Visualisasi untuk membantu analisis performa game
     # ===========================================================
     st.subheader("🎮 Grafik Pendapatan per Game")
-    pendapatan_per_game = df_filtered.groupby(
-        "game")["harga_total"].sum().sort_values(ascending=False)
-    st.bar_chart(pendapatan_per_game)
+    with tahap("transform"):
+        pendapatan_per_game = df_filtered.groupby(
+            "game")["harga_total"].sum().sort_values(ascending=False)
+    with tahap("render"):
+        st.bar_chart(pendapatan_per_game)
 
     # ===========================================================
     # SECTION: Tabel Riwayat Order
@@ -118,24 +176,25 @@ def main():
     # ===========================================================
     st.subheader("📋 Riwayat Order")
 
-    df_display = df_filtered.copy()
-    df_display["harga_total"] = df_display["harga_total"].apply(
-        lambda x: f"Rp {int(x):,}".replace(",", "."))
-    df_display["tanggal_order"] = df_display["tanggal_order"].dt.strftime(
-        "%d-%m-%Y %H:%M")
-
-    df_display = df_display.rename(columns={
-        "id_order": "ID",
-        "nama_pelanggan": "Nama",
-        "email": "Email",
-        "no_hp": "No. HP",
-        "game": "Game",
-        "rank_awal": "Rank Awal",
-        "rank_tujuan": "Rank Tujuan",
-        "harga_total": "Harga",
-        "metode_pembayaran": "Pembayaran",
-        "tanggal_order": "Tanggal"
-    }).set_index("ID")
+    with tahap("transform"):
+        df_display = df_filtered.copy()
+        df_display["harga_total"] = df_display["harga_total"].apply(
+            lambda x: f"Rp {int(x):,}".replace(",", "."))
+        df_display["tanggal_order"] = df_display["tanggal_order"].dt.strftime(
+            "%d-%m-%Y %H:%M")
+
+        df_display = df_display.rename(columns={
+            "id_order": "ID",
+            "nama_pelanggan": "Nama",
+            "email": "Email",
+            "no_hp": "No. HP",
+            "game": "Game",
+            "rank_awal": "Rank Awal",
+            "rank_tujuan": "Rank Tujuan",
+            "harga_total": "Harga",
+            "metode_pembayaran": "Pembayaran",
+            "tanggal_order": "Tanggal"
+        }).set_index("ID")
 
     # Sembunyikan index default dari Streamlit agar tampilan bersih
     st.markdown("""
@@ -144,13 +203,14 @@ def main():
         </style>
     """, unsafe_allow_html=True)
 
-    st.dataframe(df_display, use_container_width=True)
+    with tahap("render"):
+        st.dataframe(df_display, use_container_width=True)
 
     # ===========================================================
     # SECTION: Ekspor Data ke CSV
     # Tujuan: Memberikan opsi backup atau analisis lebih lanjut
     # ===========================================================
-    with st.expander("📥 Download Data"):
+    with tahap("render"), st.expander("📥 Download Data"):
         st.download_button(
             label="Download sebagai CSV",
             data=df_display.reset_index().to_csv(index=False),
@@ -0,0 +1,215 @@
+# ================================================================
+# File: profiler.py
+# Deskripsi:
+# Modul profiling ringan untuk halaman Streamlit aplikasi joki game.
+# Mencatat durasi tiap tahap (muat DB, transformasi, render) pada
+# setiap rerun, menyimpan persentil bergulir di memori, dan
+# menampilkannya dalam expander khusus admin. Dapat juga membuang
+# output cProfile untuk satu rerun melalui environment variable.
+# ================================================================
+
+import cProfile
+import functools
+import io
+import math
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+from konfigurasi import BASE_DIR
+
+# Jumlah rerun terakhir yang disimpan per (halaman, tahap)
+UKURAN_JENDELA = 200
+
+# Nama environment variable untuk memicu dump cProfile satu rerun.
+# Nilai "1"/"all" = halaman pertama yang dirender, atau nama halaman
+# tertentu (misal: JOKI_CPROFILE="Riwayat Order").
+ENV_CPROFILE = "JOKI_CPROFILE"
+
+# Folder tujuan file .prof hasil dump cProfile
+FOLDER_PROFIL = os.path.join(BASE_DIR, "data", "profil")
+
+# Urutan tampilan tahap standar di panel admin
+TAHAP_STANDAR = ("db", "transform", "render", "total")
+
+
+# ================================================================
+# PENYIMPANAN STATISTIK (in-memory, dibagi antar sesi)
+# ---------------------------------------------------------------
+# Modul Python tetap hidup antar rerun Streamlit, sehingga dictionary
+# global ini cukup sebagai penyimpanan bergulir. Lock dipakai karena
+# setiap sesi Streamlit berjalan di thread terpisah.
+# ================================================================
+
+_lock = threading.Lock()
+_riwayat: dict[tuple[str, str], deque] = defaultdict(
+    lambda: deque(maxlen=UKURAN_JENDELA))
+_lokal = threading.local()
+_cprofile_terpakai = False
+
+
+def _catat(halaman: str, tahap_nama: str, durasi_ms: float):
+    with _lock:
+        _riwayat[(halaman, tahap_nama)].append(durasi_ms)
+
+
+def hitung_persentil(data_terurut: list[float], p: float) -> float:
+    """Persentil nearest-rank dari list yang sudah diurutkan."""
+    if not data_terurut:
+        return 0.0
+    idx = max(0, min(len(data_terurut) - 1,
+                     math.ceil(p / 100 * len(data_terurut)) - 1))
+    return data_terurut[idx]
+
+
+def ringkasan_statistik() -> list[dict]:
+    """Mengembalikan statistik p50/p95/p99 per halaman dan tahap."""
+    with _lock:
+        salinan = {kunci: list(nilai) for kunci, nilai in _riwayat.items()}
+
+    def urutan(kunci):
+        halaman, tahap_nama = kunci
+        posisi = (TAHAP_STANDAR.index(tahap_nama)
+                  if tahap_nama in TAHAP_STANDAR else len(TAHAP_STANDAR))
+        return (halaman, posisi, tahap_nama)
+
+    hasil = []
+    for kunci in sorted(salinan, key=urutan):
+        data = sorted(salinan[kunci])
+        hasil.append({
+            "Halaman": kunci[0],
+            "Tahap": kunci[1],
+            "Jumlah Rerun": len(data),
+            "p50 (ms)": round(hitung_persentil(data, 50), 2),
+            "p95 (ms)": round(hitung_persentil(data, 95), 2),
+            "p99 (ms)": round(hitung_persentil(data, 99), 2),
+            "Terakhir (ms)": round(salinan[kunci][-1], 2),
+        })
+    return hasil
+
+
+def reset_statistik():
+    """Mengosongkan seluruh statistik yang tersimpan."""
+    with _lock:
+        _riwayat.clear()
+
+
+# ================================================================
+# CONTEXT MANAGER: tahap()
+# ---------------------------------------------------------------
+# Dipakai di dalam main() halaman untuk membungkus satu tahap kerja.
+# Jika dipanggil di luar halaman yang diprofil, tidak melakukan apa-apa.
+# ================================================================
+
+@contextmanager
+def tahap(nama: str):
+    durasi = getattr(_lokal, "durasi", None)
+    if durasi is None:
+        yield
+        return
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Tahap yang sama boleh muncul beberapa kali dalam satu rerun;
+        # durasinya dijumlahkan lalu dicatat sekali di akhir rerun.
+        durasi[nama] = durasi.get(nama, 0.0) + \
+            (time.perf_counter() - mulai) * 1000
+
+
+# ================================================================
+# DUMP cProfile SATU RERUN
+# ================================================================
+
+def _perlu_cprofile(halaman: str) -> bool:
+    global _cprofile_terpakai
+    target = os.environ.get(ENV_CPROFILE, "").strip()
+    if not target or _cprofile_terpakai:
+        return False
+    if target.lower() not in ("1", "all", "true") and target != halaman:
+        return False
+    with _lock:
+        if _cprofile_terpakai:
+            return False
+        _cprofile_terpakai = True
+    return True
+
+
+def _simpan_cprofile(profiler: cProfile.Profile, halaman: str):
+    try:
+        os.makedirs(FOLDER_PROFIL, exist_ok=True)
+        nama_file = (f"{halaman.replace(' ', '_')}_"
+                     f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+        path = os.path.join(FOLDER_PROFIL, nama_file)
+        profiler.dump_stats(path)
+
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats(
+            "cumulative").print_stats(20)
+        print(f"📈 [profiler.py] cProfile '{halaman}' disimpan ke: {path}")
+        print(buffer.getvalue())
+    except Exception as e:
+        print(f"ERROR [profiler.py] Gagal menyimpan cProfile: {e}")
+
+
+# ================================================================
+# PANEL ADMIN
+# ================================================================
+
+def tampilkan_panel_profil():
+    """Menampilkan expander statistik profiling (hanya untuk admin)."""
+    if not st.session_state.get("is_admin", False):
+        return
+    with st.expander("⏱️ Profil Performa Halaman (Admin)", expanded=False):
+        data = ringkasan_statistik()
+        if not data:
+            st.info("Belum ada data profiling.")
+        else:
+            st.dataframe(data, use_container_width=True, hide_index=True)
+        st.caption(
+            f"Jendela bergulir {UKURAN_JENDELA} rerun terakhir per tahap. "
+            f"Set `{ENV_CPROFILE}=<nama halaman|1>` untuk dump cProfile "
+            f"satu rerun ke `data/profil/`.")
+        if st.button("Reset Statistik", key="profil_reset_btn"):
+            reset_statistik()
+            st.rerun()
+
+
+# ================================================================
+# DECORATOR: profil_halaman()
+# ---------------------------------------------------------------
+# Membungkus main() tiap halaman. Mencatat durasi total rerun,
+# mengaktifkan pencatatan tahap(), dan menampilkan panel admin
+# setelah halaman selesai dirender.
+# ================================================================
+
+def profil_halaman(halaman: str):
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            _lokal.durasi = {}
+            profiler = cProfile.Profile() if _perlu_cprofile(halaman) else None
+            mulai = time.perf_counter()
+            if profiler:
+                profiler.enable()
+            try:
+                hasil = fungsi(*args, **kwargs)
+            finally:
+                # st.stop()/st.rerun() berupa exception: tetap dicatat
+                if profiler:
+                    profiler.disable()
+                    _simpan_cprofile(profiler, halaman)
+                durasi = _lokal.durasi
+                durasi["total"] = (time.perf_counter() - mulai) * 1000
+                for nama_tahap, ms in durasi.items():
+                    _catat(halaman, nama_tahap, ms)
+                _lokal.durasi = None
+            tampilkan_panel_profil()
+            return hasil
+        return pembungkus
+    return dekorator
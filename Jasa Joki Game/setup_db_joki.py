@@ -8,6 +8,7 @@
 import sqlite3
 import os
 from konfigurasi import DB_PATH  # Mengimpor path database dari file konfigurasi
+from database import aktifkan_wal, pasang_pelacak_mirror
 
 # Fungsi untuk membuat folder penyimpanan database jika belum ada
 
@@ -53,6 +54,14 @@ def setup_database():
         """)
         conn.commit()
         print("Tabel 'orders_joki' siap digunakan.")
+
+        # Mode WAL: backup online (backup_db.py) tidak memblokir order baru
+        if aktifkan_wal(conn):
+            print("Mode journal WAL aktif.")
+
+        # Trigger pelacak perubahan untuk mirror analitik Parquet
+        if pasang_pelacak_mirror(conn):
+            print("Pelacak perubahan mirror analitik terpasang.")
         return True
     except sqlite3.Error as e:
         print(f"❌ ERROR SQLite saat setup: {e}")
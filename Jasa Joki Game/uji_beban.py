@@ -0,0 +1,356 @@
+# ================================================================
+# File: uji_beban.py
+# Deskripsi:
+# Alat uji beban (load test) offline untuk aplikasi joki game.
+# Menjalankan halaman Streamlit melalui streamlit.testing.v1.AppTest
+# dari banyak thread atau proses sekaligus terhadap database
+# sementara. Pekerja "penulis" mengirim order realistis lewat
+# pages/1_Pemesanan.py, sedangkan pekerja "pembaca" membuka
+# Riwayat Order dan Statistik Pendapatan sebagai admin.
+# Hasil: throughput, latensi p50/p95/p99, dan jumlah error lock DB.
+#
+# Contoh:
+#   python uji_beban.py --penulis 4 --pembaca 4 --iterasi 25
+#   python uji_beban.py --mode proses --penulis 8 --pembaca 2 --json hasil.json
+# ================================================================
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HALAMAN_PEMESANAN = os.path.join(BASE_DIR, "pages", "1_Pemesanan.py")
+HALAMAN_RIWAYAT = os.path.join(BASE_DIR, "pages", "2_Riwayat_Order.py")
+HALAMAN_STATISTIK = os.path.join(BASE_DIR, "pages", "3_Statistik_Pendapatan.py")
+
+# Kredensial admin palsu khusus untuk sesi uji (tidak menyentuh secrets asli)
+ADMIN_UJI = {"admin_uji": "rahasia_uji"}
+
+NAMA_DEPAN = ["Budi", "Siti", "Andi", "Rina", "Dewi", "Agus", "Putri", "Rizky"]
+NAMA_BELAKANG = ["Santoso", "Wijaya", "Pratama", "Lestari", "Saputra", "Halim"]
+
+
+# ================================================================
+# PENGHITUNG ERROR LOCK
+# ---------------------------------------------------------------
+# database.py hanya mencetak error SQLite lalu mengembalikan None,
+# sehingga error "database is locked" dihitung dari output stdout.
+# ================================================================
+
+class _PenghitungLock:
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self.jumlah = 0
+
+    def write(self, teks):
+        if "database is locked" in teks or "database table is locked" in teks:
+            with self._lock:
+                self.jumlah += 1
+        return self._stream.write(teks)
+
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, nama):
+        return getattr(self._stream, nama)
+
+
+@contextmanager
+def _penghitung_lock():
+    """Memasang _PenghitungLock di sys.stdout selama blok berjalan, lalu memulihkannya."""
+    if isinstance(sys.stdout, _PenghitungLock):
+        yield sys.stdout
+        return
+    asli = sys.stdout
+    sys.stdout = _PenghitungLock(asli)
+    try:
+        yield sys.stdout
+    finally:
+        sys.stdout = asli
+
+
+# ================================================================
+# PERSIAPAN DATABASE SEMENTARA
+# ================================================================
+
+def _siapkan_lingkungan(db_path: str):
+    """Mengarahkan aplikasi ke DB sementara. Wajib sebelum impor modul app."""
+    os.environ["JOKI_DB_PATH"] = db_path
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+
+
+def _order_acak(rng: random.Random) -> dict:
+    from konfigurasi import DAFTAR_RANK_PER_GAME, METODE_PEMBAYARAN
+
+    game = rng.choice(list(DAFTAR_RANK_PER_GAME.keys()))
+    ranks = DAFTAR_RANK_PER_GAME[game]
+    idx_awal = rng.randrange(0, len(ranks) - 1)
+    idx_tujuan = rng.randrange(idx_awal + 1, len(ranks))
+    nama = f"{rng.choice(NAMA_DEPAN)} {rng.choice(NAMA_BELAKANG)}"
+    return {
+        "nama_pelanggan": nama,
+        "email": f"{nama.lower().replace(' ', '.')}{rng.randint(1, 9999)}@mail.com",
+        "password": f"pw{rng.randint(100000, 999999)}",
+        "no_hp": f"08{rng.randint(1000000000, 9999999999)}",
+        "game": game,
+        "rank_awal": ranks[idx_awal],
+        "rank_tujuan": ranks[idx_tujuan],
+        "metode_pembayaran": rng.choice(METODE_PEMBAYARAN),
+    }
+
+
+def seed_database(jumlah: int, seed: int = 0):
+    """Mengisi DB sementara dengan order historis agar halaman admin realistis."""
+    import datetime
+    import database
+    from manajer_order import ManajerOrderJoki
+
+    database.setup_database_initial()
+    if jumlah <= 0:
+        return
+    rng = random.Random(seed)
+    manajer = ManajerOrderJoki()
+    sekarang = datetime.datetime.now()
+    conn = database.get_db_connection()
+    try:
+        baris = []
+        for _ in range(jumlah):
+            data = _order_acak(rng)
+            data["harga_total"] = manajer.hitung_harga_otomatis(
+                data["game"], data["rank_awal"], data["rank_tujuan"])
+            data["tanggal_order"] = (sekarang - datetime.timedelta(
+                minutes=rng.randint(0, 60 * 24 * 365))).strftime("%Y-%m-%d %H:%M:%S")
+            baris.append(data)
+        conn.executemany("""
+            INSERT INTO orders_joki
+            (nama_pelanggan, email, password, no_hp, game, rank_awal, rank_tujuan,
+             harga_total, metode_pembayaran, tanggal_order)
+            VALUES (:nama_pelanggan, :email, :password, :no_hp, :game, :rank_awal,
+                    :rank_tujuan, :harga_total, :metode_pembayaran, :tanggal_order)
+        """, baris)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# ================================================================
+# SKENARIO PEKERJA
+# ================================================================
+
+def _apptest(path: str, timeout: float):
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(path, default_timeout=timeout)
+
+
+def _jalankan_terukur(at, hasil: list, jenis: str):
+    mulai = time.perf_counter()
+    at.run()
+    durasi_ms = (time.perf_counter() - mulai) * 1000
+    gagal = bool(at.exception)
+    hasil.append((jenis, durasi_ms, not gagal))
+    return not gagal
+
+
+def _skenario_penulis(iterasi: int, seed: int, timeout: float) -> list:
+    """Mengisi dan mengirim formulir Pemesanan seperti pelanggan sungguhan."""
+    rng = random.Random(seed)
+    hasil = []
+    for _ in range(iterasi):
+        data = _order_acak(rng)
+        at = _apptest(HALAMAN_PEMESANAN, timeout)
+        if not _jalankan_terukur(at, hasil, "pemesanan_muat"):
+            continue
+
+        # Pilih game -> rerun agar daftar rank muncul
+        at.selectbox[0].set_value(data["game"])
+        if not _jalankan_terukur(at, hasil, "pemesanan_pilih_game"):
+            continue
+
+        at.selectbox[1].set_value(data["rank_awal"])
+        at.selectbox[2].set_value(data["rank_tujuan"])
+        at.text_input[0].input(data["nama_pelanggan"])
+        at.text_input[1].input(data["email"])
+        at.text_input[2].input(data["password"])
+        at.text_input[3].input(data["no_hp"])
+        at.selectbox[3].set_value(data["metode_pembayaran"])
+        at.button[0].click()  # Tombol "Simpan Order" (form submit)
+
+        mulai = time.perf_counter()
+        at.run()
+        durasi_ms = (time.perf_counter() - mulai) * 1000
+        sukses = not at.exception and any(
+            "berhasil" in s.value for s in at.success)
+        hasil.append(("pemesanan_submit", durasi_ms, sukses))
+    return hasil
+
+
+def _skenario_pembaca(iterasi: int, seed: int, timeout: float) -> list:
+    """Admin membuka riwayat berulang kali sementara statistik terbuka."""
+    rng = random.Random(seed)
+    hasil = []
+
+    def sesi_admin(path):
+        at = _apptest(path, timeout)
+        at.secrets["admin_accounts"] = ADMIN_UJI
+        at.session_state["is_admin"] = True
+        at.session_state["admin_username"] = "admin_uji"
+        return at
+
+    riwayat = sesi_admin(HALAMAN_RIWAYAT)
+    statistik = sesi_admin(HALAMAN_STATISTIK)
+    for _ in range(iterasi):
+        # Setiap rerun riwayat memuat ulang & merender seluruh tabel,
+        # setara dengan admin yang menggulir/merefresh daftar order.
+        _jalankan_terukur(riwayat, hasil, "riwayat_rerun")
+        if rng.random() < 0.5:
+            _jalankan_terukur(statistik, hasil, "statistik_rerun")
+    return hasil
+
+
+def _pekerja(peran: str, iterasi: int, seed: int, timeout: float) -> list:
+    if peran == "penulis":
+        return _skenario_penulis(iterasi, seed, timeout)
+    return _skenario_pembaca(iterasi, seed, timeout)
+
+
+def _pekerja_proses(db_path: str, peran: str, iterasi: int, seed: int,
+                    timeout: float) -> tuple[list, int]:
+    """Entry point untuk mode proses: tiap proses punya penghitung sendiri."""
+    _siapkan_lingkungan(db_path)
+    with _penghitung_lock() as penghitung:
+        hasil = _pekerja(peran, iterasi, seed, timeout)
+    return hasil, penghitung.jumlah
+
+
+# ================================================================
+# LAPORAN
+# ================================================================
+
+def susun_laporan(semua_hasil: list, durasi_total: float, error_lock: int) -> dict:
+    from profiler import hitung_persentil
+
+    per_jenis = defaultdict(list)
+    gagal = defaultdict(int)
+    for jenis, ms, sukses in semua_hasil:
+        per_jenis[jenis].append(ms)
+        if not sukses:
+            gagal[jenis] += 1
+
+    operasi = {}
+    for jenis, data in sorted(per_jenis.items()):
+        data.sort()
+        operasi[jenis] = {
+            "jumlah": len(data),
+            "gagal": gagal[jenis],
+            "throughput_per_detik": round(len(data) / durasi_total, 2),
+            "p50_ms": round(hitung_persentil(data, 50), 1),
+            "p95_ms": round(hitung_persentil(data, 95), 1),
+            "p99_ms": round(hitung_persentil(data, 99), 1),
+        }
+
+    return {
+        "durasi_detik": round(durasi_total, 2),
+        "total_operasi": len(semua_hasil),
+        "throughput_per_detik": round(len(semua_hasil) / durasi_total, 2),
+        "error_lock_db": error_lock,
+        "operasi": operasi,
+    }
+
+
+def cetak_laporan(laporan: dict):
+    print("\n=== Hasil Uji Beban ===")
+    print(f"Durasi          : {laporan['durasi_detik']} detik")
+    print(f"Total operasi   : {laporan['total_operasi']} "
+          f"({laporan['throughput_per_detik']}/detik)")
+    print(f"Error lock DB   : {laporan['error_lock_db']}")
+    print(f"\n{'Operasi':<22}{'n':>6}{'gagal':>7}{'ops/s':>8}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}")
+    for jenis, s in laporan["operasi"].items():
+        print(f"{jenis:<22}{s['jumlah']:>6}{s['gagal']:>7}"
+              f"{s['throughput_per_detik']:>8}{s['p50_ms']:>9}"
+              f"{s['p95_ms']:>9}{s['p99_ms']:>9}")
+    print("(latensi dalam ms)")
+
+
+# ================================================================
+# MAIN
+# ================================================================
+
+def jalankan_uji(penulis: int, pembaca: int, iterasi: int, mode: str = "thread",
+                 seed_order: int = 500, timeout: float = 30.0) -> dict:
+    folder_tmp = tempfile.mkdtemp(prefix="joki_uji_beban_")
+    db_path = os.path.join(folder_tmp, "orders_joki_uji.db")
+    _siapkan_lingkungan(db_path)
+    try:
+        with _penghitung_lock() as penghitung:
+            seed_database(seed_order)
+            tugas = ([("penulis", i) for i in range(penulis)] +
+                     [("pembaca", penulis + i) for i in range(pembaca)])
+
+            semua_hasil = []
+            error_lock = 0
+            mulai = time.perf_counter()
+            if mode == "proses":
+                with ProcessPoolExecutor(max_workers=len(tugas)) as pool:
+                    futures = [pool.submit(_pekerja_proses, db_path, peran,
+                                           iterasi, seed, timeout)
+                               for peran, seed in tugas]
+                    for f in futures:
+                        hasil, lock = f.result()
+                        semua_hasil.extend(hasil)
+                        error_lock += lock
+            else:
+                awal_lock = penghitung.jumlah
+                with ThreadPoolExecutor(max_workers=len(tugas)) as pool:
+                    futures = [pool.submit(_pekerja, peran, iterasi, seed, timeout)
+                               for peran, seed in tugas]
+                    for f in futures:
+                        semua_hasil.extend(f.result())
+                error_lock = penghitung.jumlah - awal_lock
+            durasi_total = time.perf_counter() - mulai
+            return susun_laporan(semua_hasil, durasi_total, error_lock)
+    finally:
+        shutil.rmtree(folder_tmp, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Uji beban offline aplikasi joki game via Streamlit AppTest.")
+    parser.add_argument("--penulis", type=int, default=4,
+                        help="Jumlah pekerja yang mengirim order (default: 4)")
+    parser.add_argument("--pembaca", type=int, default=2,
+                        help="Jumlah pekerja admin riwayat/statistik (default: 2)")
+    parser.add_argument("--iterasi", type=int, default=20,
+                        help="Jumlah iterasi per pekerja (default: 20)")
+    parser.add_argument("--mode", choices=["thread", "proses"], default="thread",
+                        help="Jalankan pekerja sebagai thread atau proses")
+    parser.add_argument("--seed-order", type=int, default=500,
+                        help="Jumlah order awal di DB sementara (default: 500)")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="Timeout per rerun AppTest dalam detik")
+    parser.add_argument("--json", help="Simpan laporan ke file JSON")
+    args = parser.parse_args()
+
+    print("=== Memulai Uji Beban Aplikasi Joki Game ===")
+    laporan = jalankan_uji(args.penulis, args.pembaca, args.iterasi,
+                           args.mode, args.seed_order, args.timeout)
+    cetak_laporan(laporan)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(laporan, f, indent=2)
+        print(f"\n📄 Laporan disimpan ke: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
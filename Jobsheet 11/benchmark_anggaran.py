@@ -0,0 +1,202 @@
+# benchmark_anggaran.py
+# Benchmark & profiling AnggaranHarian terhadap database sementara.
+# Database diisi transaksi sintetis (semua kategori, tersebar 2 tahun)
+# secara bertahap sampai tiap ukuran, lalu setiap operasi diukur
+# dengan dan tanpa filter. Ringkasan (total/per kategori) diukur dalam
+# dua kondisi: "dingin" (cache dikosongkan) dan "hangat" (dari cache).
+# Database asli tidak disentuh (lewat PENGELUARAN_DB_PATH).
+#
+# Contoh:
+#   python benchmark_anggaran.py --ukuran 1000 10000 100000 --json hasil.json
+#   python benchmark_anggaran.py --ukuran 50000 --explain --profil
+import argparse
+import cProfile
+import datetime
+import io
+import json
+import os
+import platform
+import pstats
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+
+FOLDER_TMP = tempfile.mkdtemp(prefix="bench_anggaran_")
+os.environ["PENGELUARAN_DB_PATH"] = os.path.join(FOLDER_TMP, "pengeluaran_harian.db")
+
+# Impor modul aplikasi harus SETELAH PENGELUARAN_DB_PATH di-set
+import database
+from manajer_anggaran import AnggaranHarian, rentang_bulan
+from model import Transaksi
+from konfigurasi import KATEGORI_PENGELUARAN, ATURAN_KATEGORI
+
+UKURAN_DEFAULT = [1_000, 10_000, 100_000]
+RENTANG_HARI = 730
+TANGGAL_AKHIR = datetime.date.today()
+
+# --- Data Sintetis ---
+def _deskripsi_per_kategori() -> dict[str, list[str]]:
+    hasil = {k: [f"{kata} {k.lower()}" for kata in ATURAN_KATEGORI.get(k, [])[:10]] for k in KATEGORI_PENGELUARAN}
+    hasil = {k: v or [f"Pengeluaran {k.lower()}", "Transfer", "Lain-lain"] for k, v in hasil.items()}
+    return hasil
+
+def isi_data(anggaran: AnggaranHarian, jumlah: int, rng: random.Random, ukuran_batch: int = 10_000) -> float:
+    """Menambah `jumlah` transaksi sintetis; mengembalikan baris/detik."""
+    deskripsi = _deskripsi_per_kategori()
+    mulai = time.perf_counter()
+    sisa = jumlah
+    while sisa > 0:
+        batch = []
+        for _ in range(min(sisa, ukuran_batch)):
+            kategori = rng.choice(KATEGORI_PENGELUARAN)
+            tanggal = TANGGAL_AKHIR - datetime.timedelta(days=rng.randrange(RENTANG_HARI))
+            batch.append(Transaksi.dari_baris(None, rng.choice(deskripsi[kategori]), float(rng.randrange(5, 500) * 1000), kategori, tanggal))
+        anggaran.tambah_transaksi_batch(batch)
+        sisa -= len(batch)
+    durasi = time.perf_counter() - mulai
+    return jumlah / durasi if durasi else 0.0
+
+# --- Pengukuran ---
+def _statistik_ms(durasi: list[float]) -> dict:
+    ms = sorted(d * 1000 for d in durasi)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return {"min": round(ms[0], 3), "median": round(statistics.median(ms), 3), "p95": round(p95, 3),
+            "rata2": round(statistics.fmean(ms), 3), "n": len(ms)}
+
+def ukur(fungsi, ulang: int, sebelum=None) -> dict:
+    durasi = []
+    for _ in range(ulang):
+        if sebelum:
+            sebelum()
+        t0 = time.perf_counter()
+        fungsi()
+        durasi.append(time.perf_counter() - t0)
+    return _statistik_ms(durasi)
+
+def rekam_sql(fungsi) -> list[str]:
+    """Menjalankan `fungsi` sekali dan mengembalikan SELECT yang dieksekusi
+    (dengan parameter sudah tertanam), lewat trace callback sqlite3."""
+    perintah = []
+    buka_asli = database.get_db_connection
+
+    def buka_dengan_trace():
+        conn = buka_asli()
+        if conn:
+            conn.set_trace_callback(perintah.append)
+        return conn
+
+    database.get_db_connection = buka_dengan_trace
+    try:
+        fungsi()
+    finally:
+        database.get_db_connection = buka_asli
+    return [sql for sql in perintah if sql.lstrip().upper().startswith("SELECT")]
+
+def explain(daftar_sql: list[str]) -> list[dict]:
+    conn = sqlite3.connect(os.environ["PENGELUARAN_DB_PATH"])
+    try:
+        hasil = []
+        for sql in daftar_sql:
+            rencana = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+            hasil.append({"sql": " ".join(sql.split()), "rencana": [baris[3] for baris in rencana]})
+        return hasil
+    finally:
+        conn.close()
+
+def profil(fungsi, ulang: int, sebelum=None, baris: int = 15) -> str:
+    profiler = cProfile.Profile()
+    for _ in range(ulang):
+        if sebelum:
+            sebelum()
+        profiler.runcall(fungsi)
+    keluaran = io.StringIO()
+    pstats.Stats(profiler, stream=keluaran).sort_stats("cumulative").print_stats(baris)
+    return keluaran.getvalue()
+
+def daftar_operasi(anggaran: AnggaranHarian) -> list[tuple[str, object, object]]:
+    """(nama, fungsi, persiapan per ulangan). Persiapan None = tanpa reset cache."""
+    hari_ini = TANGGAL_AKHIR
+    bulan_mulai, bulan_akhir = rentang_bulan(hari_ini.year, hari_ini.month)
+    kosongkan_cache = anggaran._cache.clear
+    operasi = [
+        ("get_dataframe_transaksi[semua]", lambda: anggaran.get_dataframe_transaksi(), None),
+        ("get_dataframe_transaksi[hari]", lambda: anggaran.get_dataframe_transaksi(filter_tanggal=hari_ini), None),
+        ("get_dataframe_transaksi[bulan]", lambda: anggaran.get_dataframe_transaksi(mulai=bulan_mulai, akhir=bulan_akhir), None),
+        ("get_halaman_transaksi[50]", lambda: anggaran.get_halaman_transaksi(50), None),
+    ]
+    for nama, fungsi in (("hitung_total_pengeluaran", anggaran.hitung_total_pengeluaran),
+                         ("get_pengeluaran_per_kategori", anggaran.get_pengeluaran_per_kategori)):
+        for filter_nama, kwargs in (("semua", {}), ("hari", {"tanggal": hari_ini}),
+                                    ("bulan", {"mulai": bulan_mulai, "akhir": bulan_akhir})):
+            operasi.append((f"{nama}[{filter_nama},dingin]", lambda f=fungsi, kw=kwargs: f(**kw), kosongkan_cache))
+            operasi.append((f"{nama}[{filter_nama},hangat]", lambda f=fungsi, kw=kwargs: f(**kw), None))
+    return operasi
+
+def ukur_tambah_transaksi(anggaran: AnggaranHarian, ulang: int, rng: random.Random) -> dict:
+    """Insert satu per satu (satu commit per transaksi), seperti form input."""
+    def tambah():
+        anggaran.tambah_transaksi(Transaksi("Benchmark input", float(rng.randrange(5, 500) * 1000), rng.choice(KATEGORI_PENGELUARAN), TANGGAL_AKHIR))
+    return ukur(tambah, ulang)
+
+def jalankan(daftar_ukuran: list[int], ulang: int, dengan_explain: bool, dengan_profil: bool, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    anggaran = AnggaranHarian()
+    hasil = {
+        "meta": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                 "fts5": database.fts_aktif(), "ulang": ulang, "seed": seed,
+                 "waktu": datetime.datetime.now().isoformat(timespec="seconds")},
+        "ukuran": [],
+    }
+    terisi = 0
+    for ukuran in sorted(daftar_ukuran):
+        print(f"\n--- {ukuran:,} transaksi ---")
+        kecepatan_isi = isi_data(anggaran, ukuran - terisi, rng) if ukuran > terisi else 0.0
+        terisi = max(terisi, ukuran)
+        entri = {"ukuran": ukuran, "isi_baris_per_detik": round(kecepatan_isi), "operasi": {}}
+        entri["operasi"]["tambah_transaksi"] = {"ms": ukur_tambah_transaksi(anggaran, ulang, rng)}
+        for nama, fungsi, sebelum in daftar_operasi(anggaran):
+            fungsi()  # pemanasan (dan mengisi cache untuk varian "hangat")
+            data = {"ms": ukur(fungsi, ulang, sebelum)}
+            if dengan_explain:
+                if sebelum:
+                    sebelum()
+                data["explain"] = explain(rekam_sql(fungsi))
+            if dengan_profil:
+                data["profil"] = profil(fungsi, ulang, sebelum)
+            entri["operasi"][nama] = data
+        terisi += ulang  # baris dari tambah_transaksi
+        for nama, data in entri["operasi"].items():
+            ms = data["ms"]
+            print(f"{nama:<48} median {ms['median']:>9.3f} ms | p95 {ms['p95']:>9.3f} ms")
+            for item in data.get("explain", []):
+                print(f"{'':<4}{' / '.join(item['rencana'])}")
+        hasil["ukuran"].append(entri)
+    return hasil
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark operasi AnggaranHarian pada database sintetis.")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=UKURAN_DEFAULT, help="Jumlah transaksi per tahap")
+    parser.add_argument("--ulang", type=int, default=20, help="Ulangan per operasi")
+    parser.add_argument("--json", default=None, help="Simpan hasil ke file JSON")
+    parser.add_argument("--explain", action="store_true", help="Sertakan EXPLAIN QUERY PLAN tiap query")
+    parser.add_argument("--profil", action="store_true", help="Sertakan ringkasan cProfile tiap operasi")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--simpan-db", action="store_true", help="Jangan hapus database sementara")
+    args = parser.parse_args()
+
+    print(f"Database sementara: {os.environ['PENGELUARAN_DB_PATH']}")
+    try:
+        hasil = jalankan(args.ukuran, args.ulang, args.explain, args.profil, args.seed)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(hasil, f, indent=2, ensure_ascii=False)
+            print(f"\nHasil disimpan ke {args.json}")
+    finally:
+        if not args.simpan_db:
+            shutil.rmtree(FOLDER_TMP, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
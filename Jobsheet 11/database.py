@@ -1,7 +1,8 @@
 # database.py
+import os
 import sqlite3
 import pandas as pd
-from konfigurasi import DB_PATH  # Gunakan path dari konfigurasi
+from konfigurasi import DB_PATH, KATEGORI_DEFAULT  # Gunakan path dari konfigurasi
 
 def get_db_connection() -> sqlite3.Connection | None:
     """Membuka dan mengembalikan koneksi baru ke database SQLite."""
@@ -13,6 +14,14 @@ def get_db_connection() -> sqlite3.Connection | None:
         print(f"ERROR [database.py] Koneksi DB gagal: {e}")
         return None
 
+def sidik_file_db() -> tuple[int, int] | None:
+    """(mtime_ns, ukuran) file database; berubah setiap ada commit dari proses mana pun."""
+    try:
+        st = os.stat(DB_PATH)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
 def execute_query(query: str, params: tuple = None):
     """Menjalankan query non-SELECT. Mengembalikan lastrowid jika INSERT."""
     conn = get_db_connection()
@@ -36,6 +45,41 @@ def execute_query(query: str, params: tuple = None):
         if conn:
             conn.close()
 
+def execute_many(query: str, params_list: list[tuple]):
+    """Menjalankan satu query untuk banyak baris dalam satu transaksi.
+    Mengembalikan jumlah baris terpengaruh, atau None jika gagal (rollback)."""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        with conn:
+            cursor = conn.executemany(query, params_list)
+        return cursor.rowcount
+    except sqlite3.Error as e:
+        print(f"ERROR [database.py] Batch query gagal: {e} | Query: {query[:60]}")
+        return None
+    finally:
+        conn.close()
+
+def execute_many_batch(perintah: list[tuple[str, list[tuple]]], rincian: bool = False):
+    """Beberapa executemany [(query, params_list), ...] dalam SATU transaksi:
+    semua tersimpan atau semua dibatalkan. Mengembalikan total baris terpengaruh
+    (atau list jumlah per perintah jika `rincian=True`), None jika gagal."""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        jumlah = []
+        with conn:
+            for query, params_list in perintah:
+                jumlah.append(conn.executemany(query, params_list).rowcount)
+        return jumlah if rincian else sum(jumlah)
+    except sqlite3.Error as e:
+        print(f"ERROR [database.py] Batch transaksi gagal: {e}")
+        return None
+    finally:
+        conn.close()
+
 def fetch_query(query: str, params: tuple = None, fetch_all: bool = True):
     """Menjalankan query SELECT dan mengembalikan hasil."""
     conn = get_db_connection()
@@ -56,6 +100,25 @@ def fetch_query(query: str, params: tuple = None, fetch_all: bool = True):
         if conn:
             conn.close()
 
+def iter_query(query: str, params: tuple = None, ukuran_batch: int = 1000):
+    """Generator baris SELECT yang diambil per `ukuran_batch` (fetchmany),
+    sehingga hasil besar tidak pernah dimuat sekaligus ke memori.
+    Koneksi ditutup saat generator habis atau dibuang."""
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        cursor = conn.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(ukuran_batch)
+            if not rows:
+                break
+            yield from rows
+    except sqlite3.Error as e:
+        print(f"ERROR [database.py] Iterasi gagal: {e} | Query: {query[:60]}")
+    finally:
+        conn.close()
+
 def get_dataframe(query: str, params: tuple = None) -> pd.DataFrame:
     """Menjalankan query SELECT dan mengembalikan DataFrame Pandas."""
     conn = get_db_connection()
@@ -71,8 +134,180 @@ def get_dataframe(query: str, params: tuple = None) -> pd.DataFrame:
         if conn:
             conn.close()
 
+# Migrasi idempoten yang dijalankan setiap setup (aman diulang).
+# Indeks tanggal untuk filter rentang (hari/minggu/bulan/tahun) dan
+# (kategori, tanggal) untuk ringkasan per kategori dalam satu periode.
+# Indeks jumlah untuk riwayat berhalaman yang diurutkan per jumlah
+# (rowid ikut tersimpan di indeks, jadi keyset (jumlah, id) tetap tercakup).
+MIGRASI_INDEKS = [
+    "CREATE INDEX IF NOT EXISTS idx_transaksi_tanggal ON transaksi (tanggal)",
+    "CREATE INDEX IF NOT EXISTS idx_transaksi_kategori_tanggal ON transaksi (kategori, tanggal)",
+    "CREATE INDEX IF NOT EXISTS idx_transaksi_jumlah ON transaksi (jumlah)",
+]
+
+# --- Pencarian Deskripsi ---
+# Indeks FTS5 external-content: teks tidak disalin dua kali, hanya token
+# yang disimpan. Trigger menjaga indeks tetap sinkron dengan transaksi.
+MIGRASI_FTS = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS transaksi_fts USING fts5(
+        deskripsi, content='transaksi', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transaksi_fts_insert
+    AFTER INSERT ON transaksi BEGIN
+        INSERT INTO transaksi_fts (rowid, deskripsi) VALUES (NEW.id, NEW.deskripsi);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transaksi_fts_delete
+    AFTER DELETE ON transaksi BEGIN
+        INSERT INTO transaksi_fts (transaksi_fts, rowid, deskripsi) VALUES ('delete', OLD.id, OLD.deskripsi);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transaksi_fts_update
+    AFTER UPDATE OF deskripsi ON transaksi BEGIN
+        INSERT INTO transaksi_fts (transaksi_fts, rowid, deskripsi) VALUES ('delete', OLD.id, OLD.deskripsi);
+        INSERT INTO transaksi_fts (rowid, deskripsi) VALUES (NEW.id, NEW.deskripsi);
+    END""",
+]
+# Cadangan jika SQLite dibangun tanpa FTS5: pencarian awalan (LIKE 'teks%')
+# yang bisa memakai indeks NOCASE ini.
+SQL_INDEKS_DESKRIPSI = "CREATE INDEX IF NOT EXISTS idx_transaksi_deskripsi_nocase ON transaksi (deskripsi COLLATE NOCASE)"
+_fts_aktif = None
+
+def _migrasi_fts(cursor: sqlite3.Cursor) -> bool:
+    """Membuat indeks FTS5; False (dan indeks LIKE) jika FTS5 tidak didukung."""
+    baru = not _tabel_ada(cursor, "transaksi_fts")
+    try:
+        for sql_migrasi in MIGRASI_FTS:
+            cursor.execute(sql_migrasi)
+    except sqlite3.OperationalError as e:
+        print(f" -> FTS5 tidak tersedia ({e}), pencarian memakai prefix LIKE.")
+        cursor.execute(SQL_INDEKS_DESKRIPSI)
+        return False
+    if baru:
+        cursor.execute("INSERT INTO transaksi_fts (transaksi_fts) VALUES ('rebuild')")
+    return True
+
+def fts_aktif() -> bool:
+    """True jika tabel transaksi_fts tersedia untuk pencarian."""
+    global _fts_aktif
+    if _fts_aktif is None:
+        _fts_aktif = fetch_query("SELECT 1 FROM sqlite_master WHERE name = 'transaksi_fts'", fetch_all=False) is not None
+    return _fts_aktif
+
+# --- Anggaran Bulanan & Ringkasan Bulanan per Kategori ---
+# monthly_category_totals dipelihara oleh trigger pada transaksi, sehingga
+# setiap penulis (form, import, edit batch) otomatis memperbarui ringkasan
+# dan cek sisa anggaran cukup satu lookup pada primary key (bulan, kategori).
+# Ringkasan harian (daily_category_totals) memakai pola yang sama dengan
+# kunci tanggal penuh; dipakai untuk grafik tren.
+RINGKASAN_BULANAN = ("monthly_category_totals", "bulan", 7)  # (tabel, kolom periode, panjang prefix tanggal)
+RINGKASAN_HARIAN = ("daily_category_totals", "tanggal", 10)
+
+def _sql_kategori(alias: str) -> str:
+    return f"COALESCE(NULLIF({alias}.kategori, ''), '{KATEGORI_DEFAULT}')"
+
+def _sql_tambah_ringkasan(alias: str, ringkasan: tuple = RINGKASAN_BULANAN) -> str:
+    tabel, kolom, panjang = ringkasan
+    return f"""
+        INSERT INTO {tabel} ({kolom}, kategori, total, jumlah_transaksi)
+        VALUES (substr({alias}.tanggal, 1, {panjang}), {_sql_kategori(alias)}, {alias}.jumlah, 1)
+        ON CONFLICT({kolom}, kategori) DO UPDATE SET
+            total = total + excluded.total,
+            jumlah_transaksi = jumlah_transaksi + 1;"""
+
+def _sql_kurangi_ringkasan(alias: str, ringkasan: tuple = RINGKASAN_BULANAN) -> str:
+    tabel, kolom, panjang = ringkasan
+    return f"""
+        UPDATE {tabel}
+        SET total = total - {alias}.jumlah, jumlah_transaksi = jumlah_transaksi - 1
+        WHERE {kolom} = substr({alias}.tanggal, 1, {panjang}) AND kategori = {_sql_kategori(alias)};"""
+
+MIGRASI_ANGGARAN = [
+    """CREATE TABLE IF NOT EXISTS budget (
+        bulan TEXT NOT NULL,
+        kategori TEXT NOT NULL,
+        jumlah REAL NOT NULL CHECK(jumlah >= 0),
+        PRIMARY KEY (bulan, kategori)
+    )""",
+    """CREATE TABLE IF NOT EXISTS monthly_category_totals (
+        bulan TEXT NOT NULL,
+        kategori TEXT NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        jumlah_transaksi INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (bulan, kategori)
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_transaksi_insert_bulanan
+    AFTER INSERT ON transaksi BEGIN {_sql_tambah_ringkasan('NEW')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_transaksi_delete_bulanan
+    AFTER DELETE ON transaksi BEGIN {_sql_kurangi_ringkasan('OLD')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_transaksi_update_bulanan
+    AFTER UPDATE OF jumlah, kategori, tanggal ON transaksi BEGIN {_sql_kurangi_ringkasan('OLD')} {_sql_tambah_ringkasan('NEW')}
+    END""",
+]
+
+MIGRASI_RINGKASAN_HARIAN = [
+    """CREATE TABLE IF NOT EXISTS daily_category_totals (
+        tanggal TEXT NOT NULL,
+        kategori TEXT NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        jumlah_transaksi INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (tanggal, kategori)
+    ) WITHOUT ROWID""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_transaksi_insert_harian
+    AFTER INSERT ON transaksi BEGIN {_sql_tambah_ringkasan('NEW', RINGKASAN_HARIAN)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_transaksi_delete_harian
+    AFTER DELETE ON transaksi BEGIN {_sql_kurangi_ringkasan('OLD', RINGKASAN_HARIAN)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_transaksi_update_harian
+    AFTER UPDATE OF jumlah, kategori, tanggal ON transaksi BEGIN {_sql_kurangi_ringkasan('OLD', RINGKASAN_HARIAN)} {_sql_tambah_ringkasan('NEW', RINGKASAN_HARIAN)}
+    END""",
+]
+
+def _rebuild_ringkasan(cursor: sqlite3.Cursor, ringkasan: tuple = RINGKASAN_BULANAN):
+    tabel, kolom, panjang = ringkasan
+    cursor.execute(f"DELETE FROM {tabel}")
+    cursor.execute(f"""
+        INSERT INTO {tabel} ({kolom}, kategori, total, jumlah_transaksi)
+        SELECT substr(t.tanggal, 1, {panjang}), {_sql_kategori('t')}, SUM(t.jumlah), COUNT(*)
+        FROM transaksi t
+        GROUP BY 1, 2""")
+
+def rebuild_ringkasan() -> bool:
+    """Membangun ulang ringkasan bulanan & harian dari tabel transaksi (cek konsistensi)."""
+    conn = get_db_connection()
+    if not conn:
+        return False
+    try:
+        with conn:
+            cursor = conn.cursor()
+            _rebuild_ringkasan(cursor, RINGKASAN_BULANAN)
+            _rebuild_ringkasan(cursor, RINGKASAN_HARIAN)
+        return True
+    except sqlite3.Error as e:
+        print(f"ERROR [database.py] Rebuild ringkasan gagal: {e}")
+        return False
+    finally:
+        conn.close()
+
+def _tabel_ada(cursor: sqlite3.Cursor, nama: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (nama,))
+    return cursor.fetchone() is not None
+
+def _kolom_ada(cursor: sqlite3.Cursor, tabel: str, kolom: str) -> bool:
+    cursor.execute(f"PRAGMA table_info({tabel})")
+    return any(row[1] == kolom for row in cursor.fetchall())
+
+def _migrasi_hash_konten(cursor: sqlite3.Cursor):
+    """Kolom hash isi transaksi hasil import + unique index untuk skip duplikat.
+    Transaksi input manual memakai NULL sehingga tidak ikut dibatasi."""
+    if not _kolom_ada(cursor, "transaksi", "hash_konten"):
+        cursor.execute("ALTER TABLE transaksi ADD COLUMN hash_konten TEXT")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_transaksi_hash_konten ON transaksi (hash_konten)")
+
 def setup_database_initial():
     """Memastikan tabel transaksi ada (dipanggil oleh AnggaranHarian jika perlu)."""
+    global _fts_aktif
     print(f"Memeriksa/membuat tabel di database (via database.py): {DB_PATH}")
     conn = get_db_connection()
     if not conn:
@@ -88,6 +323,17 @@ def setup_database_initial():
             tanggal DATE NOT NULL
         );"""
         cursor.execute(sql_create_table)
+        for sql_migrasi in MIGRASI_INDEKS:
+            cursor.execute(sql_migrasi)
+        _migrasi_hash_konten(cursor)
+        _fts_aktif = _migrasi_fts(cursor)
+        # Isi awal ringkasan dari transaksi yang sudah ada sebelum migrasi
+        for daftar_migrasi, ringkasan in ((MIGRASI_ANGGARAN, RINGKASAN_BULANAN), (MIGRASI_RINGKASAN_HARIAN, RINGKASAN_HARIAN)):
+            ringkasan_baru = not _tabel_ada(cursor, ringkasan[0])
+            for sql_migrasi in daftar_migrasi:
+                cursor.execute(sql_migrasi)
+            if ringkasan_baru:
+                _rebuild_ringkasan(cursor, ringkasan)
         conn.commit()
         print(" -> Tabel 'transaksi' siap.")
         return True
@@ -0,0 +1,231 @@
+# impor_csv.py
+# Importer mutasi rekening / riwayat e-wallet (CSV) ke tabel transaksi.
+# CSV dibaca bertahap per chunk (memori tetap kecil walau ratusan ribu
+# baris), tiap chunk divalidasi lalu disimpan dengan satu executemany.
+# Duplikat dilewati lewat hash isi (unique index idx_transaksi_hash_konten).
+# Penghitung transaksi identik disimpan di SQLite sementara di disk, bukan
+# dict, supaya memori tidak tumbuh mengikuti jumlah baris file.
+# Baris tanpa kategori yang valid dikategorikan otomatis dari deskripsinya.
+#
+# Contoh:
+#   python impor_csv.py mutasi.csv --kolom-tanggal "Tanggal" --kolom-jumlah "Nominal" --kolom-deskripsi "Keterangan"
+import argparse
+import contextlib
+import csv
+import datetime
+import hashlib
+import itertools
+import re
+import sqlite3
+import time
+from model import Transaksi
+from manajer_anggaran import AnggaranHarian
+from kategorisasi import get_pengkategori
+from konfigurasi import KATEGORI_PENGELUARAN, KATEGORI_DEFAULT
+
+UKURAN_CHUNK_DEFAULT = 5000
+FORMAT_TANGGAL_UMUM = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%Y/%m/%d", "%d %b %Y", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M"]
+_KATEGORI_LOWER = {k.lower(): k for k in KATEGORI_PENGELUARAN}
+_RIBUAN_TITIK = re.compile(r"^\d{1,3}(\.\d{3})+$")  # 25.000 / 1.250.000
+_RIBUAN_KOMA = re.compile(r"^\d{1,3}(,\d{3})+$")    # 25,000 / 1,250,000
+
+class PembacaTanggal:
+    """Parser tanggal yang mengingat format terakhir yang berhasil (jalur cepat)
+    dan hasil parse per teks (mutasi berisi banyak baris dengan tanggal sama)."""
+    UKURAN_MEMO = 4096
+
+    def __init__(self, format_tanggal: str | None = None):
+        self.daftar_format = [format_tanggal] if format_tanggal else list(FORMAT_TANGGAL_UMUM)
+        self._memo = {}
+
+    def parse(self, teks: str) -> datetime.date | None:
+        if teks in self._memo:
+            return self._memo[teks]
+        if len(self._memo) >= self.UKURAN_MEMO:
+            self._memo.clear()
+        hasil = self._memo[teks] = self._parse(teks.strip())
+        return hasil
+
+    def _parse(self, teks: str) -> datetime.date | None:
+        for i, fmt in enumerate(self.daftar_format):
+            try:
+                hasil = datetime.datetime.strptime(teks, fmt).date()
+            except ValueError:
+                continue
+            if i:
+                self.daftar_format.insert(0, self.daftar_format.pop(i))
+            return hasil
+        return None
+
+def parse_jumlah(teks: str) -> float | None:
+    """'Rp 25.000', '-25,000.50', '25.000,50', '(15000)' -> nilai absolut."""
+    s = teks.strip().replace("Rp", "").replace("IDR", "").replace(" ", "")
+    if s.startswith("(") and s.endswith(")"):
+        s = s[1:-1]
+    s = s.lstrip("+-")
+    if not s:
+        return None
+    if "." in s and "," in s:
+        # Pemisah desimal = yang muncul terakhir
+        if s.rfind(",") > s.rfind("."):
+            s = s.replace(".", "").replace(",", ".")
+        else:
+            s = s.replace(",", "")
+    elif _RIBUAN_TITIK.match(s):
+        s = s.replace(".", "")
+    elif _RIBUAN_KOMA.match(s):
+        s = s.replace(",", "")
+    else:
+        s = s.replace(",", ".")
+    try:
+        return abs(float(s))
+    except ValueError:
+        return None
+
+def _normalisasi_deskripsi(deskripsi: str) -> str:
+    return " ".join(deskripsi.lower().split())
+
+def _kunci_identik(tanggal: datetime.date, jumlah: float, deskripsi: str) -> str:
+    return f"{tanggal.isoformat()}|{jumlah:.2f}|{_normalisasi_deskripsi(deskripsi)}"
+
+def hash_konten(tanggal: datetime.date, jumlah: float, deskripsi: str, urutan: int) -> str:
+    """Hash isi transaksi. `urutan` membedakan transaksi identik di hari yang sama
+    (misal dua kopi dengan harga sama), sehingga import ulang file yang sama
+    tetap menghasilkan hash yang sama tanpa membuang transaksi asli."""
+    return _hash_kunci(_kunci_identik(tanggal, jumlah, deskripsi), urutan)
+
+def _hash_kunci(kunci_identik: str, urutan: int) -> str:
+    return hashlib.sha1(f"{kunci_identik}|{urutan}".encode("utf-8")).hexdigest()
+
+class PenghitungUrutan:
+    """Urutan kemunculan transaksi identik (tanggal, jumlah, deskripsi) untuk
+    SELURUH file, lintas chunk: CSV tidak harus terurut per tanggal, jadi dua
+    transaksi identik yang tidak bersebelahan tetap mendapat urutan berbeda.
+    Hitungan disimpan di database SQLite sementara (file temp yang dihapus
+    saat ditutup), jadi memori hanya sebesar satu chunk + cache halaman."""
+    UKURAN_IN = 500  # Batas parameter per query IN (...)
+
+    def __init__(self):
+        self._conn = sqlite3.connect("")
+        self._conn.execute("CREATE TABLE urutan (kunci BLOB PRIMARY KEY, jumlah INTEGER NOT NULL) WITHOUT ROWID")
+
+    def urutkan(self, daftar_kunci: list[str]) -> list[int]:
+        """Urutan (1, 2, ...) tiap kunci, melanjutkan hitungan chunk sebelumnya."""
+        digest = [hashlib.sha1(k.encode("utf-8")).digest() for k in daftar_kunci]
+        unik = list(dict.fromkeys(digest))
+        hitung = {}
+        for i in range(0, len(unik), self.UKURAN_IN):
+            potongan = unik[i:i + self.UKURAN_IN]
+            hitung.update(self._conn.execute(
+                f"SELECT kunci, jumlah FROM urutan WHERE kunci IN ({', '.join('?' * len(potongan))})", potongan))
+        hasil = []
+        for d in digest:
+            hitung[d] = hitung.get(d, 0) + 1
+            hasil.append(hitung[d])
+        self._conn.executemany("INSERT OR REPLACE INTO urutan (kunci, jumlah) VALUES (?, ?)", hitung.items())
+        return hasil
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._conn.close()
+
+def _baca_chunk(reader, ukuran: int):
+    while True:
+        chunk = list(itertools.islice(reader, ukuran))
+        if not chunk:
+            return
+        yield chunk
+
+def impor_csv(path: str, kolom_tanggal: str, kolom_jumlah: str, kolom_deskripsi: str,
+              kolom_kategori: str | None = None, format_tanggal: str | None = None,
+              pemisah: str = ",", encoding: str = "utf-8-sig",
+              ukuran_chunk: int = UKURAN_CHUNK_DEFAULT, anggaran: AnggaranHarian | None = None,
+              path_ditolak: str | None = None, kategori_otomatis: bool = True,
+              verbose: bool = True) -> dict:
+    anggaran = anggaran or AnggaranHarian()
+    pengkategori = get_pengkategori() if kategori_otomatis else None
+    pembaca_tgl = PembacaTanggal(format_tanggal)
+    statistik = {"dibaca": 0, "valid": 0, "ditolak": 0, "duplikat": 0, "diimpor": 0}
+    mulai = time.perf_counter()
+
+    with PenghitungUrutan() as penghitung, \
+         open(path, newline="", encoding=encoding) as f, \
+         (open(path_ditolak, "w", newline="", encoding="utf-8") if path_ditolak else contextlib.nullcontext()) as f_tolak:
+        reader = csv.DictReader(f, delimiter=pemisah)
+        hilang = [k for k in (kolom_tanggal, kolom_jumlah, kolom_deskripsi, kolom_kategori) if k and k not in (reader.fieldnames or [])]
+        if hilang:
+            raise ValueError(f"Kolom tidak ditemukan di CSV: {', '.join(hilang)}")
+        penulis_tolak = csv.writer(f_tolak) if path_ditolak else None
+        if penulis_tolak:
+            penulis_tolak.writerow(list(reader.fieldnames) + ["alasan"])
+
+        for chunk in _baca_chunk(reader, ukuran_chunk):
+            transaksi_list, kunci_list = [], []
+            for baris in chunk:
+                statistik["dibaca"] += 1
+                tanggal = pembaca_tgl.parse(baris.get(kolom_tanggal) or "")
+                jumlah = parse_jumlah(baris.get(kolom_jumlah) or "")
+                deskripsi = (baris.get(kolom_deskripsi) or "").strip()
+                alasan = None
+                if tanggal is None:
+                    alasan = "tanggal tidak valid"
+                elif not jumlah:
+                    alasan = "jumlah tidak valid"
+                elif not deskripsi:
+                    alasan = "deskripsi kosong"
+                if alasan:
+                    statistik["ditolak"] += 1
+                    if penulis_tolak:
+                        penulis_tolak.writerow(list(baris.values()) + [alasan])
+                    continue
+
+                kategori = _KATEGORI_LOWER.get((baris.get(kolom_kategori) or "").strip().lower()) if kolom_kategori else None
+                if kategori is None:
+                    kategori = pengkategori.kategorikan(deskripsi) if pengkategori else KATEGORI_DEFAULT
+                transaksi_list.append(Transaksi.dari_baris(None, deskripsi, jumlah, kategori, tanggal))
+                kunci_list.append(_kunci_identik(tanggal, jumlah, deskripsi))
+
+            hash_list = [_hash_kunci(k, u) for k, u in zip(kunci_list, penghitung.urutkan(kunci_list))]
+
+            statistik["valid"] += len(transaksi_list)
+            if transaksi_list:
+                tersimpan = anggaran.tambah_transaksi_batch(transaksi_list, hash_list)
+                if tersimpan is None:
+                    raise RuntimeError(f"Gagal menyimpan chunk setelah baris ke-{statistik['dibaca']}.")
+                statistik["diimpor"] += tersimpan
+                statistik["duplikat"] += len(transaksi_list) - tersimpan
+            if verbose:
+                durasi = time.perf_counter() - mulai
+                print(f" -> {statistik['dibaca']:,} baris dibaca, {statistik['diimpor']:,} diimpor ({statistik['dibaca'] / durasi:,.0f} baris/detik)")
+
+    statistik["durasi_detik"] = round(time.perf_counter() - mulai, 3)
+    statistik["baris_per_detik"] = round(statistik["dibaca"] / statistik["durasi_detik"]) if statistik["durasi_detik"] else 0
+    return statistik
+
+def main():
+    parser = argparse.ArgumentParser(description="Import CSV mutasi rekening/e-wallet ke catatan pengeluaran.")
+    parser.add_argument("path", help="File CSV sumber")
+    parser.add_argument("--kolom-tanggal", default="tanggal")
+    parser.add_argument("--kolom-jumlah", default="jumlah")
+    parser.add_argument("--kolom-deskripsi", default="deskripsi")
+    parser.add_argument("--kolom-kategori", default=None, help="Opsional; jika kosong kategori ditebak dari deskripsi")
+    parser.add_argument("--format-tanggal", default=None, help="Contoh: %%d/%%m/%%Y (default: deteksi otomatis)")
+    parser.add_argument("--pemisah", default=",", help="Pemisah kolom CSV (default: ,)")
+    parser.add_argument("--encoding", default="utf-8-sig")
+    parser.add_argument("--chunk", type=int, default=UKURAN_CHUNK_DEFAULT, help="Jumlah baris per batch insert")
+    parser.add_argument("--ditolak", default=None, help="Simpan baris yang ditolak ke file CSV ini")
+    parser.add_argument("--tanpa-kategori-otomatis", action="store_true", help="Pakai kategori default alih-alih menebak dari deskripsi")
+    args = parser.parse_args()
+
+    print(f"--- Import CSV: {args.path} ---")
+    hasil = impor_csv(args.path, args.kolom_tanggal, args.kolom_jumlah, args.kolom_deskripsi,
+                      kolom_kategori=args.kolom_kategori, format_tanggal=args.format_tanggal,
+                      pemisah=args.pemisah, encoding=args.encoding, ukuran_chunk=args.chunk,
+                      path_ditolak=args.ditolak, kategori_otomatis=not args.tanpa_kategori_otomatis)
+    print(f"Dibaca: {hasil['dibaca']:,} | Diimpor: {hasil['diimpor']:,} | Duplikat: {hasil['duplikat']:,} | Ditolak: {hasil['ditolak']:,}")
+    print(f"Durasi: {hasil['durasi_detik']} detik ({hasil['baris_per_detik']:,} baris/detik)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# kategorisasi.py
+# Kategorisasi otomatis deskripsi transaksi berdasarkan ATURAN_KATEGORI.
+# Semua kata kunci dari semua kategori dikompilasi menjadi SATU regex
+# berbentuk trie (awalan yang sama digabung), sehingga tiap deskripsi
+# cukup dipindai sekali oleh mesin regex C, bukan dicocokkan per aturan.
+#
+# Contoh:
+#   python kategorisasi.py --rekategorikan        # hanya yang kategorinya default/kosong
+#   python kategorisasi.py --rekategorikan --semua
+#   python kategorisasi.py --benchmark
+import argparse
+import re
+import time
+import database
+from konfigurasi import ATURAN_KATEGORI, KATEGORI_DEFAULT
+
+def _regex_trie(kata_list: list[str]) -> str:
+    """Menyusun alternasi regex dari trie, misal [grab, grabfood, gojek] -> g(?:rab(?:food)?|ojek)."""
+    trie = {}
+    for kata in kata_list:
+        node = trie
+        for huruf in kata:
+            node = node.setdefault(huruf, {})
+        node[""] = True
+
+    def susun(node) -> str:
+        cabang = [re.escape(h) + susun(anak) for h, anak in sorted(node.items()) if h]
+        if not cabang:
+            return ""
+        isi = cabang[0] if len(cabang) == 1 else "(?:" + "|".join(cabang) + ")"
+        if "" in node:
+            # Optional greedy: kata yang lebih panjang dicoba dulu, lalu kata pendek
+            return "(?:" + isi + ")?"
+        return isi
+
+    return susun(trie)
+
+class PengkategoriOtomatis:
+    """Matcher multi-pola: deskripsi -> kategori pertama yang kata kuncinya muncul paling awal."""
+    def __init__(self, aturan: dict[str, list[str]] = ATURAN_KATEGORI, kategori_default: str = KATEGORI_DEFAULT):
+        self.kategori_default = kategori_default
+        self._peta = {}
+        for kategori, kata_list in aturan.items():
+            for kata in kata_list:
+                # Kata kunci ganda: kategori yang didefinisikan lebih dulu menang
+                self._peta.setdefault(" ".join(kata.lower().split()), kategori)
+        pola = _regex_trie(list(self._peta))
+        self._regex = re.compile(r"(?<!\w)(" + pola + r")(?!\w)", re.IGNORECASE)
+
+    def kategorikan(self, deskripsi: str) -> str:
+        m = self._regex.search(deskripsi) if deskripsi else None
+        return self._peta.get(m.group(1).lower(), self.kategori_default) if m else self.kategori_default
+
+    def kategorikan_batch(self, daftar_deskripsi: list[str]) -> list[str]:
+        cari, peta, default = self._regex.search, self._peta, self.kategori_default
+        hasil = []
+        for deskripsi in daftar_deskripsi:
+            m = cari(deskripsi) if deskripsi else None
+            hasil.append(peta.get(m.group(1).lower(), default) if m else default)
+        return hasil
+
+_pengkategori = None
+
+def get_pengkategori() -> PengkategoriOtomatis:
+    """Instance bersama (regex hanya dikompilasi sekali per proses)."""
+    global _pengkategori
+    if _pengkategori is None:
+        _pengkategori = PengkategoriOtomatis()
+    return _pengkategori
+
+def rekategorikan(semua: bool = False, ukuran_chunk: int = 5000, verbose: bool = True) -> int:
+    """Menghitung ulang kategori transaksi yang tersimpan.
+    Default hanya baris berkategori default/kosong; `semua=True` untuk semua baris.
+    Mengembalikan jumlah baris yang kategorinya berubah."""
+    database.setup_database_initial()
+    pengkategori = get_pengkategori()
+    filter_kategori = "" if semua else " AND (kategori IS NULL OR kategori = '' OR kategori = ?)"
+    sql = f"SELECT id, deskripsi, kategori FROM transaksi WHERE id > ?{filter_kategori} ORDER BY id LIMIT ?"
+    id_terakhir, total_berubah, total_dibaca = 0, 0, 0
+    mulai = time.perf_counter()
+    while True:
+        params = (id_terakhir,) + (() if semua else (KATEGORI_DEFAULT,)) + (ukuran_chunk,)
+        rows = database.fetch_query(sql, params, fetch_all=True)
+        if not rows:
+            break
+        kategori_baru = pengkategori.kategorikan_batch([row['deskripsi'] for row in rows])
+        perubahan = [(baru, row['id']) for row, baru in zip(rows, kategori_baru) if baru != row['kategori']]
+        if perubahan:
+            # Trigger ringkasan bulanan ikut memindahkan total ke kategori baru
+            if database.execute_many("UPDATE transaksi SET kategori = ? WHERE id = ?", perubahan) is None:
+                break
+            total_berubah += len(perubahan)
+        total_dibaca += len(rows)
+        id_terakhir = rows[-1]['id']
+        if verbose:
+            print(f" -> {total_dibaca:,} baris diperiksa, {total_berubah:,} diubah")
+    if verbose:
+        print(f"Selesai dalam {time.perf_counter() - mulai:.2f} detik.")
+    return total_berubah
+
+def benchmark(jumlah: int = 200_000) -> float:
+    contoh = ["Pembayaran GoFood ayam geprek", "Transfer ke Budi", "GRAB* A-5XYZ Jakarta",
+              "Indomaret Point Kemang", "Token listrik PLN 100rb", "Apotek K24 Sudirman",
+              "Netflix.com subscription", "Kopi susu gula aren", "QRIS merchant 8812371", "Beli buku Gramedia"]
+    data = (contoh * (jumlah // len(contoh) + 1))[:jumlah]
+    pengkategori = get_pengkategori()
+    mulai = time.perf_counter()
+    pengkategori.kategorikan_batch(data)
+    per_detik = jumlah / (time.perf_counter() - mulai)
+    print(f"{jumlah:,} deskripsi dikategorikan: {per_detik:,.0f} deskripsi/detik")
+    return per_detik
+
+def main():
+    parser = argparse.ArgumentParser(description="Kategorisasi otomatis transaksi berdasarkan kata kunci.")
+    parser.add_argument("--rekategorikan", action="store_true", help="Hitung ulang kategori transaksi di database")
+    parser.add_argument("--semua", action="store_true", help="Bersama --rekategorikan: proses semua baris, bukan hanya kategori default")
+    parser.add_argument("--benchmark", action="store_true", help="Ukur kecepatan kategorisasi")
+    parser.add_argument("deskripsi", nargs="*", help="Deskripsi untuk dicoba langsung")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+    if args.rekategorikan:
+        print("--- Rekategorisasi Transaksi ---")
+        rekategorikan(semua=args.semua)
+    for deskripsi in args.deskripsi:
+        print(f"{deskripsi!r} -> {get_pengkategori().kategorikan(deskripsi)}")
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,54 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 NAMA_DB = 'pengeluaran_harian.db'
-DB_PATH = os.path.join(BASE_DIR, NAMA_DB)
+# PENGELUARAN_DB_PATH: database alternatif (misal benchmark_anggaran.py)
+DB_PATH = os.environ.get("PENGELUARAN_DB_PATH") or os.path.join(BASE_DIR, NAMA_DB)
 KATEGORI_PENGELUARAN = [
     "Makanan", "Transportasi", "Hiburan", "Tagihan", 
     "Belanja", "Kesehatan", "Pendidikan", "Lainnya"
 ]
 KATEGORI_DEFAULT = "Lainnya"
+
+# Batas entri cache ringkasan AnggaranHarian (LRU). Instance dibagi semua
+# sesi Streamlit (st.cache_resource), jadi cache harus berukuran tetap.
+UKURAN_CACHE_RINGKASAN = 256
+
+# Aturan kata kunci untuk kategorisasi otomatis (lihat kategorisasi.py).
+# Dicocokkan per kata (tidak peka huruf besar/kecil); bila beberapa kata
+# kunci cocok, yang muncul paling awal di deskripsi yang dipakai.
+ATURAN_KATEGORI = {
+    "Makanan": [
+        "makan", "makanan", "resto", "restoran", "rumah makan", "warung", "warteg", "kantin",
+        "gofood", "grabfood", "shopeefood", "kopi", "coffee", "cafe", "kafe", "bakso", "nasi",
+        "ayam", "mie", "sate", "soto", "pizza", "burger", "mcd", "mcdonalds", "kfc", "starbucks",
+        "janji jiwa", "roti", "jajan", "snack", "minum", "es teh",
+    ],
+    "Transportasi": [
+        "gojek", "goride", "gocar", "grab", "grabbike", "grabcar", "maxim", "ojek", "ojol",
+        "taksi", "taxi", "bluebird", "bensin", "pertamax", "pertalite", "spbu", "pertamina",
+        "parkir", "tol", "e-toll", "krl", "mrt", "lrt", "transjakarta", "kereta", "kai",
+        "bus", "travel", "pesawat", "tiket pesawat", "servis motor",
+    ],
+    "Hiburan": [
+        "netflix", "spotify", "youtube premium", "disney", "vidio", "bioskop", "cinema", "xxi",
+        "cgv", "game", "steam", "konser", "karaoke", "nonton", "liburan", "wisata",
+    ],
+    "Tagihan": [
+        "pln", "listrik", "token listrik", "pdam", "internet", "indihome", "wifi", "pulsa",
+        "paket data", "kuota", "telkomsel", "indosat", "bpjs", "cicilan", "angsuran",
+        "kartu kredit", "asuransi", "sewa", "kos", "kost", "iuran",
+    ],
+    "Belanja": [
+        "indomaret", "alfamart", "alfamidi", "tokopedia", "shopee", "lazada", "blibli", "tiktok shop",
+        "supermarket", "minimarket", "hypermart", "superindo", "giant", "belanja", "baju",
+        "sepatu", "pakaian", "sabun", "sembako",
+    ],
+    "Kesehatan": [
+        "apotek", "apotik", "obat", "klinik", "dokter", "rumah sakit", "rs", "puskesmas",
+        "halodoc", "vitamin", "kimia farma", "k24", "lab", "periksa",
+    ],
+    "Pendidikan": [
+        "buku", "kursus", "sekolah", "kuliah", "ukt", "spp", "udemy", "coursera", "les",
+        "seminar", "fotokopi", "print", "alat tulis", "gramedia",
+    ],
+}
@@ -20,7 +20,7 @@ def format_rp(angka):
 
 try:
     from model import Transaksi
-    from manajer_anggaran import AnggaranHarian
+    from manajer_anggaran import AnggaranHarian, rentang_minggu, rentang_bulan
     from konfigurasi import KATEGORI_PENGELUARAN
 except ImportError as e:
     st.error(f"Gagal mengimpor modul: {e}. Pastikan file .py lain ada.")
@@ -36,6 +36,20 @@ def get_anggaran_manager():
 
 anggaran = get_anggaran_manager()
 
+# Halaman riwayat di-cache per versi data: setiap tambah/hapus menaikkan
+# anggaran.versi_data sehingga kunci cache berganti tanpa perlu
+# st.cache_data.clear() yang menghapus cache semua pengguna.
+@st.cache_data(ttl=300, max_entries=32)
+def get_halaman_riwayat_cached(_anggaran: AnggaranHarian, versi_data: int, ukuran: int, kursor: tuple | None, urut: str, menurun: bool, cari: str, mentah: bool = False):
+    return _anggaran.get_halaman_transaksi(ukuran, kursor, urut, menurun, cari, mentah=mentah)
+
+PILIHAN_URUT_RIWAYAT = {
+    "Tanggal (terbaru)": ("tanggal", True),
+    "Tanggal (terlama)": ("tanggal", False),
+    "Jumlah (terbesar)": ("jumlah", True),
+    "Jumlah (terkecil)": ("jumlah", False),
+}
+
 # --- Fungsi Halaman/UI ---
 def halaman_input(anggaran: AnggaranHarian):
     st.header("Tambah Pengeluaran Baru")
@@ -61,60 +75,160 @@ def halaman_input(anggaran: AnggaranHarian):
                     tx = Transaksi(deskripsi, float(jumlah), kategori, tanggal)
                     if anggaran.tambah_transaksi(tx):
                         st.success("OK! Simpan.", icon="✅")
-                        st.cache_data.clear()
                         st.rerun()
                     else:
                         st.error("Gagal simpan.", icon="❌")
 
 def halaman_riwayat(anggaran: AnggaranHarian):
     st.subheader("Detail Semua Transaksi")
+    col_cari, col_urut, col_ukuran = st.columns([3, 2, 1])
+    with col_cari:
+        cari = st.text_input("Cari deskripsi:", placeholder="Contoh: kopi", key="riwayat_cari").strip()
+    with col_urut:
+        pilihan_urut = st.selectbox("Urutkan:", list(PILIHAN_URUT_RIWAYAT), key="riwayat_urut")
+    with col_ukuran:
+        ukuran = st.selectbox("Per halaman:", [25, 50, 100], index=1, key="riwayat_ukuran")
+    urut, menurun = PILIHAN_URUT_RIWAYAT[pilihan_urut]
+    mode_edit = st.toggle("Mode edit (ubah/hapus banyak sekaligus)", key="riwayat_mode_edit")
+
+    # Tumpukan kursor halaman yang sudah dibuka (None = halaman pertama);
+    # kembali ke halaman pertama setiap kali pencarian/urutan berubah.
+    parameter = (cari, urut, menurun, ukuran)
+    if st.session_state.get("riwayat_parameter") != parameter:
+        st.session_state.riwayat_parameter = parameter
+        st.session_state.riwayat_kursor = [None]
+    tumpukan_kursor = st.session_state.riwayat_kursor
+
     if st.button("Refresh Riwayat"):
-        st.cache_data.clear()
         with st.spinner("Memuat riwayat..."):
-            df_transaksi = anggaran.get_dataframe_transaksi()
+            df_transaksi, kursor_berikut = anggaran.get_halaman_transaksi(ukuran, tumpukan_kursor[-1], urut, menurun, cari, mentah=mode_edit)
     else:
-        df_transaksi = anggaran.get_dataframe_transaksi()
+        anggaran.cek_perubahan_eksternal()
+        df_transaksi, kursor_berikut = get_halaman_riwayat_cached(anggaran, anggaran.versi_data, ukuran, tumpukan_kursor[-1], urut, menurun, cari, mode_edit)
 
     if df_transaksi is None:
         st.error("Gagal ambil riwayat.")
+    elif df_transaksi.empty and len(tumpukan_kursor) > 1:
+        # Halaman terakhir kosong setelah penghapusan: mundur satu halaman
+        tumpukan_kursor.pop()
+        st.rerun()
     elif df_transaksi.empty:
-        st.info("Belum ada transaksi.")
+        st.info("Tidak ada transaksi yang cocok." if cari else "Belum ada transaksi.")
     else:
-        st.dataframe(df_transaksi, use_container_width=True, hide_index=True)
-        st.divider()
-        st.subheader("🔴 Hapus Transaksi")
-
-        id_hapus = st.number_input("ID Transaksi yang ingin dihapus:", min_value=1, step=1, format="%d")
-        
-        if st.button("Hapus Transaksi Terpilih"):
-            st.session_state.konfirmasi_id = id_hapus  # simpan ID di session_state
-
-        if 'konfirmasi_id' in st.session_state:
-            st.warning(f"Anda akan menghapus transaksi dengan ID {st.session_state.konfirmasi_id}.")
-            if st.button("Konfirmasi Hapus"):
-                with st.spinner("Menghapus transaksi..."):
-                    berhasil = anggaran.hapus_transaksi(st.session_state.konfirmasi_id)
-                    print(f"[DEBUG] Hapus ID {st.session_state.konfirmasi_id} → {berhasil}")
-                    if berhasil:
-                        st.success(f"Transaksi ID {st.session_state.konfirmasi_id} berhasil dihapus.")
-                        st.cache_data.clear()
-                        del st.session_state.konfirmasi_id  # hapus session state setelah sukses
-                        st.rerun()
-                    else:
-                        st.error("Gagal menghapus. Mungkin ID tidak ditemukan.")
-                        del st.session_state.konfirmasi_id  # hapus walau gagal
+        if mode_edit:
+            editor_transaksi(anggaran, df_transaksi, len(tumpukan_kursor))
+        else:
+            st.dataframe(df_transaksi, use_container_width=True, hide_index=True)
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ Sebelumnya", disabled=len(tumpukan_kursor) == 1, use_container_width=True):
+                tumpukan_kursor.pop()
+                st.rerun()
+        with col_info:
+            st.caption(f"Halaman {len(tumpukan_kursor)} · {len(df_transaksi)} transaksi")
+        with col_next:
+            if st.button("Berikutnya ▶", disabled=kursor_berikut is None, use_container_width=True):
+                tumpukan_kursor.append(kursor_berikut)
+                st.rerun()
+
+def editor_transaksi(anggaran: AnggaranHarian, df_halaman: pd.DataFrame, nomor_halaman: int):
+    """Editor massal satu halaman riwayat. Hanya sel yang diubah (edited_rows
+    milik st.data_editor) yang dikirim, dalam satu transaksi per simpan."""
+    df_edit = df_halaman[['id', 'tanggal', 'kategori', 'deskripsi', 'jumlah']].copy()
+    df_edit.insert(0, 'hapus', False)
+    # Kunci berganti setiap versi data/halaman agar editor mulai bersih setelah simpan
+    kunci_editor = f"editor_riwayat_{anggaran.versi_data}_{nomor_halaman}"
+    st.data_editor(
+        df_edit, key=kunci_editor, hide_index=True, use_container_width=True,
+        disabled=['id'],
+        column_config={
+            "hapus": st.column_config.CheckboxColumn("Hapus?", width="small"),
+            "id": st.column_config.NumberColumn("ID", format="%d"),
+            "tanggal": st.column_config.DateColumn("Tanggal", format="YYYY-MM-DD", required=True),
+            "kategori": st.column_config.SelectboxColumn("Kategori", options=KATEGORI_PENGELUARAN, required=True),
+            "deskripsi": st.column_config.TextColumn("Deskripsi", required=True),
+            "jumlah": st.column_config.NumberColumn("Jumlah (Rp)", min_value=1, step=1000, format="%.0f", required=True),
+        },
+    )
+    baris_diubah = st.session_state.get(kunci_editor, {}).get("edited_rows", {})
+    id_hapus = [int(df_edit.iloc[i]['id']) for i, sel in baris_diubah.items() if sel.get('hapus')]
+    perubahan = {}
+    for i, sel in baris_diubah.items():
+        id_transaksi = int(df_edit.iloc[i]['id'])
+        sel = {k: v for k, v in sel.items() if k != 'hapus'}
+        if sel and id_transaksi not in id_hapus:
+            perubahan[id_transaksi] = sel
+
+    # Penghapusan butuh konfirmasi kedua; status konfirmasi terikat ke editor ini
+    menunggu_konfirmasi = st.session_state.get("konfirmasi_hapus_batch") == kunci_editor
+    if menunggu_konfirmasi and not id_hapus:
+        del st.session_state.konfirmasi_hapus_batch
+        menunggu_konfirmasi = False
+
+    if st.button(f"Simpan Perubahan ({len(perubahan)} diubah, {len(id_hapus)} dihapus)",
+                 disabled=not (perubahan or id_hapus) or menunggu_konfirmasi, type="primary"):
+        if id_hapus:
+            st.session_state.konfirmasi_hapus_batch = kunci_editor
+            st.rerun()
+        simpan_editor(anggaran, perubahan, id_hapus)
+
+    if menunggu_konfirmasi:
+        st.warning(f"Anda akan menghapus {len(id_hapus)} transaksi (ID {', '.join(map(str, id_hapus))}). Tindakan ini tidak bisa dibatalkan.")
+        col_ya, col_batal = st.columns(2)
+        with col_ya:
+            if st.button("Konfirmasi Hapus & Simpan", type="primary", use_container_width=True):
+                del st.session_state.konfirmasi_hapus_batch
+                simpan_editor(anggaran, perubahan, id_hapus)
+        with col_batal:
+            if st.button("Batal", use_container_width=True):
+                del st.session_state.konfirmasi_hapus_batch
+                st.rerun()
+
+def simpan_editor(anggaran: AnggaranHarian, perubahan: dict, id_hapus: list[int]):
+    """Edit + hapus dalam satu transaksi DB dan satu kali invalidasi cache."""
+    with st.spinner("Menyimpan perubahan..."):
+        hasil = anggaran.simpan_perubahan_batch(perubahan, id_hapus)
+    if hasil is None:
+        st.error("Gagal menyimpan. Periksa kembali isian (jumlah > 0, deskripsi wajib).", icon="❌")
+    else:
+        st.success(f"{hasil[0]} transaksi diubah, {hasil[1]} dihapus.", icon="✅")
+        st.rerun()
 
 
 def halaman_ringkasan(anggaran: AnggaranHarian):
     st.subheader("Ringkasan Pengeluaran")
     col_filter1, col_filter2 = st.columns([1, 2])
     with col_filter1:
-        pilihan_periode = st.selectbox("Filter Periode:", ["Semua Waktu", "Hari Ini", "Pilih Tanggal"], key="filter_periode", on_change=lambda: st.cache_data.clear())
+        pilihan_periode = st.selectbox("Filter Periode:", ["Semua Waktu", "Hari Ini", "Minggu Ini", "Bulan Ini", "Pilih Bulan", "Pilih Tanggal", "Rentang Kustom"], key="filter_periode")
+    hari_ini = datetime.date.today()
     tanggal_filter = None
+    mulai_filter = akhir_filter = None
     label_periode = "(Semua Waktu)"
     if pilihan_periode == "Hari Ini":
-        tanggal_filter = datetime.date.today()
+        tanggal_filter = hari_ini
         label_periode = f"({tanggal_filter.strftime('%d %b')})"
+    elif pilihan_periode == "Minggu Ini":
+        mulai_filter, akhir_filter = rentang_minggu(hari_ini)
+        label_periode = f"({mulai_filter.strftime('%d %b')} - {akhir_filter.strftime('%d %b %Y')})"
+    elif pilihan_periode == "Bulan Ini":
+        mulai_filter, akhir_filter = rentang_bulan(hari_ini.year, hari_ini.month)
+        label_periode = f"({mulai_filter.strftime('%B %Y')})"
+    elif pilihan_periode == "Pilih Bulan":
+        col_bln, col_thn = st.columns([2, 1])
+        with col_bln:
+            bulan = st.selectbox("Bulan:", list(range(1, 13)), index=hari_ini.month - 1, format_func=lambda b: datetime.date(2000, b, 1).strftime('%B'), key="bulan_pilihan")
+        with col_thn:
+            tahun = st.number_input("Tahun:", min_value=2000, max_value=2100, value=hari_ini.year, step=1, key="tahun_pilihan")
+        mulai_filter, akhir_filter = rentang_bulan(int(tahun), bulan)
+        label_periode = f"({mulai_filter.strftime('%B %Y')})"
+    elif pilihan_periode == "Rentang Kustom":
+        rentang = st.date_input("Pilih Rentang:", value=(hari_ini - datetime.timedelta(days=29), hari_ini), key="rentang_pilihan")
+        if isinstance(rentang, (tuple, list)) and len(rentang) == 2:
+            mulai_filter, akhir_filter = rentang
+        else:
+            st.info("Pilih tanggal akhir rentang.")
+            mulai_filter = akhir_filter = rentang[0] if rentang else hari_ini
+        label_periode = f"({mulai_filter.strftime('%d %b %Y')} - {akhir_filter.strftime('%d %b %Y')})"
     elif pilihan_periode == "Pilih Tanggal":
         if 'tanggal_pilihan_state' not in st.session_state:
             st.session_state.tanggal_pilihan_state = datetime.date.today()
@@ -122,27 +236,20 @@ def halaman_ringkasan(anggaran: AnggaranHarian):
             "Pilih Tanggal:",
             value=st.session_state.tanggal_pilihan_state,
             key="tanggal_pilihan",
-            on_change=lambda: setattr(st.session_state, 'tanggal_pilihan_state', st.session_state.tanggal_pilihan) or st.cache_data.clear()
+            on_change=lambda: setattr(st.session_state, 'tanggal_pilihan_state', st.session_state.tanggal_pilihan)
         )
         label_periode = f"({tanggal_filter.strftime('%d %b %Y')})"
 
     with col_filter2:
-        @st.cache_data(ttl=300)
-        def hitung_total_cached(tgl_filter):
-            return anggaran.hitung_total_pengeluaran(tanggal=tgl_filter)
-
-        total_pengeluaran = hitung_total_cached(tanggal_filter)
+        # Total & per kategori di-cache di dalam AnggaranHarian per rentang
+        total_pengeluaran = anggaran.hitung_total_pengeluaran(tanggal=tanggal_filter, mulai=mulai_filter, akhir=akhir_filter)
         st.metric(label=f"Total Pengeluaran {label_periode}", value=format_rp(total_pengeluaran))
 
     st.divider()
     st.subheader(f"Pengeluaran per Kategori {label_periode}")
 
-    @st.cache_data(ttl=300)
-    def get_kategori_cached(tgl_filter):
-        return anggaran.get_pengeluaran_per_kategori(tanggal=tgl_filter)
-
     with st.spinner("Memuat ringkasan kategori..."):
-        dict_per_kategori = get_kategori_cached(tanggal_filter)
+        dict_per_kategori = anggaran.get_pengeluaran_per_kategori(tanggal=tanggal_filter, mulai=mulai_filter, akhir=akhir_filter)
 
     if not dict_per_kategori:
         st.info(f"Tidak ada data untuk periode ini.")
@@ -162,10 +269,84 @@ def halaman_ringkasan(anggaran: AnggaranHarian):
         except Exception as e:
             st.error(f"Gagal tampilkan ringkasan: {e}")
 
+def halaman_tren(anggaran: AnggaranHarian):
+    st.subheader("Tren Pengeluaran")
+    hari_ini = datetime.date.today()
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        rentang = st.date_input("Rentang:", value=(hari_ini - datetime.timedelta(days=89), hari_ini), key="tren_rentang")
+    with col2:
+        periode = st.selectbox("Periode:", ["Harian", "Mingguan", "Bulanan"], key="tren_periode")
+    with col3:
+        jendela = st.selectbox("Rata-rata bergulir:", [7, 30], format_func=lambda j: f"{j} hari", key="tren_jendela")
+    if not (isinstance(rentang, (tuple, list)) and len(rentang) == 2):
+        st.info("Pilih tanggal akhir rentang.")
+        return
+    mulai, akhir = rentang
+
+    with st.spinner("Memuat tren..."):
+        df_tren = anggaran.get_tren(periode.lower(), mulai, akhir)
+    if df_tren.empty:
+        st.info("Tidak ada data untuk rentang ini.")
+        return
+    kategori_pilihan = st.multiselect("Kategori:", list(df_tren.columns), default=list(df_tren.columns), key="tren_kategori")
+    if not kategori_pilihan:
+        st.info("Pilih minimal satu kategori.")
+        return
+
+    st.write(f"Total {periode.lower()} per kategori:")
+    st.bar_chart(df_tren[kategori_pilihan], use_container_width=True)
+
+    st.write(f"Rata-rata bergulir {jendela} hari:")
+    df_bergulir = anggaran.get_rata_rata_bergulir(jendela, mulai, akhir)
+    st.line_chart(df_bergulir[kategori_pilihan + ['Total']], use_container_width=True)
+
+def halaman_anggaran(anggaran: AnggaranHarian):
+    st.subheader("Anggaran Bulanan per Kategori")
+    hari_ini = datetime.date.today()
+    col_bln, col_thn = st.columns([2, 1])
+    with col_bln:
+        bulan = st.selectbox("Bulan:", list(range(1, 13)), index=hari_ini.month - 1, format_func=lambda b: datetime.date(2000, b, 1).strftime('%B'), key="anggaran_bulan")
+    with col_thn:
+        tahun = int(st.number_input("Tahun:", min_value=2000, max_value=2100, value=hari_ini.year, step=1, key="anggaran_tahun"))
+
+    status = anggaran.get_status_budget(tahun, bulan)
+    if not status:
+        st.info("Belum ada anggaran maupun pengeluaran untuk bulan ini.")
+    else:
+        df_status = pd.DataFrame(status)
+        df_status['Anggaran'] = df_status['budget'].map(lambda x: format_rp(x) if pd.notna(x) else "-")
+        df_status['Terpakai'] = df_status['terpakai'].map(format_rp)
+        df_status['Sisa'] = df_status['sisa'].map(lambda x: ("-" + format_rp(-x) if x < 0 else format_rp(x)) if pd.notna(x) else "-")
+        df_status['Pemakaian'] = (df_status['terpakai'] / df_status['budget']).where(df_status['budget'] > 0)
+        st.dataframe(
+            df_status[['kategori', 'Anggaran', 'Terpakai', 'Sisa', 'Pemakaian']].rename(columns={'kategori': 'Kategori'}),
+            hide_index=True, use_container_width=True,
+            column_config={"Pemakaian": st.column_config.ProgressColumn("Pemakaian", format="%.0f%%", min_value=0, max_value=1)}
+        )
+        lewat = [s['kategori'] for s in status if s['sisa'] is not None and s['sisa'] < 0]
+        if lewat:
+            st.warning(f"Melewati anggaran: {', '.join(lewat)}", icon="⚠")
+
+    st.divider()
+    with st.form("form_budget"):
+        st.write("Atur Anggaran")
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            kategori = st.selectbox("Kategori:", KATEGORI_PENGELUARAN)
+        with col2:
+            jumlah = st.number_input("Anggaran (Rp):", min_value=0.0, step=50000.0, format="%.0f")
+        if st.form_submit_button("Simpan Anggaran"):
+            if anggaran.set_budget(tahun, bulan, kategori, jumlah):
+                st.success("Anggaran disimpan.", icon="✅")
+                st.rerun()
+            else:
+                st.error("Gagal simpan anggaran.", icon="❌")
+
 # --- Fungsi Utama Aplikasi Streamlit ---
 def main():
     st.sidebar.title("Catatan Pengeluaran")
-    menu_pilihan = st.sidebar.radio("Pilih Menu:", ["Tambah", "Riwayat", "Ringkasan"], key="menu_utama")
+    menu_pilihan = st.sidebar.radio("Pilih Menu:", ["Tambah", "Riwayat", "Ringkasan", "Tren", "Anggaran"], key="menu_utama")
     st.sidebar.markdown("---")
     st.sidebar.info("Jobsheet - Aplikasi Keuangan")
     manajer_anggaran = get_anggaran_manager()
@@ -176,6 +357,10 @@ def main():
         halaman_riwayat(manajer_anggaran)
     elif menu_pilihan == "Ringkasan":
         halaman_ringkasan(manajer_anggaran)
+    elif menu_pilihan == "Tren":
+        halaman_tren(manajer_anggaran)
+    elif menu_pilihan == "Anggaran":
+        halaman_anggaran(manajer_anggaran)
 
     st.markdown("---")
     st.caption("Pengembangan Aplikasi Berbasis OOP")
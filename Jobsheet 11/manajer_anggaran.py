@@ -1,9 +1,59 @@
 # manajer_anggaran.py
 import datetime
+import re
+import threading
+from collections import OrderedDict
 import pandas as pd
 from model import Transaksi
+from konfigurasi import KATEGORI_DEFAULT, KATEGORI_PENGELUARAN, UKURAN_CACHE_RINGKASAN
 import database # Impor modul database kita
 
+# --- Helper Rentang Tanggal ---
+def rentang_minggu(tanggal: datetime.date) -> tuple[datetime.date, datetime.date]:
+    """Senin s.d. Minggu dari minggu yang memuat `tanggal`."""
+    senin = tanggal - datetime.timedelta(days=tanggal.weekday())
+    return senin, senin + datetime.timedelta(days=6)
+
+def rentang_bulan(tahun: int, bulan: int) -> tuple[datetime.date, datetime.date]:
+    awal = datetime.date(tahun, bulan, 1)
+    awal_berikut = datetime.date(tahun + bulan // 12, bulan % 12 + 1, 1)
+    return awal, awal_berikut - datetime.timedelta(days=1)
+
+def rentang_tahun(tahun: int) -> tuple[datetime.date, datetime.date]:
+    return datetime.date(tahun, 1, 1), datetime.date(tahun, 12, 31)
+
+def _klausa_rentang(mulai: datetime.date | None, akhir: datetime.date | None) -> tuple[str, list]:
+    """WHERE berbasis rentang pada kolom tanggal (memakai idx_transaksi_tanggal)."""
+    kondisi, params = [], []
+    if mulai:
+        kondisi.append("tanggal >= ?")
+        params.append(mulai.strftime("%Y-%m-%d"))
+    if akhir:
+        kondisi.append("tanggal <= ?")
+        params.append(akhir.strftime("%Y-%m-%d"))
+    return (" WHERE " + " AND ".join(kondisi)) if kondisi else "", params
+
+def _kondisi_cari(teks: str) -> tuple[str | None, list]:
+    """Kondisi pencarian deskripsi: FTS5 (awalan tiap kata, semua kata wajib ada)
+    atau, tanpa FTS5, LIKE 'teks%' yang memakai indeks NOCASE."""
+    kata = re.findall(r"\w+", teks or "")
+    if not kata:
+        return None, []
+    if database.fts_aktif():
+        return "id IN (SELECT rowid FROM transaksi_fts WHERE transaksi_fts MATCH ?)", [" ".join(f'"{k}"*' for k in kata)]
+    pola = teks.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return "deskripsi LIKE ? ESCAPE '\\'", [pola]
+
+def _format_rupiah(df: pd.DataFrame) -> pd.DataFrame:
+    """Menambah kolom 'Jumlah (Rp)' dan menyusun kolom tampilan riwayat."""
+    try:
+        import locale
+        locale.setlocale(locale.LC_ALL, 'id_ID.UTF-8')
+        df['Jumlah (Rp)'] = df['jumlah'].map(lambda x: locale.currency(x or 0, grouping=True, symbol='Rp ')[:-3])
+    except:
+        df['Jumlah (Rp)'] = df['jumlah'].map(lambda x: f"Rp {x or 0:,.0f}".replace(",", "."))
+    return df[['id', 'tanggal', 'kategori', 'deskripsi', 'Jumlah (Rp)']]
+
 class AnggaranHarian:
     """Mengelola logika bisnis pengeluaran harian (Repository Pattern)."""
     _db_setup_done = False # Flag untuk memastikan setup DB hanya dicek sekali per sesi
@@ -16,6 +66,59 @@ class AnggaranHarian:
                 print("[AnggaranHarian] Database siap.")
             else:
                 print("[AnggaranHarian] KRITICAL: Setup database awal GAGAL!")
+        # Cache ringkasan: {(nama_query, tgl_mulai, tgl_akhir): hasil}.
+        # None = tanpa batas (semua waktu). Hanya entri yang rentangnya memuat
+        # tanggal transaksi yang berubah yang dibuang (lihat _invalidasi).
+        # LRU berukuran UKURAN_CACHE_RINGKASAN: entri paling lama tidak
+        # dipakai dibuang lebih dulu.
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.versi_data = 0  # Naik setiap ada perubahan data
+        # Sidik file DB setelah penulisan terakhir kita; jika berbeda, ada proses
+        # lain (impor_csv.py, kategorisasi.py --rekategorikan) yang menulis.
+        self._sidik_db = database.sidik_file_db()
+
+    # --- Cache Ringkasan ---
+    def cek_perubahan_eksternal(self) -> bool:
+        """Mengosongkan seluruh cache jika database diubah oleh proses lain."""
+        sidik = database.sidik_file_db()
+        with self._cache_lock:
+            if sidik == self._sidik_db:
+                return False
+            self._sidik_db = sidik
+            self.versi_data += 1
+            self._cache.clear()
+        return True
+
+    def _ambil_cache(self, nama: str, mulai: datetime.date | None, akhir: datetime.date | None, hitung):
+        kunci = (nama, mulai.strftime("%Y-%m-%d") if mulai else None, akhir.strftime("%Y-%m-%d") if akhir else None)
+        self.cek_perubahan_eksternal()
+        with self._cache_lock:
+            if kunci in self._cache:
+                self._cache.move_to_end(kunci)
+                return self._cache[kunci]
+            versi = self.versi_data
+        hasil = hitung()
+        with self._cache_lock:
+            # Jangan simpan jika data berubah selama query berjalan
+            if versi == self.versi_data:
+                self._cache[kunci] = hasil
+                self._cache.move_to_end(kunci)
+                while len(self._cache) > UKURAN_CACHE_RINGKASAN:
+                    self._cache.popitem(last=False)
+        return hasil
+
+    def _invalidasi(self, daftar_tanggal):
+        """Menaikkan versi data dan membuang cache yang memuat tanggal tsb."""
+        tanggal_set = {t.strftime("%Y-%m-%d") if isinstance(t, datetime.date) else str(t) for t in daftar_tanggal}
+        sidik = database.sidik_file_db()
+        with self._cache_lock:
+            self.versi_data += 1
+            self._sidik_db = sidik
+            for kunci in list(self._cache):
+                _, mulai, akhir = kunci
+                if any((mulai is None or mulai <= t) and (akhir is None or t <= akhir) for t in tanggal_set):
+                    del self._cache[kunci]
 
     def tambah_transaksi(self, transaksi: Transaksi) -> bool:
         if not isinstance(transaksi, Transaksi) or transaksi.jumlah <= 0:
@@ -25,55 +128,126 @@ class AnggaranHarian:
         last_id = database.execute_query(sql, params)
         if last_id is not None:
             transaksi.id = last_id
+            self._invalidasi([transaksi.tanggal])
             return True
         return False
 
-    def get_semua_transaksi_obj(self) -> list[Transaksi]:
-        sql = "SELECT id, deskripsi, jumlah, kategori, tanggal FROM transaksi ORDER BY tanggal DESC, id DESC"
-        rows = database.fetch_query(sql, fetch_all=True)
-        transaksi_list = []
-        if rows:
-            for row in rows:
-                transaksi_list.append(Transaksi(id_transaksi=row['id'], deskripsi=row['deskripsi'], jumlah=row['jumlah'], kategori=row['kategori'], tanggal=row['tanggal']))
-        return transaksi_list
+    def tambah_transaksi_batch(self, transaksi_list: list[Transaksi], hash_list: list[str] | None = None) -> int | None:
+        """Insert banyak transaksi dalam satu transaksi DB (executemany).
+        Baris dengan hash_konten yang sudah ada dilewati (INSERT OR IGNORE).
+        Mengembalikan jumlah baris yang benar-benar tersimpan, None jika gagal."""
+        valid = [(i, tx) for i, tx in enumerate(transaksi_list) if isinstance(tx, Transaksi) and tx.jumlah > 0]
+        if not valid:
+            return 0
+        sql = "INSERT OR IGNORE INTO transaksi (deskripsi, jumlah, kategori, tanggal, hash_konten) VALUES (?, ?, ?, ?, ?)"
+        params = [(tx.deskripsi, tx.jumlah, tx.kategori, tx.tanggal.strftime("%Y-%m-%d"), hash_list[i] if hash_list else None) for i, tx in valid]
+        jumlah = database.execute_many(sql, params)
+        if jumlah:
+            self._invalidasi({tx.tanggal for _, tx in valid})
+        return jumlah
+
+    def get_semua_transaksi_obj(self, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> list[Transaksi]:
+        return list(self.iter_transaksi_obj(mulai, akhir))
 
-    def get_dataframe_transaksi(self, filter_tanggal: datetime.date | None = None) -> pd.DataFrame:
-        query = "SELECT id, tanggal, kategori, deskripsi, jumlah FROM transaksi"
-        params = None
+    def iter_transaksi_obj(self, mulai: datetime.date | None = None, akhir: datetime.date | None = None, ukuran_batch: int = 1000):
+        """Generator Transaksi (terbaru dulu) tanpa membangun list penuh."""
+        where, params = _klausa_rentang(mulai, akhir)
+        sql = "SELECT id, deskripsi, jumlah, kategori, tanggal FROM transaksi" + where + " ORDER BY tanggal DESC, id DESC"
+        dari_baris = Transaksi.dari_baris
+        for row in database.iter_query(sql, tuple(params), ukuran_batch):
+            yield dari_baris(*row)
+
+    def get_dataframe_transaksi(self, filter_tanggal: datetime.date | None = None, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> pd.DataFrame:
         if filter_tanggal:
-            query += " WHERE tanggal = ?"
-            params = (filter_tanggal.strftime("%Y-%m-%d"),)
+            mulai = akhir = filter_tanggal
+        where, params = _klausa_rentang(mulai, akhir)
+        query = "SELECT id, tanggal, kategori, deskripsi, jumlah FROM transaksi" + where
         query += " ORDER BY tanggal DESC, id DESC"
-        df = database.get_dataframe(query, params=params)
+        df = database.get_dataframe(query, params=tuple(params) if params else None)
         if not df.empty:
-            try:
-                import locale
-                locale.setlocale(locale.LC_ALL, 'id_ID.UTF-8')
-                df['Jumlah (Rp)'] = df['jumlah'].map(lambda x: locale.currency(x or 0, grouping=True, symbol='Rp ')[:-3])
-            except:
-                df['Jumlah (Rp)'] = df['jumlah'].map(lambda x: f"Rp {x or 0:,.0f}".replace(",", "."))
-
-            df = df[['id', 'tanggal', 'kategori', 'deskripsi', 'Jumlah (Rp)']]
+            df = _format_rupiah(df)
         return df
 
-    def hitung_total_pengeluaran(self, tanggal: datetime.date | None = None) -> float:
-        sql = "SELECT SUM(jumlah) FROM transaksi"
-        params = None
+    # --- Riwayat Berhalaman ---
+    # Keyset pagination: halaman berikutnya dimulai SETELAH nilai (urut, id)
+    # baris terakhir, sehingga biaya per halaman tetap (tanpa OFFSET yang
+    # harus melewati semua baris sebelumnya) dan berjalan di atas indeks.
+    KOLOM_URUT = ("tanggal", "jumlah")
+
+    def get_halaman_transaksi(self, ukuran: int = 50, kursor: tuple | None = None, urut: str = "tanggal",
+                              menurun: bool = True, cari: str = "", mulai: datetime.date | None = None,
+                              akhir: datetime.date | None = None, mentah: bool = False) -> tuple[pd.DataFrame | None, tuple | None]:
+        """Satu halaman riwayat, diurutkan di database berdasarkan `urut` lalu id.
+        `kursor` adalah (nilai_urut, id) baris terakhir halaman sebelumnya (None = halaman pertama).
+        `mentah=True` mempertahankan kolom jumlah numerik (untuk editor).
+        Mengembalikan (DataFrame, kursor halaman berikutnya atau None jika sudah habis)."""
+        if urut not in self.KOLOM_URUT:
+            raise ValueError(f"Kolom urut tidak dikenal: {urut}")
+        where, params = _klausa_rentang(mulai, akhir)
+        kondisi = [where.removeprefix(" WHERE ")] if where else []
+        kondisi_cari, params_cari = _kondisi_cari(cari)
+        if kondisi_cari:
+            kondisi.append(kondisi_cari)
+            params += params_cari
+        arah, pembanding = ("DESC", "<") if menurun else ("ASC", ">")
+        if kursor:
+            kondisi.append(f"({urut}, id) {pembanding} (?, ?)")
+            params += list(kursor)
+        sql = "SELECT id, tanggal, kategori, deskripsi, jumlah FROM transaksi"
+        if kondisi:
+            sql += " WHERE " + " AND ".join(kondisi)
+        sql += f" ORDER BY {urut} {arah}, id {arah} LIMIT ?"
+        params.append(ukuran + 1)  # +1 baris untuk tahu apakah masih ada halaman berikutnya
+
+        rows = database.fetch_query(sql, tuple(params), fetch_all=True)
+        if rows is None:
+            return None, None
+        kursor_berikut = None
+        if len(rows) > ukuran:
+            rows = rows[:ukuran]
+            nilai = rows[-1][urut]
+            kursor_berikut = (nilai.strftime("%Y-%m-%d") if isinstance(nilai, datetime.date) else nilai, rows[-1]['id'])
+        df = pd.DataFrame([tuple(row) for row in rows], columns=['id', 'tanggal', 'kategori', 'deskripsi', 'jumlah'])
+        if not df.empty and not mentah:
+            df = _format_rupiah(df)
+        return df, kursor_berikut
+
+    def hitung_total_pengeluaran(self, tanggal: datetime.date | None = None, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> float:
+        """Total untuk satu `tanggal`, rentang [mulai, akhir], atau semua waktu."""
         if tanggal:
-            sql += " WHERE tanggal = ?"
-            params = (tanggal.strftime("%Y-%m-%d"),)
-        result = database.fetch_query(sql, params=params, fetch_all=False)
+            mulai = akhir = tanggal
+        return self._ambil_cache("total", mulai, akhir, lambda: self._query_total_pengeluaran(mulai, akhir))
+
+    def hitung_total_bulan(self, tahun: int, bulan: int) -> float:
+        return self.hitung_total_pengeluaran(None, *rentang_bulan(tahun, bulan))
+
+    def hitung_total_tahun(self, tahun: int) -> float:
+        return self.hitung_total_pengeluaran(None, *rentang_tahun(tahun))
+
+    def _query_total_pengeluaran(self, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> float:
+        where, params = _klausa_rentang(mulai, akhir)
+        sql = "SELECT SUM(jumlah) FROM transaksi" + where
+        result = database.fetch_query(sql, params=tuple(params) if params else None, fetch_all=False)
         if result and result[0] is not None:
             return float(result[0])
         return 0.0
 
-    def get_pengeluaran_per_kategori(self, tanggal: datetime.date | None = None) -> dict:
-        hasil = {}
-        sql = "SELECT kategori, SUM(jumlah) FROM transaksi"
-        params = []
+    def get_pengeluaran_per_kategori(self, tanggal: datetime.date | None = None, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> dict:
         if tanggal:
-            sql += " WHERE tanggal = ?"
-            params.append(tanggal.strftime("%Y-%m-%d"))
+            mulai = akhir = tanggal
+        # Salinan agar pemanggil tidak mengubah isi cache
+        return dict(self._ambil_cache("per_kategori", mulai, akhir, lambda: self._query_pengeluaran_per_kategori(mulai, akhir)))
+
+    def get_pengeluaran_per_kategori_bulan(self, tahun: int, bulan: int) -> dict:
+        return self.get_pengeluaran_per_kategori(None, *rentang_bulan(tahun, bulan))
+
+    def get_pengeluaran_per_kategori_tahun(self, tahun: int) -> dict:
+        return self.get_pengeluaran_per_kategori(None, *rentang_tahun(tahun))
+
+    def _query_pengeluaran_per_kategori(self, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> dict:
+        hasil = {}
+        where, params = _klausa_rentang(mulai, akhir)
+        sql = "SELECT kategori, SUM(jumlah) FROM transaksi" + where
         sql += " GROUP BY kategori HAVING SUM(jumlah) > 0 ORDER BY SUM(jumlah) DESC"
         rows = database.fetch_query(sql, params=tuple(params) if params else None, fetch_all=True)
         if rows:
@@ -82,6 +256,194 @@ class AnggaranHarian:
                 jumlah = float(row[1]) if row[1] is not None else 0.0
                 hasil[kategori] = jumlah
         return hasil
+
+    # --- Tren Pengeluaran ---
+    # Deret waktu dibaca dari daily_category_totals (satu baris per hari per
+    # kategori, dipelihara trigger) sehingga grafik cukup memproses ratusan
+    # titik, bukan seluruh tabel transaksi. Hasil di-cache per rentang.
+    FREKUENSI_TREN = {"harian": "D", "mingguan": "W-MON", "bulanan": "MS"}
+
+    def get_tren_harian(self, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> pd.DataFrame:
+        """Total per hari (index tanggal, kolom kategori); hari tanpa transaksi bernilai 0."""
+        return self._ambil_cache("tren_harian", mulai, akhir, lambda: self._query_tren_harian(mulai, akhir)).copy()
+
+    def get_tren(self, periode: str = "harian", mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> pd.DataFrame:
+        """Deret harian/mingguan (mulai Senin)/bulanan per kategori."""
+        if periode not in self.FREKUENSI_TREN:
+            raise ValueError(f"Periode tidak dikenal: {periode}")
+        harian = self.get_tren_harian(mulai, akhir)
+        if periode == "harian" or harian.empty:
+            return harian
+        return harian.resample(self.FREKUENSI_TREN[periode], label="left", closed="left").sum()
+
+    def get_rata_rata_bergulir(self, jendela: int = 7, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> pd.DataFrame:
+        """Rata-rata bergulir `jendela` hari per kategori plus kolom 'Total'.
+        Data (jendela - 1) hari sebelum `mulai` ikut dibaca agar titik awal tidak bias."""
+        # Cache dikunci pada rentang yang benar-benar dibaca, sehingga perubahan di
+        # (jendela - 1) hari sebelum `mulai` ikut membuang entri ini (lihat _invalidasi).
+        awal = mulai - datetime.timedelta(days=jendela - 1) if mulai else None
+        def hitung():
+            harian = self._ambil_cache("tren_harian", awal, akhir, lambda: self._query_tren_harian(awal, akhir)).copy()
+            if harian.empty:
+                return harian
+            harian['Total'] = harian.sum(axis=1)
+            return harian.rolling(jendela, min_periods=1).mean()
+        bergulir = self._ambil_cache(f"bergulir_{jendela}", awal, akhir, hitung)
+        return (bergulir.loc[pd.Timestamp(mulai):] if mulai and not bergulir.empty else bergulir).copy()
+
+    def _query_tren_harian(self, mulai: datetime.date | None = None, akhir: datetime.date | None = None) -> pd.DataFrame:
+        where, params = _klausa_rentang(mulai, akhir)
+        sql = "SELECT tanggal, kategori, total FROM daily_category_totals" + where
+        sql += (" AND" if where else " WHERE") + " jumlah_transaksi > 0"
+        df = database.get_dataframe(sql, params=tuple(params) if params else None)
+        if df.empty:
+            indeks = pd.date_range(mulai, akhir, freq="D") if mulai and akhir else pd.DatetimeIndex([])
+            return pd.DataFrame(index=indeks.rename("tanggal"), dtype=float)
+        df['tanggal'] = pd.to_datetime(df['tanggal'])
+        tabel = df.pivot_table(index='tanggal', columns='kategori', values='total', aggfunc='sum', fill_value=0.0)
+        indeks = pd.date_range(mulai or tabel.index.min(), akhir or tabel.index.max(), freq="D", name="tanggal")
+        return tabel.reindex(indeks, fill_value=0.0).rename_axis(columns=None)
     def hapus_transaksi(self, id_transaksi: int) -> bool:
+        row = database.fetch_query("SELECT tanggal FROM transaksi WHERE id = ?", (id_transaksi,), fetch_all=False)
+        if not row:
+            return False
         sql = "DELETE FROM transaksi WHERE id = ?"
-        return database.execute_query(sql, (id_transaksi,))
+        if database.execute_query(sql, (id_transaksi,)) is None:
+            return False
+        self._invalidasi([row['tanggal']])
+        return True
+
+    # --- Edit & Hapus Massal ---
+    # Satu transaksi DB per batch dan satu kali invalidasi cache, memakai
+    # tanggal lama dan baru dari semua baris yang tersentuh.
+    KOLOM_EDIT = ("deskripsi", "jumlah", "kategori", "tanggal")  # Urutan kanonik kolom SET
+    UKURAN_IN = 500  # Batas jumlah parameter per klausa IN
+
+    def _tanggal_per_id(self, daftar_id: list[int]) -> dict[int, datetime.date | str]:
+        hasil = {}
+        for i in range(0, len(daftar_id), self.UKURAN_IN):
+            potongan = daftar_id[i:i + self.UKURAN_IN]
+            sql = f"SELECT id, tanggal FROM transaksi WHERE id IN ({', '.join('?' * len(potongan))})"
+            for row in database.fetch_query(sql, tuple(potongan), fetch_all=True) or []:
+                hasil[row['id']] = row['tanggal']
+        return hasil
+
+    @staticmethod
+    def _normalisasi_edit(data: dict) -> dict:
+        """Validasi nilai edit; ValueError jika ada nilai yang tidak valid."""
+        hasil = {}
+        for kolom in AnggaranHarian.KOLOM_EDIT:
+            if kolom not in data:
+                continue
+            nilai = data[kolom]
+            if kolom == "jumlah":
+                nilai = float(nilai)
+                if nilai <= 0:
+                    raise ValueError("jumlah harus positif")
+            elif kolom == "tanggal":
+                nilai = (nilai if isinstance(nilai, datetime.date) else datetime.date.fromisoformat(str(nilai)[:10])).strftime("%Y-%m-%d")
+            elif kolom == "deskripsi":
+                nilai = str(nilai or "").strip()
+                if not nilai:
+                    raise ValueError("deskripsi kosong")
+            else:
+                nilai = str(nilai or "").strip() or KATEGORI_DEFAULT
+                if nilai not in KATEGORI_PENGELUARAN:
+                    raise ValueError(f"kategori tidak dikenal: {nilai}")
+            hasil[kolom] = nilai
+        return hasil
+
+    def simpan_perubahan_batch(self, perubahan: dict[int, dict], daftar_hapus: list[int] = ()) -> tuple[int, int] | None:
+        """Edit {id: {kolom: nilai_baru}} dan hapus `daftar_hapus` dalam SATU transaksi DB.
+        Hanya kolom di KOLOM_EDIT yang dipakai; baris dengan kolom yang sama digabung
+        menjadi satu executemany, dan edit untuk ID yang ikut dihapus diabaikan.
+        Mengembalikan (jumlah terubah, jumlah terhapus), atau None jika validasi/
+        penyimpanan gagal (tidak ada yang tersimpan)."""
+        id_hapus = sorted({int(i) for i in daftar_hapus})
+        kelompok = {}
+        tanggal_baru = set()
+        for id_transaksi, data in perubahan.items():
+            if int(id_transaksi) in id_hapus:
+                continue
+            try:
+                data = self._normalisasi_edit(data)
+            except (ValueError, TypeError) as e:
+                print(f"[AnggaranHarian] Edit ID {id_transaksi} tidak valid: {e}")
+                return None
+            if not data:
+                continue
+            kolom = tuple(data)
+            kelompok.setdefault(kolom, []).append(tuple(data.values()) + (int(id_transaksi),))
+            if "tanggal" in data:
+                tanggal_baru.add(data["tanggal"])
+        if not kelompok and not id_hapus:
+            return 0, 0
+        id_edit = [params[-1] for daftar in kelompok.values() for params in daftar]
+        tanggal_lama = self._tanggal_per_id(id_edit + id_hapus)
+        perintah = [(f"UPDATE transaksi SET {', '.join(f'{k} = ?' for k in kolom)} WHERE id = ?", daftar)
+                    for kolom, daftar in kelompok.items()]
+        if id_hapus:
+            perintah.append(("DELETE FROM transaksi WHERE id = ?", [(i,) for i in id_hapus]))
+        jumlah = database.execute_many_batch(perintah, rincian=True)
+        if jumlah is None:
+            return None
+        jumlah_hapus = jumlah.pop() if id_hapus else 0
+        jumlah_edit = sum(jumlah)
+        if jumlah_edit or jumlah_hapus:
+            self._invalidasi(set(tanggal_lama.values()) | tanggal_baru)
+        return jumlah_edit, jumlah_hapus
+
+    def edit_transaksi_batch(self, perubahan: dict[int, dict]) -> int | None:
+        """Mengubah banyak transaksi sekaligus (lihat simpan_perubahan_batch).
+        Mengembalikan jumlah baris terubah, atau None jika gagal."""
+        hasil = self.simpan_perubahan_batch(perubahan)
+        return hasil[0] if hasil else None
+
+    def hapus_transaksi_batch(self, daftar_id: list[int]) -> int | None:
+        """Menghapus banyak transaksi dalam satu transaksi DB.
+        Mengembalikan jumlah baris terhapus, atau None jika gagal."""
+        hasil = self.simpan_perubahan_batch({}, daftar_id)
+        return hasil[1] if hasil else None
+
+    # --- Anggaran Bulanan per Kategori ---
+    # Realisasi diambil dari monthly_category_totals (dipelihara trigger),
+    # bukan dihitung ulang dari tabel transaksi.
+    def set_budget(self, tahun: int, bulan: int, kategori: str, jumlah: float) -> bool:
+        if jumlah is None or jumlah < 0:
+            return False
+        sql = ("INSERT INTO budget (bulan, kategori, jumlah) VALUES (?, ?, ?) "
+               "ON CONFLICT(bulan, kategori) DO UPDATE SET jumlah = excluded.jumlah")
+        return database.execute_query(sql, (f"{tahun:04d}-{bulan:02d}", kategori, float(jumlah))) is not None
+
+    def hapus_budget(self, tahun: int, bulan: int, kategori: str) -> bool:
+        sql = "DELETE FROM budget WHERE bulan = ? AND kategori = ?"
+        return database.execute_query(sql, (f"{tahun:04d}-{bulan:02d}", kategori)) is not None
+
+    def sisa_budget(self, kategori: str, tahun: int, bulan: int) -> float | None:
+        """Sisa anggaran bulan ini (negatif = lewat anggaran), None jika belum diatur."""
+        sql = """
+            SELECT b.jumlah - COALESCE(m.total, 0)
+            FROM budget b
+            LEFT JOIN monthly_category_totals m ON m.bulan = b.bulan AND m.kategori = b.kategori
+            WHERE b.bulan = ? AND b.kategori = ?"""
+        row = database.fetch_query(sql, (f"{tahun:04d}-{bulan:02d}", kategori), fetch_all=False)
+        return float(row[0]) if row else None
+
+    def get_status_budget(self, tahun: int, bulan: int) -> list[dict]:
+        """Anggaran, realisasi dan sisa per kategori untuk satu bulan."""
+        sql = """
+            SELECT kategori, MAX(budget) AS budget, MAX(terpakai) AS terpakai FROM (
+                SELECT kategori, jumlah AS budget, 0 AS terpakai FROM budget WHERE bulan = ?
+                UNION ALL
+                SELECT kategori, NULL, total FROM monthly_category_totals
+                WHERE bulan = ? AND jumlah_transaksi > 0
+            ) GROUP BY kategori ORDER BY kategori"""
+        kunci_bulan = f"{tahun:04d}-{bulan:02d}"
+        rows = database.fetch_query(sql, (kunci_bulan, kunci_bulan), fetch_all=True)
+        hasil = []
+        for row in rows or []:
+            budget = float(row['budget']) if row['budget'] is not None else None
+            terpakai = float(row['terpakai'] or 0)
+            hasil.append({"kategori": row['kategori'], "budget": budget, "terpakai": terpakai,
+                          "sisa": budget - terpakai if budget is not None else None})
+        return hasil
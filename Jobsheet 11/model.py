@@ -3,6 +3,9 @@ import datetime
 
 class Transaksi:
     """Merepresentasikan satu entitas transaksi pengeluaran (Data Class)."""
+    # Tanpa __dict__ per objek: lebih hemat memori saat memuat ribuan transaksi
+    __slots__ = ("id", "deskripsi", "jumlah", "kategori", "tanggal")
+
     def __init__(self, deskripsi: str, jumlah: float, kategori: str, tanggal: datetime.date | str, id_transaksi: int | None = None):
         self.id = id_transaksi
         self.deskripsi = str(deskripsi) if deskripsi else "Tanpa Deskripsi"
@@ -27,6 +30,19 @@ class Transaksi:
             self.tanggal = datetime.date.today()
             print(f"Peringatan: Tipe tgl '{type(tanggal)}' tidak valid.")
 
+    @classmethod
+    def dari_baris(cls, id_transaksi: int | None, deskripsi: str, jumlah: float, kategori: str | None, tanggal: datetime.date | str) -> "Transaksi":
+        """Jalur cepat tanpa validasi untuk data tepercaya (baris SQLite yang sudah
+        lolos CHECK constraint, atau hasil parse importer). Input pengguna tetap
+        lewat __init__."""
+        tx = cls.__new__(cls)
+        tx.id = id_transaksi
+        tx.deskripsi = deskripsi
+        tx.jumlah = jumlah
+        tx.kategori = kategori or "Lainnya"
+        tx.tanggal = tanggal if isinstance(tanggal, datetime.date) else datetime.date.fromisoformat(tanggal)
+        return tx
+
     def __repr__(self) -> str:
         try:
             import locale
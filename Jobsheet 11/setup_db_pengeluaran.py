@@ -30,6 +30,14 @@ def setup_database():
             print(" -> Koneksi DB setup ditutup.")
 
 if __name__ == "__main__":
+    import sys
+    if "--rebuild-ringkasan" in sys.argv:
+        # Cek konsistensi: hitung ulang monthly/daily_category_totals dari transaksi
+        import database
+        print("--- Membangun Ulang Ringkasan Bulanan & Harian ---")
+        berhasil = database.setup_database_initial() and database.rebuild_ringkasan()
+        print(" -> Selesai." if berhasil else " -> GAGAL.")
+        sys.exit(0 if berhasil else 1)
     print("--- Memulai Setup Database Pengeluaran ---")
     if setup_database():
         print(f"\nSetup database '{os.path.basename(DB_PATH)}' selesai.")
@@ -0,0 +1,219 @@
+# indeks_spasial.py
+# Indeks spasial grid untuk objek Lokasi: query radius ("apa saja dalam
+# 2 km dari saya"), k-tetangga terdekat, dan bounding box tanpa memindai
+# semua lokasi.
+#
+# Cara kerja: bidang lat/lon dibagi menjadi sel persegi (default 1 km).
+# Titik diurutkan berdasarkan kunci sel (baris * jumlah_kolom + kolom),
+# sehingga satu baris sel dalam rentang kolom tertentu adalah potongan
+# array yang bersebelahan (dicari dengan np.searchsorted). Kandidat dari
+# sel yang beririsan lalu difilter dengan jarak haversine yang eksak.
+#
+# Contoh:
+#   python indeks_spasial.py --benchmark 100000
+import argparse
+import math
+import random
+import time
+import numpy as np
+from lokasi import Lokasi, TempatWisata, Kuliner, TempatIbadah, Museum, Taman
+
+RADIUS_BUMI_KM = 6371.0088
+KM_PER_DERAJAT = math.pi * RADIUS_BUMI_KM / 180.0
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Jarak great-circle (km). Menerima skalar maupun array NumPy (broadcasting)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIUS_BUMI_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+class IndeksSpasial:
+    """Indeks grid statis atas daftar Lokasi (bangun ulang jika data berubah)."""
+    def __init__(self, daftar_lokasi: list[Lokasi], ukuran_sel_km: float = 1.0):
+        self.lokasi = list(daftar_lokasi)
+        self.ukuran_sel = ukuran_sel_km / KM_PER_DERAJAT  # dalam derajat
+        n = len(self.lokasi)
+        lat = np.fromiter((l.latitude for l in self.lokasi), dtype=np.float64, count=n)
+        lon = np.fromiter((l.longitude for l in self.lokasi), dtype=np.float64, count=n)
+        self._lat0 = lat.min() if n else 0.0
+        self._lon0 = lon.min() if n else 0.0
+        baris = self._sel(lat, self._lat0)
+        kolom = self._sel(lon, self._lon0)
+        self._jumlah_baris = int(baris.max()) + 1 if n else 0
+        self._jumlah_kolom = int(kolom.max()) + 1 if n else 0
+        kunci = baris * self._jumlah_kolom + kolom
+        urutan = np.argsort(kunci, kind="stable")
+        self._kunci = kunci[urutan]
+        self._lat = lat[urutan]
+        self._lon = lon[urutan]
+        self._indeks = urutan  # posisi terurut -> indeks di self.lokasi
+
+    def __len__(self) -> int:
+        return len(self.lokasi)
+
+    def _sel(self, nilai, asal: float):
+        return np.floor((np.asarray(nilai) - asal) / self.ukuran_sel).astype(np.int64)
+
+    def _kandidat(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+        """Posisi (terurut) semua titik di sel yang beririsan dengan kotak."""
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        b0 = max(int(self._sel(lat_min, self._lat0)), 0)
+        b1 = min(int(self._sel(lat_max, self._lat0)), self._jumlah_baris - 1)
+        k0 = max(int(self._sel(lon_min, self._lon0)), 0)
+        k1 = min(int(self._sel(lon_max, self._lon0)), self._jumlah_kolom - 1)
+        if b0 > b1 or k0 > k1:
+            return np.empty(0, dtype=np.int64)
+        kunci_awal = np.arange(b0, b1 + 1, dtype=np.int64) * self._jumlah_kolom + k0
+        awal = np.searchsorted(self._kunci, kunci_awal, side="left")
+        akhir = np.searchsorted(self._kunci, kunci_awal + (k1 - k0), side="right")
+        potongan = [np.arange(a, b) for a, b in zip(awal, akhir) if b > a]
+        return np.concatenate(potongan) if potongan else np.empty(0, dtype=np.int64)
+
+    def _hasil(self, posisi: np.ndarray, jarak: np.ndarray | None, dengan_jarak: bool) -> list:
+        objek = [self.lokasi[i] for i in self._indeks[posisi]]
+        if dengan_jarak and jarak is not None:
+            return list(zip(objek, jarak.tolist()))
+        return objek
+
+    def radius(self, latitude: float, longitude: float, radius_km: float, dengan_jarak: bool = False) -> list:
+        """Semua lokasi dalam `radius_km` dari titik, terurut dari yang terdekat.
+
+        Args:
+            dengan_jarak (bool): True untuk mengembalikan pasangan (Lokasi, jarak_km).
+        """
+        dlat = math.degrees(radius_km / RADIUS_BUMI_KM)
+        if abs(latitude) + dlat >= 90.0:
+            dlon = 180.0  # Lingkaran memuat kutub: semua bujur
+        else:
+            rasio = math.sin(radius_km / RADIUS_BUMI_KM) / math.cos(math.radians(latitude))
+            dlon = math.degrees(math.asin(min(1.0, rasio)))
+        posisi = self._kandidat(latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon)
+        jarak = haversine_km(latitude, longitude, self._lat[posisi], self._lon[posisi])
+        masuk = jarak <= radius_km
+        posisi, jarak = posisi[masuk], jarak[masuk]
+        urut = np.argsort(jarak, kind="stable")
+        return self._hasil(posisi[urut], jarak[urut], dengan_jarak)
+
+    def terdekat(self, latitude: float, longitude: float, k: int = 5, dengan_jarak: bool = False) -> list:
+        """k lokasi terdekat. Radius pencarian dilipatgandakan sampai memuat
+        minimal k titik; karena query radius eksak, k teratas pasti benar."""
+        n = len(self)
+        if k <= 0 or not n:
+            return []
+        if k >= n:
+            return self.radius(latitude, longitude, math.pi * RADIUS_BUMI_KM, dengan_jarak)
+        # Tebakan awal dari kepadatan rata-rata titik di area data
+        luas_km2 = max(self._jumlah_baris * self._jumlah_kolom, 1) * (self.ukuran_sel * KM_PER_DERAJAT) ** 2
+        radius_km = max(math.sqrt(k * luas_km2 / (n * math.pi)), self.ukuran_sel * KM_PER_DERAJAT)
+        while True:
+            hasil = self.radius(latitude, longitude, radius_km, dengan_jarak=True)
+            if len(hasil) >= k or radius_km >= math.pi * RADIUS_BUMI_KM:
+                hasil = hasil[:k]
+                return hasil if dengan_jarak else [lok for lok, _ in hasil]
+            radius_km *= 2
+
+    def kotak(self, lat_min: float, lon_min: float, lat_max: float, lon_max: float) -> list:
+        """Semua lokasi di dalam bounding box (tanpa urutan tertentu)."""
+        posisi = self._kandidat(lat_min, lat_max, lon_min, lon_max)
+        lat, lon = self._lat[posisi], self._lon[posisi]
+        masuk = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return self._hasil(posisi[masuk], None, False)
+
+# --- Pembanding: pindai linear ---
+def _haversine_skalar(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIUS_BUMI_KM * math.asin(math.sqrt(min(1.0, a)))
+
+def radius_linear(daftar_lokasi: list[Lokasi], latitude: float, longitude: float, radius_km: float) -> list:
+    hasil = []
+    for lok in daftar_lokasi:
+        jarak = _haversine_skalar(latitude, longitude, *lok.get_koordinat())
+        if jarak <= radius_km:
+            hasil.append((jarak, lok))
+    hasil.sort(key=lambda x: x[0])
+    return [lok for _, lok in hasil]
+
+def terdekat_linear(daftar_lokasi: list[Lokasi], latitude: float, longitude: float, k: int = 5) -> list:
+    jarak = [(_haversine_skalar(latitude, longitude, *lok.get_koordinat()), i) for i, lok in enumerate(daftar_lokasi)]
+    return [daftar_lokasi[i] for _, i in sorted(jarak)[:k]]
+
+# --- Benchmark ---
+def buat_lokasi_sintetis(jumlah: int, seed: int = 0) -> list[Lokasi]:
+    """Titik acak di sekitar Semarang (kotak ~45 x 45 km)."""
+    rng = random.Random(seed)
+    pembuat = [
+        lambda i, la, lo: TempatWisata(f"Wisata {i}", la, lo, "Wisata Alam", ""),
+        lambda i, la, lo: Kuliner(f"Kuliner {i}", la, lo, "Lumpia"),
+        lambda i, la, lo: TempatIbadah(f"Ibadah {i}", la, lo),
+        lambda i, la, lo: Museum(f"Museum {i}", la, lo),
+        lambda i, la, lo: Taman(f"Taman {i}", la, lo),
+    ]
+    return [rng.choice(pembuat)(i, rng.uniform(-7.20, -6.80), rng.uniform(110.20, 110.60)) for i in range(jumlah)]
+
+def _waktu(fungsi, daftar_titik) -> tuple[float, list]:
+    mulai = time.perf_counter()
+    hasil = [fungsi(la, lo) for la, lo in daftar_titik]
+    return (time.perf_counter() - mulai) / len(daftar_titik) * 1000, hasil
+
+def benchmark(jumlah: int = 100_000, jumlah_query: int = 200, jumlah_query_linear: int = 10, radius_km: float = 2.0, k: int = 5):
+    print(f"--- Benchmark IndeksSpasial: {jumlah:,} lokasi ---")
+    daftar = buat_lokasi_sintetis(jumlah)
+    mulai = time.perf_counter()
+    indeks = IndeksSpasial(daftar)
+    print(f"Bangun indeks        : {(time.perf_counter() - mulai) * 1000:8.1f} ms")
+
+    rng = random.Random(1)
+    titik = [(rng.uniform(-7.20, -6.80), rng.uniform(110.20, 110.60)) for _ in range(jumlah_query)]
+    titik_linear = titik[:jumlah_query_linear]
+
+    ms_r, hasil_r = _waktu(lambda la, lo: indeks.radius(la, lo, radius_km), titik)
+    ms_rl, hasil_rl = _waktu(lambda la, lo: radius_linear(daftar, la, lo, radius_km), titik_linear)
+    # Pindai penuh tervektorisasi (tanpa indeks) sebagai pembanding yang lebih adil
+    semua_lat = np.array([l.latitude for l in daftar])
+    semua_lon = np.array([l.longitude for l in daftar])
+    ms_rv, _ = _waktu(lambda la, lo: np.flatnonzero(haversine_km(la, lo, semua_lat, semua_lon) <= radius_km), titik)
+    ms_k, hasil_k = _waktu(lambda la, lo: indeks.terdekat(la, lo, k), titik)
+    ms_kl, hasil_kl = _waktu(lambda la, lo: terdekat_linear(daftar, la, lo, k), titik_linear)
+    d = radius_km / KM_PER_DERAJAT
+    ms_b, _ = _waktu(lambda la, lo: indeks.kotak(la - d, lo - d, la + d, lo + d), titik)
+
+    sama_r = all({id(x) for x in a} == {id(x) for x in b} for a, b in zip(hasil_r, hasil_rl))
+    sama_k = all([id(x) for x in a] == [id(x) for x in b] for a, b in zip(hasil_k, hasil_kl))
+    rata2 = sum(len(h) for h in hasil_r) / len(hasil_r)
+    print(f"Radius {radius_km:g} km (rata2 {rata2:.0f} hasil): indeks {ms_r:8.3f} ms | linear {ms_rl:9.1f} ms | {ms_rl / ms_r:,.0f}x | hasil sama: {sama_r}")
+    print(f"{'':<20}  pindai penuh NumPy {ms_rv:8.3f} ms | {ms_rv / ms_r:,.0f}x")
+    print(f"{k} terdekat             : indeks {ms_k:8.3f} ms | linear {ms_kl:9.1f} ms | {ms_kl / ms_k:,.0f}x | hasil sama: {sama_k}")
+    print(f"Bounding box         : indeks {ms_b:8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Indeks spasial grid untuk objek Lokasi.")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=100_000, default=None, metavar="JUMLAH",
+                        help="Bandingkan dengan pindai linear (default 100000 titik)")
+    parser.add_argument("--csv", default="lokasi_semarang.csv", help="Demo query pada data CSV")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+    from pemuat_lokasi import buat_objek_lokasi_dari_kolom, cetak_laporan_ditolak, muat_lokasi
+    hasil = muat_lokasi(args.csv)
+    if hasil is None:
+        return
+    valid, ditolak = hasil
+    cetak_laporan_ditolak(ditolak)
+    daftar = buat_objek_lokasi_dari_kolom(valid)
+    if not daftar:
+        return
+    indeks = IndeksSpasial(daftar)
+    pusat = (-6.9929, 110.4200)  # Simpang Lima
+    print(f"\nDalam 2 km dari Simpang Lima:")
+    for lok, jarak in indeks.radius(*pusat, 2.0, dengan_jarak=True):
+        print(f" -> {lok} ({jarak:.2f} km)")
+    print(f"\n3 lokasi terdekat:")
+    for lok, jarak in indeks.terdekat(*pusat, 3, dengan_jarak=True):
+        print(f" -> {lok} ({jarak:.2f} km)")
+
+if __name__ == "__main__":
+    main()
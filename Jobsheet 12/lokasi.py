@@ -0,0 +1,125 @@
+# lokasi.py
+# Kelas Lokasi dan turunannya (dari bagian Penugasan Jobsheet_12.ipynb)
+# beserta fungsi baca CSV -> objek, agar bisa diimpor modul lain.
+import pandas as pd
+from abc import ABC, abstractmethod
+
+class Lokasi(ABC):
+    def __init__(self, nama: str, latitude: float, longitude: float):
+        self.nama = str(nama) if nama else "Tanpa Nama"
+        try:
+            self.latitude = float(latitude)
+            self.longitude = float(longitude)
+        except (ValueError, TypeError):
+            self.latitude = 0.0
+            self.longitude = 0.0
+
+    def get_koordinat(self) -> tuple:
+        return (self.latitude, self.longitude)
+
+    @abstractmethod
+    def get_info_popup(self) -> str:
+        pass
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(nama='{self.nama}', lat={self.latitude:.4f}, lon={self.longitude:.4f})"
+
+    def __str__(self) -> str:
+        return f"{self.nama} [{type(self).__name__}]"
+
+class TempatWisata(Lokasi):
+    def __init__(self, nama: str, latitude: float, longitude: float, jenis: str, deskripsi: str):
+        super().__init__(nama, latitude, longitude)
+        self.jenis_wisata = str(jenis) if jenis else "Umum"
+        self.deskripsi = str(deskripsi) if deskripsi else "Tidak ada deskripsi."
+    def get_info_popup(self) -> str:
+        return f"<h4><b>{self.nama}</b></h4><i>{self.jenis_wisata}</i><br><br>{self.deskripsi}<br><br>Koordinat: ({self.latitude:.4f}, {self.longitude:.4f})"
+
+class Kuliner(Lokasi):
+    def __init__(self, nama: str, latitude: float, longitude: float, menu_andalan: str):
+        super().__init__(nama, latitude, longitude)
+        self.menu_andalan = str(menu_andalan) if menu_andalan else "Tidak diketahui"
+    def get_info_popup(self) -> str:
+        return f"<h4><b>{self.nama}</b></h4><i>Kuliner</i><br><br>Menu Andalan: {self.menu_andalan}<br><br>Koordinat: ({self.latitude:.4f}, {self.longitude:.4f})"
+
+class TempatIbadah(Lokasi):
+    def __init__(self, nama: str, latitude: float, longitude: float, agama: str = "Umum", deskripsi: str = ""):
+        super().__init__(nama, latitude, longitude)
+        self.agama = str(agama) if agama else "Umum"
+        self.deskripsi = str(deskripsi) if deskripsi else "Tempat Ibadah"
+    def get_info_popup(self) -> str:
+        return f"<h4><b>{self.nama}</b></h4><i>Tempat Ibadah ({self.agama})</i><br><br>{self.deskripsi}<br><br>Koordinat: ({self.latitude:.4f}, {self.longitude:.4f})"
+
+class Museum(Lokasi):
+    def __init__(self, nama: str, latitude: float, longitude: float, deskripsi: str = ""):
+        super().__init__(nama, latitude, longitude)
+        self.deskripsi = deskripsi or "Museum"
+    def get_info_popup(self) -> str:
+        return f"<h4><b>{self.nama}</b></h4><i>Museum</i><br><br>{self.deskripsi}<br><br>Koordinat: ({self.latitude:.4f}, {self.longitude:.4f})"
+
+class Kantor(Lokasi):
+    def __init__(self, nama: str, latitude: float, longitude: float, deskripsi: str = ""):
+        super().__init__(nama, latitude, longitude)
+        self.deskripsi = deskripsi or "Kantor Pemerintahan"
+    def get_info_popup(self) -> str:
+        return f"<h4><b>{self.nama}</b></h4><i>Kantor Pemerintahan</i><br><br>{self.deskripsi}<br><br>Koordinat: ({self.latitude:.4f}, {self.longitude:.4f})"
+
+class Taman(Lokasi):
+    def __init__(self, nama: str, latitude: float, longitude: float, deskripsi: str = ""):
+        super().__init__(nama, latitude, longitude)
+        self.deskripsi = deskripsi or "Taman Kota"
+    def get_info_popup(self) -> str:
+        return f"<h4><b>{self.nama}</b></h4><i>Taman Kota</i><br><br>{self.deskripsi}<br><br>Koordinat: ({self.latitude:.4f}, {self.longitude:.4f})"
+
+def baca_data_lokasi(nama_file: str) -> pd.DataFrame | None:
+    try:
+        dataframe = pd.read_csv(nama_file)
+        return dataframe
+    except FileNotFoundError:
+        print(f"ERROR: File '{nama_file}' tidak ditemukan!")
+        return None
+    except Exception as e:
+        print(f"ERROR saat membaca file CSV: {type(e).__name__} - {e}")
+        return None
+
+def buat_objek_lokasi_dari_df(dataframe: pd.DataFrame) -> list:
+    list_objek_lokasi = []
+    if dataframe is None or dataframe.empty:
+        print("DataFrame kosong atau None, tidak ada objek dibuat.")
+        return list_objek_lokasi
+
+    print("\nMembuat objek dari DataFrame...")
+    for index, row in dataframe.iterrows():
+        nama = row.get('Nama', None)
+        lat = row.get('Latitude', None)
+        lon = row.get('Longitude', None)
+        tipe = row.get('Tipe', 'Lainnya')
+        deskripsi = row.get('Deskripsi', '')
+
+        objek = None
+
+        if nama is None or lat is None or lon is None:
+            print(f" -> Melewati baris {index}: Data Nama/Latitude/Longitude tidak lengkap.")
+            continue
+
+        try:
+            if 'Wisata' in tipe or tipe == 'Landmark':
+                objek = TempatWisata(nama, lat, lon, tipe, deskripsi)
+            elif tipe == 'Kuliner':
+                objek = Kuliner(nama, lat, lon, deskripsi)
+            elif 'Ibadah' in tipe:
+                objek = TempatIbadah(nama, lat, lon, "Umum", deskripsi)
+            elif 'Museum' in tipe:
+                objek = Museum(nama, lat, lon, deskripsi)
+            elif 'Kantor' in tipe:
+                objek = Kantor(nama, lat, lon, deskripsi)
+            elif 'Taman' in tipe:
+                objek = Taman(nama, lat, lon, deskripsi)
+            else:
+                print(f" -> Peringatan: Tipe '{tipe}' untuk '{nama}' tidak dikenali. Tidak membuat objek spesifik.")
+            if objek:
+                list_objek_lokasi.append(objek)
+        except Exception as e:
+            print(f" -> GAGAL membuat objek untuk '{nama}' di baris {index}: {e}")
+    print(f"Total {len(list_objek_lokasi)} objek lokasi berhasil dibuat dari {len(dataframe)} baris data.")
+    return list_objek_lokasi
@@ -0,0 +1,234 @@
+# pemuat_lokasi.py
+# Pemuat CSV lokasi yang bertipe, per potongan (chunk), dan tervalidasi.
+#
+# - Semua kolom dibaca sebagai string (dtype eksplisit), lalu Latitude/
+#   Longitude dikonversi sekaligus dengan pd.to_numeric. Nilai yang bukan
+#   angka, di luar rentang, atau (0, 0) DITOLAK dan dilaporkan, bukan
+#   diam-diam menjadi (0.0, 0.0) seperti di Lokasi.__init__.
+# - Tipe ditentukan tervektorisasi (aturan sama dengan buat_objek_lokasi_dari_df),
+#   lalu objek dibuat dari array kolom lewat tabel PEMBUAT_LOKASI, tanpa iterrows.
+# - Hasil validasi disimpan ke cache .npz (kunci: hash isi CSV), sehingga
+#   CSV yang tidak berubah tidak di-parse ulang.
+#
+# Contoh:
+#   python pemuat_lokasi.py                       # muat lokasi_semarang.csv + laporan baris ditolak
+#   python pemuat_lokasi.py --benchmark 200000
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from lokasi import (Lokasi, TempatWisata, Kuliner, TempatIbadah, Museum, Kantor, Taman,
+                    baca_data_lokasi, buat_objek_lokasi_dari_df)
+
+FOLDER_CACHE = os.path.join(".cache", "lokasi")
+VERSI_CACHE = 1  # Naikkan jika aturan validasi/format cache berubah
+KOLOM_WAJIB = ("Nama", "Latitude", "Longitude")
+KOLOM_OPSIONAL = {"Tipe": "Lainnya", "Deskripsi": ""}
+DTYPE_KOLOM = {kolom: "string" for kolom in KOLOM_WAJIB + tuple(KOLOM_OPSIONAL)}
+
+# Nama kelas -> pembuat objek dari (nama, lat, lon, tipe, deskripsi)
+PEMBUAT_LOKASI = {
+    "TempatWisata": lambda nama, lat, lon, tipe, desk: TempatWisata(nama, lat, lon, tipe, desk),
+    "Kuliner": lambda nama, lat, lon, tipe, desk: Kuliner(nama, lat, lon, desk),
+    "TempatIbadah": lambda nama, lat, lon, tipe, desk: TempatIbadah(nama, lat, lon, "Umum", desk),
+    "Museum": lambda nama, lat, lon, tipe, desk: Museum(nama, lat, lon, desk),
+    "Kantor": lambda nama, lat, lon, tipe, desk: Kantor(nama, lat, lon, desk),
+    "Taman": lambda nama, lat, lon, tipe, desk: Taman(nama, lat, lon, desk),
+}
+
+def hash_file(nama_file: str, ukuran_blok: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(nama_file, "rb") as f:
+        while blok := f.read(ukuran_blok):
+            h.update(blok)
+    return h.hexdigest()
+
+def tentukan_kelas(tipe: pd.Series) -> np.ndarray:
+    """Nama kelas per baris (string kosong = tipe tidak dikenali)."""
+    kondisi = [
+        tipe.str.contains("Wisata", regex=False) | (tipe == "Landmark"),
+        tipe == "Kuliner",
+        tipe.str.contains("Ibadah", regex=False),
+        tipe.str.contains("Museum", regex=False),
+        tipe.str.contains("Kantor", regex=False),
+        tipe.str.contains("Taman", regex=False),
+    ]
+    return np.select([k.to_numpy(dtype=bool, na_value=False) for k in kondisi], list(PEMBUAT_LOKASI), default="")
+
+def _validasi_chunk(chunk: pd.DataFrame, batas: tuple[float, float, float, float] | None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    for kolom, default in KOLOM_OPSIONAL.items():
+        if kolom not in chunk:
+            chunk[kolom] = default
+    teks = {kolom: chunk[kolom].fillna("").str.replace(r"\s+", " ", regex=True).str.strip()
+            for kolom in ("Nama", "Tipe", "Deskripsi")}
+    teks["Tipe"] = teks["Tipe"].mask(teks["Tipe"] == "", KOLOM_OPSIONAL["Tipe"])
+    lat = pd.to_numeric(chunk["Latitude"].str.strip(), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    lon = pd.to_numeric(chunk["Longitude"].str.strip(), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    kelas = tentukan_kelas(teks["Tipe"])
+
+    # Urutan penting: alasan pertama yang cocok yang dilaporkan
+    aturan = [
+        ((teks["Nama"] == "").to_numpy(), "Nama kosong"),
+        (np.isnan(lat), "Latitude bukan angka"),
+        (np.isnan(lon), "Longitude bukan angka"),
+        ((lat < -90) | (lat > 90), "Latitude di luar rentang [-90, 90]"),
+        ((lon < -180) | (lon > 180), "Longitude di luar rentang [-180, 180]"),
+        ((lat == 0) & (lon == 0), "Koordinat (0, 0)"),
+    ]
+    if batas:
+        lat_min, lon_min, lat_max, lon_max = batas
+        aturan.append(((lat < lat_min) | (lat > lat_max) | (lon < lon_min) | (lon > lon_max), "Di luar area batas"))
+    aturan.append((kelas == "", "Tipe tidak dikenali"))
+    alasan = np.select([m for m, _ in aturan], [a for _, a in aturan], default="")
+    ok = alasan == ""
+
+    valid = pd.DataFrame({"Baris": chunk.index.to_numpy()[ok], "Nama": teks["Nama"].to_numpy()[ok],
+                          "Latitude": lat[ok], "Longitude": lon[ok], "Tipe": teks["Tipe"].to_numpy()[ok],
+                          "Deskripsi": teks["Deskripsi"].to_numpy()[ok], "Kelas": kelas[ok]})
+    ditolak = pd.DataFrame({"Baris": chunk.index.to_numpy()[~ok], "Nama": teks["Nama"].to_numpy()[~ok],
+                            "Latitude": chunk["Latitude"].fillna("").to_numpy()[~ok],
+                            "Longitude": chunk["Longitude"].fillna("").to_numpy()[~ok], "Alasan": alasan[~ok]})
+    return valid, ditolak
+
+def _baca_tervalidasi(nama_file: str, ukuran_chunk: int, batas) -> tuple[pd.DataFrame, pd.DataFrame]:
+    kolom_csv = pd.read_csv(nama_file, nrows=0).columns
+    hilang = [k for k in KOLOM_WAJIB if k not in kolom_csv]
+    if hilang:
+        raise ValueError(f"Kolom wajib tidak ada di '{nama_file}': {', '.join(hilang)}")
+    semua_valid, semua_ditolak = [], []
+    pembaca = pd.read_csv(nama_file, dtype=DTYPE_KOLOM, usecols=lambda k: k in DTYPE_KOLOM,
+                          keep_default_na=False, chunksize=ukuran_chunk)
+    for chunk in pembaca:
+        if chunk.empty:
+            continue
+        valid, ditolak = _validasi_chunk(chunk, batas)
+        semua_valid.append(valid)
+        semua_ditolak.append(ditolak)
+    if not semua_valid:  # CSV hanya berisi header
+        return _validasi_chunk(pd.DataFrame({k: pd.Series(dtype="string") for k in DTYPE_KOLOM}), batas)
+    return pd.concat(semua_valid, ignore_index=True), pd.concat(semua_ditolak, ignore_index=True)
+
+# --- Cache .npz ---
+def _simpan_cache(path: str, valid: pd.DataFrame, ditolak: pd.DataFrame):
+    array = {f"valid__{k}": valid[k].to_numpy(dtype=np.float64 if k in ("Latitude", "Longitude") else None)
+             for k in valid.columns}
+    array.update({f"ditolak__{k}": ditolak[k].to_numpy() for k in ditolak.columns})
+    # Kolom teks disimpan sebagai array unicode agar bisa dibaca tanpa pickle
+    array = {k: (v.astype(str) if v.dtype == object else v) for k, v in array.items()}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    path_sementara = path + ".tmp"
+    with open(path_sementara, "wb") as f:
+        np.savez(f, **array)
+    os.replace(path_sementara, path)
+
+def _baca_cache(path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    with np.load(path, allow_pickle=False) as data:
+        bagian = {"valid": {}, "ditolak": {}}
+        for kunci in data.files:
+            nama, kolom = kunci.split("__", 1)
+            bagian[nama][kolom] = data[kunci]
+    return pd.DataFrame(bagian["valid"]), pd.DataFrame(bagian["ditolak"])
+
+def muat_lokasi(nama_file: str, ukuran_chunk: int = 50_000, batas: tuple[float, float, float, float] | None = None,
+                pakai_cache: bool = True, folder_cache: str = FOLDER_CACHE) -> tuple[pd.DataFrame, pd.DataFrame] | None:
+    """Membaca dan memvalidasi CSV lokasi.
+
+    Args:
+        nama_file (str): Path CSV (kolom Nama, Latitude, Longitude, opsional Tipe, Deskripsi).
+        ukuran_chunk (int): Jumlah baris per potongan saat membaca.
+        batas (tuple | None): (lat_min, lon_min, lat_max, lon_max) area yang diterima.
+        pakai_cache (bool): Pakai/simpan cache .npz berdasarkan hash isi CSV.
+
+    Returns:
+        tuple | None: (df_valid, df_ditolak), atau None jika file tidak bisa dibaca.
+        df_valid berisi kolom Kelas (nama kelas Lokasi); df_ditolak berisi kolom Alasan.
+    """
+    try:
+        path_cache = None
+        if pakai_cache:
+            opsi = json.dumps({"versi": VERSI_CACHE, "batas": batas}, sort_keys=True)
+            kunci = hashlib.sha256((hash_file(nama_file) + opsi).encode()).hexdigest()[:20]
+            path_cache = os.path.join(folder_cache, f"lokasi_{kunci}.npz")
+            if os.path.exists(path_cache):
+                return _baca_cache(path_cache)
+        valid, ditolak = _baca_tervalidasi(nama_file, ukuran_chunk, batas)
+        if path_cache:
+            _simpan_cache(path_cache, valid, ditolak)
+        return valid, ditolak
+    except FileNotFoundError:
+        print(f"ERROR: File '{nama_file}' tidak ditemukan!")
+        return None
+    except (ValueError, pd.errors.ParserError) as e:
+        print(f"ERROR saat membaca file CSV: {type(e).__name__} - {e}")
+        return None
+
+def buat_objek_lokasi_dari_kolom(df_valid: pd.DataFrame) -> list[Lokasi]:
+    """Membuat objek Lokasi dari DataFrame hasil muat_lokasi (tanpa iterrows)."""
+    kolom = [df_valid[k].tolist() for k in ("Kelas", "Nama", "Latitude", "Longitude", "Tipe", "Deskripsi")]
+    return [PEMBUAT_LOKASI[kelas](nama, lat, lon, tipe, desk) for kelas, nama, lat, lon, tipe, desk in zip(*kolom)]
+
+def cetak_laporan_ditolak(df_ditolak: pd.DataFrame, maks_baris: int = 20):
+    if df_ditolak.empty:
+        print("Semua baris valid.")
+        return
+    print(f"{len(df_ditolak):,} baris ditolak:")
+    print(df_ditolak["Alasan"].value_counts().to_string())
+    print(df_ditolak.head(maks_baris).to_string(index=False))
+
+# --- Benchmark ---
+def _tulis_csv_sintetis(path: str, jumlah: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    tipe = np.array(["Wisata Alam", "Kuliner", "Tempat Ibadah", "Museum", "Taman Kota", "Landmark"])
+    lat = rng.uniform(-7.20, -6.80, jumlah).round(6).astype(str)
+    lon = rng.uniform(110.20, 110.60, jumlah).round(6).astype(str)
+    rusak = rng.random(jumlah) < 0.01  # ~1% koordinat rusak
+    lat[rusak] = "abc"
+    pd.DataFrame({"Nama": [f"Lokasi {i}" for i in range(jumlah)], "Latitude": lat, "Longitude": lon,
+                  "Tipe": tipe[rng.integers(0, len(tipe), jumlah)], "Deskripsi": "Deskripsi, dengan koma"}).to_csv(path, index=False)
+
+def benchmark(jumlah: int = 200_000):
+    print(f"--- Benchmark Pemuat: {jumlah:,} baris ---")
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "lokasi.csv")
+        _tulis_csv_sintetis(path, jumlah)
+
+        mulai = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            lama = buat_objek_lokasi_dari_df(baca_data_lokasi(path))
+        print(f"read_csv + iterrows : {time.perf_counter() - mulai:6.2f} s | {len(lama):,} objek (koordinat rusak jadi (0, 0))")
+
+        folder_cache = os.path.join(folder, "cache")
+        for label in ("muat (dingin)", "muat (cache)"):
+            mulai = time.perf_counter()
+            valid, ditolak = muat_lokasi(path, folder_cache=folder_cache)
+            objek = buat_objek_lokasi_dari_kolom(valid)
+            print(f"{label:<20}: {time.perf_counter() - mulai:6.2f} s | {len(objek):,} objek, {len(ditolak):,} ditolak")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pemuat CSV lokasi tervalidasi.")
+    parser.add_argument("--csv", default="lokasi_semarang.csv")
+    parser.add_argument("--tanpa-cache", action="store_true", help="Selalu parse ulang CSV")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=200_000, default=None, metavar="JUMLAH")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+    hasil = muat_lokasi(args.csv, pakai_cache=not args.tanpa_cache)
+    if hasil is None:
+        return
+    valid, ditolak = hasil
+    daftar = buat_objek_lokasi_dari_kolom(valid)
+    print(f"Total {len(daftar)} objek lokasi dibuat dari {len(valid) + len(ditolak)} baris data.")
+    for lok in daftar:
+        print(f" - {lok!r}")
+    cetak_laporan_ditolak(ditolak)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# peta_lokasi.py
+# Pembuat peta Folium yang tetap ringan untuk ribuan lokasi.
+#
+# - Sedikit lokasi (<= AMBANG_MARKER): folium.Marker biasa di dalam
+#   MarkerCluster, tampilan sama dengan versi notebook.
+# - Banyak lokasi: FastMarkerCluster. Data dikirim sebagai satu array JSON
+#   ringkas, marker dibuat di browser, ikon dipakai bersama per tipe, dan
+#   HTML popup baru disusun saat popup dibuka (lazy).
+#
+# HTML hasil di-cache di FOLDER_CACHE dengan kunci hash isi CSV (+ opsi
+# peta), sehingga data yang tidak berubah tidak dirender ulang.
+#
+# Contoh:
+#   python peta_lokasi.py                         # lokasi_semarang.csv -> peta_interaktif_semarang.html
+#   python peta_lokasi.py --benchmark 20000
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import folium
+from folium.plugins import FastMarkerCluster, MarkerCluster
+from lokasi import Lokasi, TempatWisata, Kuliner, TempatIbadah, Museum, Kantor, Taman
+from pemuat_lokasi import buat_objek_lokasi_dari_kolom, cetak_laporan_ditolak, hash_file, muat_lokasi
+
+FOLDER_CACHE = os.path.join(".cache", "peta")
+VERSI_PETA = 2  # Naikkan jika tampilan peta berubah agar cache lama tidak dipakai
+AMBANG_MARKER = 500
+PUSAT_DEFAULT = (-6.9929, 110.4200, 13)
+
+# Tipe -> (warna, ikon); urutan juga menjadi indeks tipe di data FastMarkerCluster
+GAYA_LOKASI = {
+    TempatWisata: ("blue", "info-sign"),
+    Kuliner: ("red", "cutlery"),
+    TempatIbadah: ("green", "cloud"),
+    Museum: ("purple", "university"),
+    Kantor: ("gray", "building"),
+    Taman: ("lightgreen", "leaf"),
+}
+GAYA_DEFAULT = ("cadetblue", "star")
+
+# Tipe -> (subjudul, isi) popup, mengikuti get_info_popup() masing-masing kelas
+BAGIAN_POPUP = {
+    TempatWisata: lambda l: (l.jenis_wisata, l.deskripsi),
+    Kuliner: lambda l: ("Kuliner", f"Menu Andalan: {l.menu_andalan}"),
+    TempatIbadah: lambda l: (f"Tempat Ibadah ({l.agama})", l.deskripsi),
+    Museum: lambda l: ("Museum", l.deskripsi),
+    Kantor: lambda l: ("Kantor Pemerintahan", l.deskripsi),
+    Taman: lambda l: ("Taman Kota", l.deskripsi),
+}
+
+# Dijalankan sekali di browser: ikon dibuat per tipe, popup disusun saat dibuka
+CALLBACK_MARKER = """(function () {
+    var gaya = %s;
+    var ikon = gaya.map(function (g) {
+        return L.AwesomeMarkers.icon({markerColor: g[0], icon: g[1], prefix: "fa"});
+    });
+    return function (row) {
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: ikon[row[2]]});
+        marker.bindTooltip(row[3]);
+        marker.bindPopup(function () {
+            return "<h4><b>" + row[3] + "</b></h4><i>" + row[4] + "</i><br><br>" + row[5]
+                + "<br><br>Koordinat: (" + row[0].toFixed(4) + ", " + row[1].toFixed(4) + ")";
+        }, {maxWidth: 300});
+        return marker;
+    };
+})()"""
+
+def baca_config_peta(nama_file: str = "config_peta.txt") -> tuple[float, float, int]:
+    try:
+        with open(nama_file, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f.readlines()]
+            return float(lines[0]), float(lines[1]), int(lines[2])
+    except Exception:
+        return PUSAT_DEFAULT
+
+def _gaya(lok: Lokasi) -> tuple[str, str]:
+    for kelas in type(lok).__mro__:
+        if kelas in GAYA_LOKASI:
+            return GAYA_LOKASI[kelas]
+    return GAYA_DEFAULT
+
+def _bagian_popup(lok: Lokasi) -> tuple[str, str]:
+    for kelas in type(lok).__mro__:
+        if kelas in BAGIAN_POPUP:
+            return BAGIAN_POPUP[kelas](lok)
+    return type(lok).__name__, ""
+
+def _lokasi_valid(list_objek: list[Lokasi]) -> list[Lokasi]:
+    return [lok for lok in list_objek if lok.get_koordinat() != (0.0, 0.0)]
+
+# --- Pembuat Peta ---
+def _tambah_marker_cluster(peta: folium.Map, list_objek: list[Lokasi]):
+    cluster = MarkerCluster(name="Lokasi").add_to(peta)
+    for lok in list_objek:
+        warna, ikon = _gaya(lok)
+        folium.Marker(
+            location=lok.get_koordinat(),
+            popup=folium.Popup(lok.get_info_popup(), max_width=300),
+            tooltip=lok.nama,
+            icon=folium.Icon(color=warna, icon=ikon, prefix="fa")
+        ).add_to(cluster)
+
+def _tambah_marker_cepat(peta: folium.Map, list_objek: list[Lokasi]):
+    daftar_gaya = list(GAYA_LOKASI.values()) + [GAYA_DEFAULT]
+    indeks_gaya = {gaya: i for i, gaya in enumerate(daftar_gaya)}
+    data = []
+    for lok in list_objek:
+        subjudul, isi = _bagian_popup(lok)
+        data.append([round(lok.latitude, 6), round(lok.longitude, 6), indeks_gaya[_gaya(lok)], lok.nama, subjudul, isi])
+    FastMarkerCluster(data, callback=CALLBACK_MARKER % json.dumps(daftar_gaya), name="Lokasi",
+                      chunkedLoading=True).add_to(peta)
+
+def buat_peta_lokasi_folium(list_objek: list[Lokasi], file_output: str | None = "peta_lokasi.html",
+                            mode: str = "otomatis", pusat: tuple[float, float, int] | None = None) -> folium.Map:
+    """Peta dengan marker ter-cluster.
+
+    Args:
+        list_objek (list[Lokasi]): Lokasi yang akan ditampilkan; koordinat (0, 0) dilewati.
+        file_output (str | None): File HTML tujuan; None untuk tidak menyimpan.
+        mode (str): "marker" (folium.Marker + MarkerCluster), "cepat" (FastMarkerCluster),
+            atau "otomatis" (pilih berdasarkan AMBANG_MARKER).
+        pusat (tuple | None): (lat, lon, zoom); default dari config_peta.txt.
+    """
+    lat_tengah, lon_tengah, zoom = pusat or baca_config_peta()
+    peta = folium.Map(location=[lat_tengah, lon_tengah], zoom_start=zoom, tiles="OpenStreetMap")
+    valid = _lokasi_valid(list_objek)
+    if mode == "otomatis":
+        mode = "marker" if len(valid) <= AMBANG_MARKER else "cepat"
+    if mode == "marker":
+        _tambah_marker_cluster(peta, valid)
+    elif mode == "cepat":
+        _tambah_marker_cepat(peta, valid)
+    else:
+        raise ValueError(f"Mode peta tidak dikenal: {mode!r}")
+    if file_output:
+        peta.save(file_output)
+    return peta
+
+# --- Cache HTML ---
+def kunci_cache_peta(nama_file_csv: str, **opsi) -> str:
+    """Hash isi CSV + opsi yang memengaruhi HTML (pusat, mode, versi)."""
+    h = hashlib.sha256(hash_file(nama_file_csv).encode())
+    h.update(json.dumps({"versi": VERSI_PETA, **opsi}, sort_keys=True).encode())
+    return h.hexdigest()[:20]
+
+def peta_dari_csv(nama_file_csv: str, file_output: str | None = "peta_interaktif_semarang.html",
+                  mode: str = "otomatis", folder_cache: str = FOLDER_CACHE) -> str | None:
+    """Membuat (atau mengambil dari cache) peta untuk file CSV.
+    Mengembalikan path HTML di cache, atau None jika CSV tidak bisa dibaca."""
+    if not os.path.exists(nama_file_csv):
+        print(f"ERROR: File '{nama_file_csv}' tidak ditemukan!")
+        return None
+    pusat = baca_config_peta()
+    path_cache = os.path.join(folder_cache, f"peta_{kunci_cache_peta(nama_file_csv, pusat=pusat, mode=mode)}.html")
+    if os.path.exists(path_cache):
+        print(f"Peta diambil dari cache: {path_cache}")
+    else:
+        hasil = muat_lokasi(nama_file_csv)
+        if hasil is None:
+            return None
+        valid, ditolak = hasil
+        cetak_laporan_ditolak(ditolak)
+        list_objek = buat_objek_lokasi_dari_kolom(valid)
+        os.makedirs(folder_cache, exist_ok=True)
+        path_sementara = path_cache + ".tmp"
+        buat_peta_lokasi_folium(list_objek, None, mode, pusat).save(path_sementara)
+        os.replace(path_sementara, path_cache)  # Atomik: cache tidak pernah setengah jadi
+        print(f"Peta dirender dan disimpan ke cache: {path_cache}")
+    if file_output:
+        shutil.copyfile(path_cache, file_output)
+    return path_cache
+
+# --- Benchmark ---
+def benchmark(jumlah: int = 20_000):
+    from indeks_spasial import buat_lokasi_sintetis
+    print(f"--- Benchmark Peta: {jumlah:,} lokasi ---")
+    daftar = buat_lokasi_sintetis(jumlah)
+    for mode in ("marker", "cepat"):
+        mulai = time.perf_counter()
+        html = buat_peta_lokasi_folium(daftar, None, mode, PUSAT_DEFAULT).get_root().render()
+        print(f"{mode:<7}: render {time.perf_counter() - mulai:6.2f} s | HTML {len(html.encode()) / 1e6:7.2f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Peta Folium untuk data lokasi.")
+    parser.add_argument("--csv", default="lokasi_semarang.csv")
+    parser.add_argument("--output", default="peta_interaktif_semarang.html")
+    parser.add_argument("--mode", choices=["otomatis", "marker", "cepat"], default="otomatis")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=20_000, default=None, metavar="JUMLAH")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+    peta_dari_csv(args.csv, args.output, args.mode)
+
+if __name__ == "__main__":
+    main()
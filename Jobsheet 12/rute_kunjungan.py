@@ -0,0 +1,192 @@
+# rute_kunjungan.py
+# Matriks jarak haversine tervektorisasi dan perencana urutan kunjungan
+# (nearest neighbour + perbaikan 2-opt) untuk daftar Lokasi.
+#
+# Matriks dihitung per potongan baris sehingga array sementara NumPy
+# dibatasi oleh `maks_memori_mb`, bukan n x n x float64 sekaligus.
+# Hasil disimpan float32 (n=5000 -> ~100 MB); untuk n yang lebih besar
+# bisa ditulis langsung ke np.memmap di disk (`path_memmap`).
+#
+# Contoh:
+#   python rute_kunjungan.py                      # rute untuk lokasi_semarang.csv
+#   python rute_kunjungan.py --benchmark 3000
+import argparse
+import time
+import numpy as np
+from indeks_spasial import RADIUS_BUMI_KM, haversine_km, buat_lokasi_sintetis
+from lokasi import Lokasi
+
+# --- Matriks Jarak ---
+def matriks_jarak(latitude, longitude, maks_memori_mb: float = 64.0, dtype=np.float32,
+                  path_memmap: str | None = None) -> np.ndarray:
+    """Matriks jarak haversine n x n (km), dihitung per potongan baris.
+
+    Args:
+        latitude, longitude: Array koordinat (derajat) dengan panjang n.
+        maks_memori_mb (float): Batas kira-kira memori array sementara per potongan.
+        dtype: Tipe data hasil (float32 cukup untuk jarak dalam km).
+        path_memmap (str | None): Jika diisi, hasil ditulis ke file memmap ini.
+
+    Returns:
+        np.ndarray: Matriks simetris dengan diagonal 0.
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    n = len(lat)
+    if path_memmap:
+        hasil = np.lib.format.open_memmap(path_memmap, mode="w+", dtype=dtype, shape=(n, n))
+    else:
+        hasil = np.empty((n, n), dtype=dtype)
+    if not n:
+        return hasil
+    cos_lat = np.cos(lat)
+    # ~4 array float64 berukuran (baris x n) hidup bersamaan per potongan
+    baris_per_potongan = max(1, int(maks_memori_mb * 1024 * 1024 // (4 * 8 * n)))
+    for awal in range(0, n, baris_per_potongan):
+        akhir = min(awal + baris_per_potongan, n)
+        a = np.sin((lat[None, :] - lat[awal:akhir, None]) * 0.5)
+        a *= a
+        b = np.sin((lon[None, :] - lon[awal:akhir, None]) * 0.5)
+        b *= b
+        b *= cos_lat[awal:akhir, None]
+        b *= cos_lat[None, :]
+        a += b
+        np.clip(a, 0.0, 1.0, out=a)
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=a)
+        a *= 2 * RADIUS_BUMI_KM
+        hasil[awal:akhir] = a
+    return hasil
+
+def matriks_jarak_lokasi(daftar_lokasi: list[Lokasi], **kwargs) -> np.ndarray:
+    lat = np.fromiter((l.latitude for l in daftar_lokasi), dtype=np.float64, count=len(daftar_lokasi))
+    lon = np.fromiter((l.longitude for l in daftar_lokasi), dtype=np.float64, count=len(daftar_lokasi))
+    return matriks_jarak(lat, lon, **kwargs)
+
+# --- Urutan Kunjungan ---
+def panjang_rute(rute, matriks: np.ndarray, kembali: bool = False) -> float:
+    rute = np.asarray(rute)
+    if len(rute) < 2:
+        return 0.0
+    total = float(matriks[rute[:-1], rute[1:]].astype(np.float64).sum())
+    return total + (float(matriks[rute[-1], rute[0]]) if kembali else 0.0)
+
+def rute_tetangga_terdekat(matriks: np.ndarray, awal: int = 0) -> list[int]:
+    """Rute serakah: selalu ke lokasi terdekat yang belum dikunjungi. O(n^2)."""
+    n = matriks.shape[0]
+    sudah = np.zeros(n, dtype=bool)
+    rute = [awal]
+    sudah[awal] = True
+    sekarang = awal
+    for _ in range(n - 1):
+        baris = np.where(sudah, np.inf, matriks[sekarang])
+        sekarang = int(np.argmin(baris))
+        sudah[sekarang] = True
+        rute.append(sekarang)
+    return rute
+
+def perbaiki_2opt(rute: list[int], matriks: np.ndarray, kembali: bool = False,
+                  batas_detik: float = 10.0, toleransi: float = 1e-6) -> list[int]:
+    """Perbaikan 2-opt: membalik segmen rute selama itu memperpendek total jarak.
+
+    Untuk tiap sisi (a, b), semua kandidat sisi (c, d) dievaluasi sekaligus
+    dengan NumPy dan dipilih yang paling menguntungkan. Lokasi awal tetap di
+    depan. Berhenti jika tidak ada perbaikan lagi atau `batas_detik` habis.
+    """
+    jalur = np.array(rute, dtype=np.int64)
+    if kembali:
+        jalur = np.append(jalur, jalur[0])  # Salinan titik awal sebagai penutup siklus
+    m = len(jalur)
+    if m < 4:
+        return list(rute)
+    batas = time.perf_counter() + batas_detik
+    membaik = True
+    while membaik and time.perf_counter() < batas:
+        membaik = False
+        for i in range(m - 2):
+            a, b = jalur[i], jalur[i + 1]
+            c, d = jalur[i + 2:-1], jalur[i + 3:]
+            # Ganti sisi (a,b),(c,d) dengan (a,c),(b,d)
+            untung = matriks[a, b] + matriks[c, d] - matriks[a, c] - matriks[b, d]
+            j_terbaik, untung_terbaik = -1, toleransi
+            if len(untung):
+                idx = int(np.argmax(untung))
+                if untung[idx] > untung_terbaik:
+                    j_terbaik, untung_terbaik = i + 2 + idx, float(untung[idx])
+            if not kembali:
+                # Rute terbuka: ujung boleh dibalik tanpa sisi penutup
+                untung_ujung = float(matriks[a, b] - matriks[a, jalur[-1]])
+                if untung_ujung > untung_terbaik:
+                    j_terbaik, untung_terbaik = m - 1, untung_ujung
+            if j_terbaik >= 0:
+                jalur[i + 1:j_terbaik + 1] = jalur[i + 1:j_terbaik + 1][::-1]
+                membaik = True
+            if time.perf_counter() >= batas:
+                break
+    return (jalur[:-1] if kembali else jalur).tolist()
+
+def rencanakan_kunjungan(daftar_lokasi: list[Lokasi], awal: int = 0, kembali: bool = False,
+                         batas_detik: float = 10.0) -> tuple[list[Lokasi], float]:
+    """Urutan kunjungan (nearest neighbour + 2-opt) dan total jaraknya (km)."""
+    if not daftar_lokasi:
+        return [], 0.0
+    matriks = matriks_jarak_lokasi(daftar_lokasi)
+    rute = perbaiki_2opt(rute_tetangga_terdekat(matriks, awal), matriks, kembali, batas_detik)
+    return [daftar_lokasi[i] for i in rute], panjang_rute(rute, matriks, kembali)
+
+# --- Benchmark ---
+def benchmark(jumlah: int = 3000, batas_detik: float = 10.0):
+    print(f"--- Benchmark Rute: {jumlah:,} lokasi ---")
+    daftar = buat_lokasi_sintetis(jumlah)
+
+    contoh = daftar[:300]
+    mulai = time.perf_counter()
+    for p in contoh:
+        for q in contoh:
+            float(haversine_km(*p.get_koordinat(), *q.get_koordinat()))
+    per_pasang = (time.perf_counter() - mulai) / len(contoh) ** 2
+    print(f"Per pasang (get_koordinat): ~{per_pasang * jumlah ** 2:8.1f} s (estimasi untuk {jumlah:,}^2 pasang)")
+
+    mulai = time.perf_counter()
+    matriks = matriks_jarak_lokasi(daftar)
+    print(f"Matriks tervektorisasi   : {time.perf_counter() - mulai:8.2f} s ({matriks.nbytes / 1e6:,.0f} MB)")
+
+    mulai = time.perf_counter()
+    rute = rute_tetangga_terdekat(matriks)
+    jarak_nn = panjang_rute(rute, matriks)
+    print(f"Nearest neighbour        : {time.perf_counter() - mulai:8.2f} s | {jarak_nn:,.1f} km")
+
+    mulai = time.perf_counter()
+    rute = perbaiki_2opt(rute, matriks, batas_detik=batas_detik)
+    jarak_2opt = panjang_rute(rute, matriks)
+    print(f"2-opt                    : {time.perf_counter() - mulai:8.2f} s | {jarak_2opt:,.1f} km ({(1 - jarak_2opt / jarak_nn) * 100:.1f}% lebih pendek)")
+    assert sorted(rute) == list(range(jumlah)), "Rute harus mengunjungi semua lokasi tepat sekali"
+
+def main():
+    parser = argparse.ArgumentParser(description="Perencana urutan kunjungan lokasi.")
+    parser.add_argument("--csv", default="lokasi_semarang.csv")
+    parser.add_argument("--kembali", action="store_true", help="Rute kembali ke lokasi awal")
+    parser.add_argument("--batas-detik", type=float, default=10.0, help="Batas waktu perbaikan 2-opt")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=3000, default=None, metavar="JUMLAH")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.batas_detik)
+        return
+    from pemuat_lokasi import buat_objek_lokasi_dari_kolom, cetak_laporan_ditolak, muat_lokasi
+    hasil = muat_lokasi(args.csv)
+    if hasil is None:
+        return
+    valid, ditolak = hasil
+    cetak_laporan_ditolak(ditolak)
+    daftar = buat_objek_lokasi_dari_kolom(valid)
+    if not daftar:
+        return
+    urutan, total = rencanakan_kunjungan(daftar, kembali=args.kembali, batas_detik=args.batas_detik)
+    print("\n--- Urutan Kunjungan ---")
+    for nomor, lok in enumerate(urutan, start=1):
+        print(f"{nomor:2d}. {lok}")
+    print(f"Total jarak: {total:.2f} km")
+
+if __name__ == "__main__":
+    main()
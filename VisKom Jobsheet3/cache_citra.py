@@ -0,0 +1,204 @@
+# cache_citra.py
+# Cache citra ter-decode untuk pipeline D2 (UTKFace) dan D3 (Pawpularity).
+#
+# Di notebook, setiap epoch membaca ulang JPEG, decode, lalu resize untuk
+# setiap gambar; di mesin CPU itu menjadi bottleneck. Di sini decode +
+# resize dilakukan SEKALI ke shard TFRecord berisi piksel uint8 mentah
+# (H x W x 3). Saat latihan, shard dibaca paralel (interleave), di-parse
+# per batch dengan decode_raw (tanpa decode JPEG/resize), lalu di-prefetch.
+# Augmentasi acak D3 (data_augmentation notebook, lihat
+# dataset_visi.buat_augmentasi) dijalankan per batch train setiap epoch,
+# setelah dibaca dari cache; citra di cache sendiri tidak diaugmentasi.
+#
+# Catatan: piksel disimpan uint8 setelah resize, jadi berbeda maksimal
+# 0.5/255 dari versi float notebook.
+#
+# Contoh:
+#   python cache_citra.py --dataset utkface --folder cache/utkface --benchmark
+#   python cache_citra.py --sintetis 2000 --benchmark      # tanpa dataset asli
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+import numpy as np
+import tensorflow as tf
+from dataset_visi import DATASET, buat_augmentasi, buat_load_and_preprocess, split_dataset
+
+AUTOTUNE = tf.data.AUTOTUNE
+UKURAN_SHARD = 1024  # citra per file TFRecord
+NAMA_META = "meta.json"
+
+def sidik_sumber(paths, labels, img_size: int) -> str:
+    """Hash daftar file (path, ukuran, mtime), label, dan ukuran citra."""
+    h = hashlib.sha256(f"{img_size}".encode())
+    for path in paths:
+        st = os.stat(path)
+        h.update(f"{path}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    h.update(np.asarray(labels, dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+def _baca_meta(folder: str) -> dict | None:
+    try:
+        with open(os.path.join(folder, NAMA_META), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _contoh(gambar: np.ndarray, label: float) -> bytes:
+    fitur = {
+        "gambar": tf.train.Feature(bytes_list=tf.train.BytesList(value=[gambar.tobytes()])),
+        "label": tf.train.Feature(float_list=tf.train.FloatList(value=[float(label)])),
+    }
+    return tf.train.Example(features=tf.train.Features(feature=fitur)).SerializeToString()
+
+def buat_cache(paths, labels, folder: str, img_size: int, ukuran_shard: int = UKURAN_SHARD) -> dict:
+    """Decode + resize semua citra sekali ke shard TFRecord uint8.
+    Jika cache di `folder` sudah cocok dengan sumbernya, tidak ada yang ditulis ulang."""
+    sidik = sidik_sumber(paths, labels, img_size)
+    meta = _baca_meta(folder)
+    if meta and meta.get("sidik") == sidik:
+        print(f"Cache citra sudah ada: {folder} ({meta['jumlah']:,} citra)")
+        return meta
+
+    os.makedirs(folder, exist_ok=True)
+    # meta.json dihapus lebih dulu: jika pembangunan ulang terhenti, tidak ada
+    # meta lama yang menandai shard setengah jadi sebagai cache valid
+    if os.path.exists(os.path.join(folder, NAMA_META)):
+        os.remove(os.path.join(folder, NAMA_META))
+    for nama in os.listdir(folder):
+        if nama.endswith(".tfrecord"):
+            os.remove(os.path.join(folder, nama))
+    load_and_preprocess = buat_load_and_preprocess(img_size)
+
+    def decode_uint8(path, label):
+        img, label = load_and_preprocess(path, label)
+        return tf.cast(tf.round(img * 255.0), tf.uint8), label
+
+    ds = (tf.data.Dataset.from_tensor_slices((list(paths), np.asarray(labels, dtype=np.float32)))
+          .map(decode_uint8, num_parallel_calls=AUTOTUNE)
+          .batch(ukuran_shard)
+          .prefetch(2))
+    jumlah_shard = (len(paths) + ukuran_shard - 1) // ukuran_shard
+    mulai = time.perf_counter()
+    for nomor, (gambar, label) in enumerate(ds.as_numpy_iterator()):
+        path_shard = os.path.join(folder, f"shard-{nomor:05d}-of-{jumlah_shard:05d}.tfrecord")
+        with tf.io.TFRecordWriter(path_shard + ".tmp") as penulis:
+            for g, l in zip(gambar, label):
+                penulis.write(_contoh(g, l))
+        os.replace(path_shard + ".tmp", path_shard)
+        print(f" -> shard {nomor + 1}/{jumlah_shard} ({len(label):,} citra)")
+    meta = {"sidik": sidik, "jumlah": len(paths), "img_size": img_size, "jumlah_shard": jumlah_shard,
+            "durasi_detik": round(time.perf_counter() - mulai, 2)}
+    # meta.json ditulis terakhir: cache hanya dianggap valid jika semua shard selesai
+    with open(os.path.join(folder, NAMA_META), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+def dataset_dari_cache(folder: str, ukuran_batch: int = 64, acak: bool = False, seed: int = 42,
+                       buffer_acak: int = 4096, augmentasi: tf.keras.Model | None = None) -> tf.data.Dataset:
+    """Batch (citra float32 0..1 [B, H, W, 3], label [B]) dari cache TFRecord.
+    `augmentasi` (misal buat_augmentasi("pawpularity")) dijalankan per batch, acak tiap epoch."""
+    meta = _baca_meta(folder)
+    if meta is None:
+        raise FileNotFoundError(f"Cache citra belum dibuat di '{folder}' (jalankan buat_cache dulu).")
+    img_size = meta["img_size"]
+    shard = sorted(tf.io.gfile.glob(os.path.join(folder, "shard-*.tfrecord")))
+    ds = tf.data.Dataset.from_tensor_slices(shard)
+    if acak:
+        # Urutan shard diacak tiap epoch, lalu beberapa shard dibaca paralel
+        ds = ds.shuffle(len(shard), seed=seed)
+        ds = ds.interleave(tf.data.TFRecordDataset, cycle_length=4, num_parallel_calls=AUTOTUNE, deterministic=False)
+        ds = ds.shuffle(buffer_acak, seed=seed)
+    else:
+        # Urutan asli dipertahankan (evaluasi: prediksi sejajar dengan y_test)
+        ds = tf.data.TFRecordDataset(shard, num_parallel_reads=1)
+    skema = {"gambar": tf.io.FixedLenFeature([], tf.string), "label": tf.io.FixedLenFeature([], tf.float32)}
+
+    def parse_batch(serial):
+        contoh = tf.io.parse_example(serial, skema)
+        gambar = tf.io.decode_raw(contoh["gambar"], tf.uint8)
+        gambar = tf.reshape(gambar, (-1, img_size, img_size, 3))
+        return tf.cast(gambar, tf.float32) / 255.0, contoh["label"]
+
+    ds = ds.batch(ukuran_batch).map(parse_batch, num_parallel_calls=AUTOTUNE)
+    if augmentasi is not None:
+        ds = ds.map(lambda x, y: (augmentasi(x, training=True), y), num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(AUTOTUNE)
+
+def dataset_jpeg(paths, labels, img_size: int, ukuran_batch: int = 64) -> tf.data.Dataset:
+    """Pipeline notebook (decode JPEG + resize setiap epoch), sebagai pembanding."""
+    return (tf.data.Dataset.from_tensor_slices((list(paths), np.asarray(labels, dtype=np.float32)))
+            .map(buat_load_and_preprocess(img_size), num_parallel_calls=AUTOTUNE)
+            .batch(ukuran_batch)
+            .prefetch(AUTOTUNE))
+
+def siapkan_dataset(nama: str, folder_cache: str, ukuran_batch: int = 64):
+    """(train_ds, test_ds, y_test) untuk dataset `nama` yang dibaca dari cache.
+    Cache train/test dibuat otomatis jika belum ada atau sumbernya berubah.
+    train_ds memakai augmentasi notebook untuk dataset yang memilikinya (D3)."""
+    img_size = DATASET[nama][1]
+    train_files, test_files, y_train, y_test = split_dataset(nama)
+    buat_cache(train_files, y_train, os.path.join(folder_cache, "train"), img_size)
+    buat_cache(test_files, y_test, os.path.join(folder_cache, "test"), img_size)
+    train_ds = dataset_dari_cache(os.path.join(folder_cache, "train"), ukuran_batch, acak=True,
+                                  augmentasi=buat_augmentasi(nama))
+    test_ds = dataset_dari_cache(os.path.join(folder_cache, "test"), ukuran_batch)
+    return train_ds, test_ds, y_test
+
+# --- Benchmark ---
+def ukur_citra_per_detik(ds: tf.data.Dataset, epoch: int = 2) -> list[float]:
+    hasil = []
+    for _ in range(epoch):
+        jumlah, mulai = 0, time.perf_counter()
+        for gambar, _ in ds:
+            jumlah += int(gambar.shape[0])
+        hasil.append(jumlah / (time.perf_counter() - mulai))
+    return hasil
+
+def benchmark(paths, labels, img_size: int, folder: str, ukuran_batch: int = 64, epoch: int = 2) -> dict:
+    print(f"--- Benchmark Pipeline: {len(paths):,} citra, {img_size}x{img_size} ---")
+    meta = buat_cache(paths, labels, folder, img_size)
+    jpeg = ukur_citra_per_detik(dataset_jpeg(paths, labels, img_size, ukuran_batch), epoch)
+    cache = ukur_citra_per_detik(dataset_dari_cache(folder, ukuran_batch, acak=True), epoch)
+    print(f"Decode JPEG tiap epoch : {' | '.join(f'{v:8,.0f}' for v in jpeg)} citra/detik")
+    print(f"Cache TFRecord uint8   : {' | '.join(f'{v:8,.0f}' for v in cache)} citra/detik")
+    print(f"Pembuatan cache (sekali): {meta.get('durasi_detik', 0):.1f} s | percepatan per epoch ~{np.mean(cache) / np.mean(jpeg):.1f}x")
+    return {"jpeg": jpeg, "cache": cache, "meta": meta}
+
+def _jpeg_sintetis(folder: str, jumlah: int, ukuran: int = 400, seed: int = 0) -> tuple[list[str], np.ndarray]:
+    rng = np.random.default_rng(seed)
+    paths = []
+    dasar = rng.integers(0, 256, (ukuran, ukuran, 3), dtype=np.uint8)
+    for i in range(jumlah):
+        gambar = np.roll(dasar, i, axis=1)
+        path = os.path.join(folder, f"{i % 90 + 1}_0_0_{i}.jpg")
+        tf.io.write_file(path, tf.io.encode_jpeg(gambar, quality=90))
+        paths.append(path)
+    return paths, rng.uniform(1, 90, jumlah).astype(np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache citra ter-decode (TFRecord uint8) untuk D2/D3.")
+    parser.add_argument("--dataset", choices=list(DATASET), default="utkface")
+    parser.add_argument("--folder", default=None, help="Folder cache (default: cache/<dataset>)")
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--benchmark", action="store_true", help="Bandingkan citra/detik dengan pipeline JPEG")
+    parser.add_argument("--sintetis", type=int, default=0, metavar="JUMLAH",
+                        help="Pakai JPEG sintetis (untuk benchmark tanpa dataset asli)")
+    args = parser.parse_args()
+
+    if args.sintetis:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths, labels = _jpeg_sintetis(os.path.join(tmp, "jpeg"), args.sintetis)
+            benchmark(paths, labels, DATASET[args.dataset][1], os.path.join(tmp, "cache"), args.batch)
+        return
+    folder = args.folder or os.path.join("cache", args.dataset)
+    if args.benchmark:
+        train_files, _, y_train, _ = split_dataset(args.dataset)
+        benchmark(train_files, y_train, DATASET[args.dataset][1], os.path.join(folder, "train"), args.batch)
+    else:
+        siapkan_dataset(args.dataset, folder, args.batch)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# data_lingkaran.py
+# Dataset lingkaran sintetis (Praktikum 1 / D1 di VisKom Jobsheet3.ipynb)
+# yang dibuat per batch, bukan satu per satu dengan cv2.circle.
+#
+# - Satu batch lingkaran dirasterisasi sekaligus: jarak kuadrat setiap
+#   piksel grid ke pusat tiap lingkaran dihitung dengan broadcasting NumPy.
+# - Citra tetap 1 kanal (uint8 -> float32 0..1); model D1 menerima
+#   (64, 64, 1) karena 3 kanal identik tidak menambah informasi.
+# - Sebagai tf.data.Dataset tak terbatas: batch ke-i memakai seed (seed, i)
+#   sehingga bisa dibuat paralel dan tetap deterministik, lalu di-prefetch.
+#   Ukuran data latih tidak lagi dibatasi RAM (N=3000 x 64x64x3 float32
+#   di notebook = ~147 MB sebelum split).
+#
+# Contoh:
+#   python data_lingkaran.py --epoch 12 --langkah 50
+#   python data_lingkaran.py --benchmark
+import argparse
+import time
+import numpy as np
+
+IMG_SIZE = 64
+MIN_R, MAX_R = 5, 20
+
+def buat_batch_lingkaran(ukuran_batch: int, img_size: int = IMG_SIZE, min_r: int = MIN_R, max_r: int = MAX_R,
+                         rng: np.random.Generator | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Satu batch lingkaran terisi.
+
+    Returns:
+        tuple: (citra float32 [B, H, W, 1] bernilai 0/1, radius float32 [B], pusat int [B, 2] (cx, cy)).
+    """
+    rng = rng or np.random.default_rng()
+    r = rng.integers(min_r, max_r + 1, ukuran_batch)
+    # Batas pusat per lingkaran sama dengan make_sample: [r, img_size - r)
+    cx = rng.integers(r, img_size - r)
+    cy = rng.integers(r, img_size - r)
+    sumbu = np.arange(img_size, dtype=np.int32)
+    dx2 = (sumbu[None, :] - cx[:, None]) ** 2  # [B, W]
+    dy2 = (sumbu[None, :] - cy[:, None]) ** 2  # [B, H]
+    isi = dy2[:, :, None] + dx2[:, None, :] <= (r * r)[:, None, None]  # [B, H, W]
+    return isi[..., None].astype(np.float32), r.astype(np.float32), np.stack([cx, cy], axis=1)
+
+def _batch_ke(indeks: int, seed: int, ukuran_batch: int, img_size: int, min_r: int, max_r: int):
+    rng = np.random.default_rng([seed, int(indeks)])
+    x, y, _ = buat_batch_lingkaran(ukuran_batch, img_size, min_r, max_r, rng)
+    return x, y
+
+def dataset_lingkaran(ukuran_batch: int = 64, img_size: int = IMG_SIZE, min_r: int = MIN_R, max_r: int = MAX_R,
+                      seed: int = 42):
+    """tf.data.Dataset tak terbatas berisi batch (citra [B, H, W, 1], radius [B])."""
+    import tensorflow as tf
+
+    def buat(indeks):
+        x, y = tf.numpy_function(
+            lambda i: _batch_ke(i, seed, ukuran_batch, img_size, min_r, max_r),
+            [indeks], (tf.float32, tf.float32), stateful=False)
+        x.set_shape((ukuran_batch, img_size, img_size, 1))
+        y.set_shape((ukuran_batch,))
+        return x, y
+
+    return (tf.data.Dataset.counter()
+            .map(buat, num_parallel_calls=tf.data.AUTOTUNE, deterministic=True)
+            .prefetch(tf.data.AUTOTUNE))
+
+def buat_model(img_size: int = IMG_SIZE):
+    """CNN D1 dari notebook, dengan input 1 kanal."""
+    from tensorflow.keras import layers, models
+    model = models.Sequential([
+        layers.Input((img_size, img_size, 1)),
+        layers.Conv2D(32, 3, activation='relu', padding='same'),
+        layers.MaxPooling2D(),
+        layers.Conv2D(64, 3, activation='relu', padding='same'),
+        layers.MaxPooling2D(),
+        layers.Conv2D(128, 3, activation='relu', padding='same'),
+        layers.GlobalAveragePooling2D(),
+        layers.Dense(64, activation='relu'),
+        layers.Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mse', metrics=['mae'])
+    return model
+
+def latih(epoch: int = 12, langkah_per_epoch: int = 50, ukuran_batch: int = 64, jumlah_validasi: int = 600, seed: int = 42):
+    """Melatih model D1 dari aliran data tak terbatas; validasi memakai set tetap."""
+    from sklearn.metrics import mean_absolute_error, r2_score
+    X_val, y_val, _ = buat_batch_lingkaran(jumlah_validasi, rng=np.random.default_rng(seed + 1))
+    model = buat_model()
+    history = model.fit(dataset_lingkaran(ukuran_batch, seed=seed), steps_per_epoch=langkah_per_epoch,
+                        epochs=epoch, validation_data=(X_val, y_val), verbose=1)
+    y_pred = model.predict(X_val, batch_size=256, verbose=0).ravel()
+    mae = mean_absolute_error(y_val, y_pred)
+    rmse = float(np.sqrt(np.mean((y_val - y_pred) ** 2)))
+    r2 = r2_score(y_val, y_pred)
+    print(f"D1 Results: MAE={mae:.3f} | RMSE={rmse:.3f} | R²={r2:.3f}")
+    return model, history
+
+# --- Benchmark ---
+def _make_sample_cv2(img_size=64, min_r=5, max_r=20):
+    """make_sample dari notebook (pembanding)."""
+    import cv2
+    r = np.random.randint(min_r, max_r + 1)
+    img = np.zeros((img_size, img_size), dtype=np.uint8)
+    cx = np.random.randint(r, img_size - r)
+    cy = np.random.randint(r, img_size - r)
+    cv2.circle(img, (cx, cy), r, (255,), -1)
+    img = (img / 255.0).astype(np.float32)
+    img3 = np.stack([img, img, img], axis=-1)
+    return img3, float(r), (cx, cy)
+
+def benchmark(jumlah: int = 3000, ukuran_batch: int = 256):
+    print(f"--- Benchmark Generator: {jumlah:,} citra ---")
+    mulai = time.perf_counter()
+    X, y, _ = zip(*[_make_sample_cv2() for _ in range(jumlah)])
+    X = np.array(X, dtype=np.float32)
+    durasi = time.perf_counter() - mulai
+    print(f"make_sample + cv2   : {jumlah / durasi:10,.0f} citra/detik | {X.nbytes / 1e6:7.1f} MB di RAM")
+
+    rng = np.random.default_rng(0)
+    mulai = time.perf_counter()
+    for _ in range(0, jumlah, ukuran_batch):
+        xb, _, _ = buat_batch_lingkaran(ukuran_batch, rng=rng)
+    durasi = time.perf_counter() - mulai
+    print(f"batch NumPy ({ukuran_batch})  : {jumlah / durasi:10,.0f} citra/detik | {xb.nbytes / 1e6:7.1f} MB per batch")
+
+    try:
+        ds = iter(dataset_lingkaran(ukuran_batch))
+        next(ds)  # pemanasan
+        mulai = time.perf_counter()
+        langkah = max(1, jumlah // ukuran_batch)
+        for _ in range(langkah):
+            next(ds)
+        durasi = time.perf_counter() - mulai
+        print(f"tf.data (prefetch)  : {langkah * ukuran_batch / durasi:10,.0f} citra/detik")
+    except ImportError:
+        print("tf.data             : TensorFlow tidak terpasang, dilewati.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset lingkaran sintetis per batch (D1).")
+    parser.add_argument("--epoch", type=int, default=12)
+    parser.add_argument("--langkah", type=int, default=50, help="Langkah (batch) per epoch")
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--benchmark", action="store_true", help="Bandingkan dengan make_sample + cv2")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+    latih(args.epoch, args.langkah, args.batch)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# dataset_visi.py
+# Definisi dataset D2 (UTKFace -> umur) dan D3 (Pawpularity) dari
+# VisKom Jobsheet3.ipynb, agar bisa dipakai ulang oleh modul lain.
+# Lokasi data bisa diganti lewat environment variable UTKFACE_DIR dan
+# PAWPULARITY_DIR (default: path Colab di notebook).
+import glob
+import os
+import numpy as np
+
+UTKFACE_DIR = os.environ.get("UTKFACE_DIR", "/content/utk/UTKFace")
+PAWPULARITY_DIR = os.environ.get("PAWPULARITY_DIR", "/content/paw")
+IMG_SIZE_UTK = 160
+IMG_SIZE_PAW = 224
+
+def parse_age_from_name(fp: str) -> int:
+    # Filename format: age_gender_race_date.jpg  (age di posisi pertama)
+    return int(os.path.basename(fp).split('_')[0])
+
+def daftar_utkface(data_dir: str = UTKFACE_DIR) -> tuple[list[str], np.ndarray]:
+    files = sorted(glob.glob(os.path.join(data_dir, "*.jpg")))
+    assert len(files) > 0, f"Pastikan UTKFace sudah diekstrak di {data_dir}"
+    ages = np.array([parse_age_from_name(f) for f in files], dtype=np.float32)
+    return files, ages
+
+def daftar_pawpularity(data_dir: str = PAWPULARITY_DIR) -> tuple[list[str], np.ndarray]:
+    import pandas as pd
+    df = pd.read_csv(os.path.join(data_dir, "train.csv"))
+    paths = [os.path.join(data_dir, "train", f"{x}.jpg") for x in df['Id']]
+    return paths, df['Pawpularity'].to_numpy(dtype=np.float32)
+
+# nama -> (fungsi daftar file & label, ukuran input model)
+DATASET = {
+    "utkface": (daftar_utkface, IMG_SIZE_UTK),
+    "pawpularity": (daftar_pawpularity, IMG_SIZE_PAW),
+}
+
+def split_dataset(nama: str):
+    """(train_files, test_files, y_train, y_test) dengan split yang sama seperti notebook."""
+    from sklearn.model_selection import train_test_split
+    files, labels = DATASET[nama][0]()
+    return train_test_split(files, labels, test_size=0.2, random_state=42)
+
+def buat_augmentasi(nama: str):
+    """data_augmentation notebook untuk train D3 (None untuk dataset tanpa augmentasi).
+    Input citra 0..1, jadi RandomBrightness memakai value_range (0, 1); notebook memakai
+    default (0, 255) sehingga pergeseran kecerahannya jauh lebih besar dari 10%."""
+    if nama != "pawpularity":
+        return None
+    import tensorflow as tf
+    from tensorflow.keras import layers
+    return tf.keras.Sequential([
+        layers.RandomFlip("horizontal"),
+        layers.RandomRotation(0.05),
+        layers.RandomZoom(0.1),
+        layers.RandomBrightness(factor=0.1, value_range=(0.0, 1.0)),
+    ])
+
+def buat_load_and_preprocess(img_size: int):
+    """load_and_preprocess dari notebook: baca JPEG, decode, resize, skala 0..1."""
+    import tensorflow as tf
+
+    def load_and_preprocess(path, label):
+        img = tf.io.read_file(path)
+        img = tf.image.decode_jpeg(img, channels=3)
+        img = tf.image.resize(img, (img_size, img_size))
+        img = img / 255.0
+        return img, tf.cast(label, tf.float32)
+
+    return load_and_preprocess
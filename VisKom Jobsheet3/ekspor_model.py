@@ -0,0 +1,154 @@
+# ekspor_model.py
+# Ekspor model umur (D2) / Pawpularity (D3) ke TFLite untuk inferensi CPU.
+#
+# - Kuantisasi "dinamis" (bobot int8, aktivasi float) atau "int8" penuh
+#   (aktivasi dikalibrasi dengan sampel dari cache citra train). Input dan
+#   output tetap float32 sehingga cara pakainya sama dengan model Keras.
+# - ModelTFLite.predict(x, batch_size) meniru model.predict: input citra
+#   0..1 [N, H, W, 3], output [N, 1].
+# - Benchmark: latensi satu gambar, throughput batch, serta MAE/R² dan
+#   selisihnya terhadap model Keras pada data test.
+#
+# Contoh:
+#   python ekspor_model.py --model model_umur.keras --tugas utkface --mode int8 --benchmark
+#   python ekspor_model.py --model model_paw.keras --tugas pawpularity --mode dinamis
+import argparse
+import os
+import time
+import numpy as np
+import tensorflow as tf
+
+try:
+    # tf.lite.Interpreter sudah deprecated di TF baru; pakai LiteRT jika terpasang
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    Interpreter = tf.lite.Interpreter
+
+MODE_KUANTISASI = ("dinamis", "int8", "float16", "float32")
+FOLDER_CACHE_CITRA = "cache"
+
+def ambil_citra(folder: str, jumlah: int, acak: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Sampel (citra 0..1, label) dari cache citra (lihat cache_citra.py)."""
+    from cache_citra import dataset_dari_cache
+    x, y = [], []
+    for xb, yb in dataset_dari_cache(folder, 64, acak=acak).unbatch().take(jumlah).batch(256):
+        x.append(xb.numpy())
+        y.append(yb.numpy())
+    return np.concatenate(x), np.concatenate(y)
+
+def ekspor_tflite(model: tf.keras.Model, path_output: str, mode: str = "dinamis",
+                  data_kalibrasi: np.ndarray | None = None) -> int:
+    """Konversi model Keras ke file .tflite; mengembalikan ukuran file (byte)."""
+    if mode not in MODE_KUANTISASI:
+        raise ValueError(f"Mode kuantisasi tidak dikenal: {mode!r}")
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if mode != "float32":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if mode == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == "int8":
+        if data_kalibrasi is None or not len(data_kalibrasi):
+            raise ValueError("Mode int8 membutuhkan data kalibrasi.")
+
+        def representative_dataset():
+            for citra in data_kalibrasi:
+                yield [citra[None].astype(np.float32)]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    isi = converter.convert()
+    with open(path_output, "wb") as f:
+        f.write(isi)
+    return len(isi)
+
+class ModelTFLite:
+    """Pembungkus Interpreter TFLite dengan API seperti model.predict."""
+    def __init__(self, path_model: str, jumlah_thread: int | None = None):
+        self.interpreter = Interpreter(model_path=path_model, num_threads=jumlah_thread or os.cpu_count())
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._ukuran_batch = None
+
+    def _siapkan(self, ukuran_batch: int):
+        # Resize + allocate hanya jika ukuran batch berubah
+        if ukuran_batch != self._ukuran_batch:
+            self.interpreter.resize_tensor_input(self._input["index"], [ukuran_batch, *self._input["shape"][1:]])
+            self.interpreter.allocate_tensors()
+            self._ukuran_batch = ukuran_batch
+
+    def predict_on_batch(self, x: np.ndarray) -> np.ndarray:
+        self._siapkan(len(x))
+        self.interpreter.set_tensor(self._input["index"], np.ascontiguousarray(x, dtype=np.float32))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output["index"]).copy()
+
+    def predict(self, x: np.ndarray, batch_size: int = 32, verbose: int = 0) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        hasil = [self.predict_on_batch(x[awal:awal + batch_size]) for awal in range(0, len(x), batch_size)]
+        return np.concatenate(hasil) if hasil else np.empty((0, 1), dtype=np.float32)
+
+# --- Benchmark ---
+def _metrik(y_true: np.ndarray, y_pred: np.ndarray) -> dict:
+    from sklearn.metrics import mean_absolute_error, r2_score
+    y_pred = np.asarray(y_pred).ravel()
+    return {"mae": float(mean_absolute_error(y_true, y_pred)), "r2": float(r2_score(y_true, y_pred))}
+
+def _latensi_ms(fungsi, ulang: int) -> float:
+    fungsi()  # pemanasan
+    durasi = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        durasi.append(time.perf_counter() - mulai)
+    return float(np.median(durasi) * 1000)
+
+def benchmark(model_keras: tf.keras.Model, model_tflite: ModelTFLite, x_uji: np.ndarray, y_uji: np.ndarray,
+              ukuran_batch: int = 32, ulang: int = 30) -> dict:
+    satu = x_uji[:1]
+    batch = x_uji[:ukuran_batch]
+    hasil = {}
+    for nama, model in (("keras", model_keras), ("tflite", model_tflite)):
+        y_pred = model.predict(x_uji, batch_size=ukuran_batch, verbose=0)
+        ms_batch = _latensi_ms(lambda: model.predict(batch, batch_size=ukuran_batch, verbose=0), max(3, ulang // 5))
+        hasil[nama] = {
+            "latensi_1_ms": _latensi_ms(lambda: model.predict(satu, verbose=0), ulang),
+            "citra_per_detik": len(batch) / (ms_batch / 1000),
+            **_metrik(y_uji, y_pred),
+            "prediksi": np.asarray(y_pred).ravel(),
+        }
+    k, t = hasil["keras"], hasil["tflite"]
+    print(f"{'':<8}{'latensi 1 citra':>16}{'throughput':>16}{'MAE':>10}{'R²':>10}")
+    for nama in ("keras", "tflite"):
+        h = hasil[nama]
+        print(f"{nama:<8}{h['latensi_1_ms']:>13.2f} ms{h['citra_per_detik']:>10,.1f} c/dtk{h['mae']:>10.3f}{h['r2']:>10.3f}")
+    print(f"Selisih : MAE {t['mae'] - k['mae']:+.3f} | R² {t['r2'] - k['r2']:+.4f} | "
+          f"maks |keras - tflite| = {np.abs(k['prediksi'] - t['prediksi']).max():.3f} | "
+          f"latensi {k['latensi_1_ms'] / t['latensi_1_ms']:.1f}x lebih cepat")
+    return hasil
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekspor model Keras ke TFLite terkuantisasi + benchmark.")
+    parser.add_argument("--model", required=True, help="Model Keras (.keras)")
+    parser.add_argument("--tugas", choices=["utkface", "pawpularity"], default="utkface")
+    parser.add_argument("--mode", choices=MODE_KUANTISASI, default="dinamis")
+    parser.add_argument("--output", default=None, help="File .tflite (default: <model>_<mode>.tflite)")
+    parser.add_argument("--jumlah-kalibrasi", type=int, default=200)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--jumlah-uji", type=int, default=512, help="Jumlah citra test untuk benchmark")
+    args = parser.parse_args()
+
+    folder_cache = os.path.join(FOLDER_CACHE_CITRA, args.tugas)
+    model = tf.keras.models.load_model(args.model, compile=False)
+    output = args.output or f"{os.path.splitext(args.model)[0]}_{args.mode}.tflite"
+    kalibrasi = None
+    if args.mode == "int8":
+        kalibrasi, _ = ambil_citra(os.path.join(folder_cache, "train"), args.jumlah_kalibrasi, acak=True)
+    ukuran = ekspor_tflite(model, output, args.mode, kalibrasi)
+    print(f"TFLite ({args.mode}) disimpan ke {output}: {ukuran / 1e6:.2f} MB")
+
+    if args.benchmark:
+        x_uji, y_uji = ambil_citra(os.path.join(folder_cache, "test"), args.jumlah_uji)
+        benchmark(model, ModelTFLite(output), x_uji, y_uji)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# embedding_backbone.py
+# Embedding backbone beku yang di-cache, untuk melatih head dengan cepat.
+#
+# Di notebook, D2 (MobileNetV2), D3 (EfficientNetB0), dan transfer VGG16
+# CIFAR-10 (Jobsheet2 TugasKecil.ipynb) menjalankan backbone beku pada
+# setiap gambar di setiap epoch, padahal hanya head yang dilatih. Di sini
+# backbone (preprocess + base + GlobalAveragePooling) dijalankan SEKALI,
+# embedding-nya disimpan ke .npz, lalu head dan k-fold cross-validation
+# dilatih langsung dari embedding (hitungan detik).
+#
+# --fine-tune N menyambung backbone + head terlatih menjadi model utuh dan
+# melanjutkan fine-tuning end-to-end seperti notebook (lapisan terakhir
+# backbone dibuka, learning rate 1e-4) selama N epoch.
+#
+# Contoh:
+#   python embedding_backbone.py --tugas utkface --kfold 5
+#   python embedding_backbone.py --tugas pawpularity --fine-tune 5
+#   python embedding_backbone.py --tugas cifar10 --kfold 5
+import argparse
+import hashlib
+import os
+import time
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers
+
+FOLDER_EMBEDDING = "embedding"
+FOLDER_CACHE_CITRA = "cache"
+
+def _head_regresi(dropout: float, unit: int):
+    return lambda x: layers.Dense(1)(layers.Dense(unit, activation='relu')(layers.Dropout(dropout)(x)))
+
+def _head_cifar(x):
+    return layers.Dense(10, activation='softmax')(layers.Dense(128, activation='relu')(x))
+
+# tugas -> konfigurasi backbone & head, mengikuti sel notebook masing-masing
+TUGAS = {
+    "utkface": {
+        "backbone": tf.keras.applications.MobileNetV2, "img_size": 160, "buka_lapisan": 30,
+        "preprocess": lambda x: tf.keras.applications.mobilenet_v2.preprocess_input(x * 255.0),
+        "head": _head_regresi(0.2, 128), "klasifikasi": False, "lr": 1e-3,
+    },
+    "pawpularity": {
+        "backbone": tf.keras.applications.EfficientNetB0, "img_size": 224, "buka_lapisan": 30,
+        "preprocess": lambda x: tf.keras.applications.efficientnet.preprocess_input(x * 255.0),
+        "head": _head_regresi(0.3, 256), "klasifikasi": False, "lr": 1e-3,
+    },
+    "cifar10": {
+        # Notebook memberi VGG16 input 0..1 tanpa preprocess_input; dipertahankan
+        "backbone": tf.keras.applications.VGG16, "img_size": 32, "buka_lapisan": 4,
+        "preprocess": lambda x: x,
+        "head": _head_cifar, "klasifikasi": True, "lr": 1e-3,
+    },
+}
+
+# --- Model ---
+def buat_backbone(tugas: str, bobot: str | None = "imagenet") -> tf.keras.Model:
+    """Citra 0..1 -> embedding ter-pool (preprocess + base beku + GlobalAveragePooling)."""
+    konfig = TUGAS[tugas]
+    ukuran = konfig["img_size"]
+    base = konfig["backbone"](include_top=False, input_shape=(ukuran, ukuran, 3), weights=bobot)
+    base.trainable = False
+    inputs = tf.keras.Input((ukuran, ukuran, 3))
+    x = base(konfig["preprocess"](inputs), training=False)
+    outputs = layers.GlobalAveragePooling2D()(x)
+    return tf.keras.Model(inputs, outputs, name=f"backbone_{tugas}")
+
+def buat_head(tugas: str, dim: int) -> tf.keras.Model:
+    konfig = TUGAS[tugas]
+    inputs = tf.keras.Input((dim,))
+    model = tf.keras.Model(inputs, konfig["head"](inputs), name=f"head_{tugas}")
+    if konfig["klasifikasi"]:
+        model.compile(optimizer=tf.keras.optimizers.Adam(konfig["lr"]), loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    else:
+        model.compile(optimizer=tf.keras.optimizers.Adam(konfig["lr"]), loss='mse', metrics=['mae'])
+    return model
+
+def gabung_model(backbone: tf.keras.Model, head: tf.keras.Model) -> tf.keras.Model:
+    """Model utuh citra -> prediksi, setara dengan `model` di notebook."""
+    inputs = tf.keras.Input(backbone.input_shape[1:])
+    return tf.keras.Model(inputs, head(backbone(inputs)), name="model_utuh")
+
+def _callback():
+    return [
+        tf.keras.callbacks.EarlyStopping(patience=3, restore_best_weights=True, monitor='val_loss'),
+        tf.keras.callbacks.ReduceLROnPlateau(patience=2, factor=0.5, min_lr=1e-6, monitor='val_loss'),
+    ]
+
+# --- Data & Embedding ---
+def sumber_citra(tugas: str, folder_cache: str = FOLDER_CACHE_CITRA, ukuran_batch: int = 64) -> dict:
+    """split -> (dataset/array citra berurutan, sidik sumber). Dataset citra dari cache_citra (D2/D3)."""
+    if tugas == "cifar10":
+        (x_train, y_train), (x_test, y_test) = tf.keras.datasets.cifar10.load_data()
+        x_train, x_test = (x_train / 255.0).astype(np.float32), (x_test / 255.0).astype(np.float32)
+        return {"train": ((x_train, y_train.ravel()), "cifar10-train"), "test": ((x_test, y_test.ravel()), "cifar10-test")}
+    from cache_citra import siapkan_dataset, dataset_dari_cache, _baca_meta
+    siapkan_dataset(tugas, os.path.join(folder_cache, tugas), ukuran_batch)
+    hasil = {}
+    for split in ("train", "test"):
+        folder = os.path.join(folder_cache, tugas, split)
+        hasil[split] = (dataset_dari_cache(folder, ukuran_batch), _baca_meta(folder)["sidik"])
+    return hasil
+
+def ekstrak_embedding(backbone: tf.keras.Model, sumber, ukuran_batch: int = 64) -> tuple[np.ndarray, np.ndarray]:
+    """Menjalankan backbone sekali atas seluruh sumber (dataset (x, y) atau tuple array)."""
+    if isinstance(sumber, tuple):
+        sumber = tf.data.Dataset.from_tensor_slices(sumber).batch(ukuran_batch).prefetch(tf.data.AUTOTUNE)
+    embedding, label = [], []
+    for x, y in sumber:
+        embedding.append(backbone.predict_on_batch(x))
+        label.append(y.numpy())
+    return np.concatenate(embedding).astype(np.float32), np.concatenate(label)
+
+def muat_atau_ekstrak(tugas: str, bobot: str | None = "imagenet", folder: str = FOLDER_EMBEDDING,
+                      folder_cache: str = FOLDER_CACHE_CITRA, ukuran_batch: int = 64):
+    """{split: (embedding, label)}; embedding dihitung ulang hanya jika sumber/backbone berubah."""
+    sumber = sumber_citra(tugas, folder_cache, ukuran_batch)
+    backbone, hasil = None, {}
+    for split, (data, sidik_data) in sumber.items():
+        sidik = hashlib.sha256(f"{tugas}|{bobot}|{sidik_data}".encode()).hexdigest()
+        path = os.path.join(folder, tugas, f"{split}.npz")
+        if os.path.exists(path):
+            with np.load(path) as npz:
+                if str(npz["sidik"]) == sidik:
+                    print(f"Embedding {tugas}/{split} diambil dari cache: {path}")
+                    hasil[split] = (npz["embedding"], npz["label"])
+                    continue
+        backbone = backbone or buat_backbone(tugas, bobot)
+        mulai = time.perf_counter()
+        emb, label = ekstrak_embedding(backbone, data, ukuran_batch)
+        durasi = time.perf_counter() - mulai
+        print(f"Embedding {tugas}/{split}: {emb.shape} dalam {durasi:.1f} s ({len(emb) / durasi:,.0f} citra/detik)")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, embedding=emb, label=label, sidik=np.array(sidik))
+        os.replace(path + ".tmp", path)
+        hasil[split] = (emb, label)
+    return hasil
+
+# --- Latihan Head ---
+def evaluasi(tugas: str, y_true: np.ndarray, y_pred: np.ndarray) -> dict:
+    from sklearn.metrics import accuracy_score, mean_absolute_error, r2_score
+    if TUGAS[tugas]["klasifikasi"]:
+        return {"akurasi": float(accuracy_score(y_true, y_pred.argmax(axis=1)))}
+    y_pred = y_pred.ravel()
+    return {"mae": float(mean_absolute_error(y_true, y_pred)), "rmse": float(np.sqrt(np.mean((y_true - y_pred) ** 2))),
+            "r2": float(r2_score(y_true, y_pred))}
+
+def latih_head(tugas: str, X: np.ndarray, y: np.ndarray, X_val: np.ndarray, y_val: np.ndarray,
+               epoch: int = 50, ukuran_batch: int = 256, verbose: int = 0) -> tf.keras.Model:
+    head = buat_head(tugas, X.shape[1])
+    head.fit(X, y, validation_data=(X_val, y_val), epochs=epoch, batch_size=ukuran_batch,
+             callbacks=_callback(), verbose=verbose)
+    return head
+
+def validasi_silang(tugas: str, X: np.ndarray, y: np.ndarray, k: int = 5, epoch: int = 50, seed: int = 42) -> list[dict]:
+    from sklearn.model_selection import KFold, StratifiedKFold
+    pembagi = (StratifiedKFold if TUGAS[tugas]["klasifikasi"] else KFold)(n_splits=k, shuffle=True, random_state=seed)
+    hasil = []
+    for nomor, (idx_latih, idx_val) in enumerate(pembagi.split(X, y), start=1):
+        mulai = time.perf_counter()
+        head = latih_head(tugas, X[idx_latih], y[idx_latih], X[idx_val], y[idx_val], epoch)
+        metrik = evaluasi(tugas, y[idx_val], head.predict(X[idx_val], batch_size=1024, verbose=0))
+        hasil.append(metrik)
+        print(f"Fold {nomor}/{k}: " + " | ".join(f"{n}={v:.3f}" for n, v in metrik.items()) + f" ({time.perf_counter() - mulai:.1f} s)")
+    for nama in hasil[0]:
+        nilai = [m[nama] for m in hasil]
+        print(f"Rata-rata {nama}: {np.mean(nilai):.3f} ± {np.std(nilai):.3f}")
+    return hasil
+
+def fine_tune(tugas: str, backbone: tf.keras.Model, head: tf.keras.Model, sumber: dict, epoch: int = 5,
+              ukuran_batch: int = 64) -> tf.keras.Model:
+    """Fallback end-to-end: buka lapisan terakhir backbone dan latih model utuh dengan lr 1e-4."""
+    konfig = TUGAS[tugas]
+    model = gabung_model(backbone, head)
+    base = next(l for l in backbone.layers if isinstance(l, tf.keras.Model))
+    base.trainable = True
+    for layer in base.layers[:-konfig["buka_lapisan"]]:
+        layer.trainable = False
+    loss, metrik = ('sparse_categorical_crossentropy', ['accuracy']) if konfig["klasifikasi"] else ('mse', ['mae'])
+    model.compile(optimizer=tf.keras.optimizers.Adam(1e-4), loss=loss, metrics=metrik)
+    if tugas == "cifar10":
+        (x, y), _ = sumber["train"]
+        (x_val, y_val), _ = sumber["test"]
+        model.fit(x, y, validation_data=(x_val, y_val), epochs=epoch, batch_size=ukuran_batch, callbacks=_callback())
+    else:
+        from cache_citra import dataset_dari_cache
+        from dataset_visi import buat_augmentasi
+        train_ds = dataset_dari_cache(os.path.join(FOLDER_CACHE_CITRA, tugas, "train"), ukuran_batch, acak=True,
+                                      augmentasi=buat_augmentasi(tugas))
+        model.fit(train_ds, validation_data=sumber["test"][0], epochs=epoch, callbacks=_callback())
+    return model
+
+def main():
+    parser = argparse.ArgumentParser(description="Latih head dari embedding backbone yang di-cache.")
+    parser.add_argument("--tugas", choices=list(TUGAS), default="utkface")
+    parser.add_argument("--kfold", type=int, default=0, help="Jumlah fold cross-validation (0 = lewati)")
+    parser.add_argument("--epoch", type=int, default=50, help="Epoch maksimum head (EarlyStopping aktif)")
+    parser.add_argument("--fine-tune", type=int, default=0, metavar="EPOCH",
+                        help="Lanjutkan fine-tuning end-to-end selama EPOCH epoch")
+    parser.add_argument("--tanpa-bobot", action="store_true", help="Backbone tanpa bobot ImageNet (uji cepat/offline)")
+    parser.add_argument("--simpan", default=None, help="Simpan model utuh ke file .keras")
+    args = parser.parse_args()
+
+    bobot = None if args.tanpa_bobot else "imagenet"
+    data = muat_atau_ekstrak(args.tugas, bobot)
+    X, y = data["train"]
+    X_test, y_test = data["test"]
+    if args.kfold:
+        print(f"--- {args.kfold}-fold cross-validation ({args.tugas}) ---")
+        validasi_silang(args.tugas, X, y, args.kfold, args.epoch)
+
+    mulai = time.perf_counter()
+    head = latih_head(args.tugas, X, y, X_test, y_test, args.epoch)
+    metrik = evaluasi(args.tugas, y_test, head.predict(X_test, batch_size=1024, verbose=0))
+    print(f"Head ({time.perf_counter() - mulai:.1f} s): " + " | ".join(f"{n}={v:.3f}" for n, v in metrik.items()))
+
+    backbone = buat_backbone(args.tugas, bobot)
+    if args.fine_tune:
+        model = fine_tune(args.tugas, backbone, head, sumber_citra(args.tugas), args.fine_tune)
+    else:
+        model = gabung_model(backbone, head)
+    if args.simpan:
+        model.save(args.simpan)
+        print(f"Model disimpan ke {args.simpan}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# prediksi_umur_batch.py
+# Prediksi umur massal: semua wajah di semua gambar dalam satu folder.
+#
+# Penugasan 1 di notebook memproses satu `image_path`, membuat
+# CascadeClassifier baru, hanya mengambil faces[0], lalu memanggil
+# model.predict untuk batch berisi satu wajah. Di sini:
+# - gambar dibaca + dideteksi wajahnya di thread pool (fungsi OpenCV
+#   melepas GIL); tiap thread memakai ulang satu CascadeClassifier
+#   (objek cascade tidak aman dipakai bersama antar thread),
+# - deteksi dilakukan pada salinan yang diperkecil (maks_sisi_deteksi),
+#   crop diambil dari resolusi asli,
+# - SEMUA wajah dikumpulkan dan diprediksi per batch besar dengan model
+#   yang sudah di-warm up sekali, hasil ditulis ke CSV.
+#
+# Catatan: model D2 sudah berisi preprocess_input(inputs * 255.0), jadi
+# input wajah cukup diskala 0..1. Sel notebook memberi preprocess_input
+# dua kali lalu "mengoreksi" hasilnya (pred * 0.6 + 8); koreksi itu tidak
+# dipakai di sini.
+#
+# Contoh:
+#   python prediksi_umur_batch.py foto/ --model model_umur.keras --output umur.csv
+import argparse
+import csv
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+IMG_SIZE = 160
+EKSTENSI_GAMBAR = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+KOLOM_CSV = ["file", "wajah_ke", "x", "y", "w", "h", "umur_prediksi"]
+
+_lokal = threading.local()
+
+def _cascade() -> cv2.CascadeClassifier:
+    if not hasattr(_lokal, "cascade"):
+        _lokal.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    return _lokal.cascade
+
+def daftar_gambar(folder: str) -> list[str]:
+    hasil = []
+    for akar, _, files in os.walk(folder):
+        hasil.extend(os.path.join(akar, f) for f in files if f.lower().endswith(EKSTENSI_GAMBAR))
+    return sorted(hasil)
+
+def deteksi_dan_crop(path: str, maks_sisi_deteksi: int = 800) -> tuple[str, list | None, np.ndarray | None]:
+    """(path, kotak wajah [(x, y, w, h)], crop RGB uint8 [n, IMG_SIZE, IMG_SIZE, 3]).
+    Kotak None jika gambar gagal dibaca; crop None jika tidak ada wajah."""
+    img_cv = cv2.imread(path)
+    if img_cv is None:
+        return path, None, None
+    gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
+    skala = min(1.0, maks_sisi_deteksi / max(gray.shape))
+    if skala < 1.0:
+        gray = cv2.resize(gray, None, fx=skala, fy=skala, interpolation=cv2.INTER_AREA)
+    faces = _cascade().detectMultiScale(gray, scaleFactor=1.2, minNeighbors=5)
+    if len(faces) == 0:
+        return path, [], None
+    kotak, crop = [], []
+    for (x, y, w, h) in np.round(np.asarray(faces) / skala).astype(int):
+        face_crop = img_cv[y:y+h, x:x+w]
+        if face_crop.size == 0:
+            continue
+        face_rgb = cv2.cvtColor(face_crop, cv2.COLOR_BGR2RGB)
+        crop.append(cv2.resize(face_rgb, (IMG_SIZE, IMG_SIZE), interpolation=cv2.INTER_AREA))
+        kotak.append((int(x), int(y), int(w), int(h)))
+    return path, kotak, (np.stack(crop) if crop else None)
+
+def _map_berurutan(executor: ThreadPoolExecutor, fungsi, data, maks_antrean: int):
+    """Seperti executor.map, tetapi paling banyak `maks_antrean` tugas menunggu (memori tetap kecil)."""
+    antrean = deque()
+    for item in data:
+        antrean.append(executor.submit(fungsi, item))
+        if len(antrean) >= maks_antrean:
+            yield antrean.popleft().result()
+    while antrean:
+        yield antrean.popleft().result()
+
+class PrediktorUmur:
+    """Memuat model sekali, warm up sekali, lalu prediksi per batch."""
+    def __init__(self, path_model: str, ukuran_batch: int = 128):
+        import tensorflow as tf
+        self.model = tf.keras.models.load_model(path_model, compile=False)
+        self.ukuran_batch = ukuran_batch
+        # Warm up: graph dibangun di sini, bukan di batch pertama yang diukur
+        self.model.predict_on_batch(np.zeros((ukuran_batch, IMG_SIZE, IMG_SIZE, 3), dtype=np.float32))
+
+    def prediksi(self, wajah_uint8: np.ndarray) -> np.ndarray:
+        hasil = []
+        for awal in range(0, len(wajah_uint8), self.ukuran_batch):
+            batch = wajah_uint8[awal:awal + self.ukuran_batch].astype(np.float32) / 255.0
+            hasil.append(np.asarray(self.model.predict_on_batch(batch)).reshape(-1))
+        return np.concatenate(hasil) if hasil else np.empty(0, dtype=np.float32)
+
+def proses_folder(folder: str, prediktor: PrediktorUmur, file_output: str, jumlah_thread: int = 4,
+                  maks_sisi_deteksi: int = 800) -> dict:
+    paths = daftar_gambar(folder)
+    statistik = {"gambar": len(paths), "gagal_dibaca": 0, "tanpa_wajah": 0, "wajah": 0, "detik_deteksi": 0.0, "detik_prediksi": 0.0}
+    tertunda_meta, tertunda_crop, jumlah_tertunda = [], [], 0
+
+    def kosongkan(penulis):
+        nonlocal tertunda_meta, tertunda_crop, jumlah_tertunda
+        if not jumlah_tertunda:
+            return
+        mulai = time.perf_counter()
+        umur = prediktor.prediksi(np.concatenate(tertunda_crop))
+        statistik["detik_prediksi"] += time.perf_counter() - mulai
+        for (path, nomor, (x, y, w, h)), u in zip(tertunda_meta, umur):
+            penulis.writerow([path, nomor, x, y, w, h, f"{float(u):.2f}"])
+        statistik["wajah"] += jumlah_tertunda
+        tertunda_meta, tertunda_crop, jumlah_tertunda = [], [], 0
+
+    mulai_total = time.perf_counter()
+    with open(file_output, "w", newline="", encoding="utf-8") as f, ThreadPoolExecutor(jumlah_thread) as executor:
+        penulis = csv.writer(f)
+        penulis.writerow(KOLOM_CSV)
+        mulai_deteksi = time.perf_counter()
+        for path, kotak, crop in _map_berurutan(executor, lambda p: deteksi_dan_crop(p, maks_sisi_deteksi), paths, jumlah_thread * 4):
+            if crop is None:
+                statistik["gagal_dibaca" if kotak is None else "tanpa_wajah"] += 1
+                continue
+            tertunda_meta.extend((path, i, k) for i, k in enumerate(kotak))
+            tertunda_crop.append(crop)
+            jumlah_tertunda += len(crop)
+            if jumlah_tertunda >= prediktor.ukuran_batch:
+                kosongkan(penulis)
+        kosongkan(penulis)
+        statistik["detik_deteksi"] = time.perf_counter() - mulai_deteksi - statistik["detik_prediksi"]
+    statistik["detik_total"] = time.perf_counter() - mulai_total
+    statistik["wajah_per_detik"] = statistik["wajah"] / statistik["detik_total"] if statistik["detik_total"] else 0.0
+    return statistik
+
+def main():
+    parser = argparse.ArgumentParser(description="Deteksi wajah + prediksi umur untuk semua gambar di folder.")
+    parser.add_argument("folder")
+    parser.add_argument("--model", required=True, help="Model umur D2 (.keras), misal dari embedding_backbone.py --simpan")
+    parser.add_argument("--output", default="prediksi_umur.csv")
+    parser.add_argument("--batch", type=int, default=128)
+    parser.add_argument("--thread", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--maks-sisi-deteksi", type=int, default=800, help="Gambar diperkecil ke sisi ini untuk deteksi")
+    args = parser.parse_args()
+
+    prediktor = PrediktorUmur(args.model, args.batch)
+    s = proses_folder(args.folder, prediktor, args.output, args.thread, args.maks_sisi_deteksi)
+    print(f"{s['gambar']:,} gambar | {s['wajah']:,} wajah | {s['tanpa_wajah']:,} tanpa wajah | {s['gagal_dibaca']:,} gagal dibaca")
+    print(f"Deteksi+crop {s['detik_deteksi']:.2f} s | prediksi {s['detik_prediksi']:.2f} s | total {s['detik_total']:.2f} s")
+    print(f"Throughput: {s['wajah_per_detik']:,.1f} wajah/detik -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# server_prediksi.py
+# Server prediksi lokal (HTTP di TCP atau Unix socket) untuk model umur
+# dan Pawpularity hasil ekspor_model.py, agar tool lain tidak perlu
+# memuat TensorFlow sendiri.
+#
+# - Model .tflite dimuat SEKALI saat start.
+# - Setiap permintaan masuk ke antrean asyncio per model; penggabung batch
+#   mengumpulkan permintaan yang datang bersamaan menjadi satu batch
+#   (maks --batch-maks) dan menunggu paling lama --tunggu-ms sejak
+#   permintaan pertama sebelum batch dijalankan.
+# - Batch di-pad ke ukuran kelipatan 2 (1, 2, 4, ...) dan tiap ukuran
+#   punya interpreter sendiri, sehingga tensor tidak dialokasi ulang.
+# - Decode gambar berjalan di thread pool; inferensi per model di satu
+#   thread khusus (interpreter tidak thread-safe).
+#
+# Endpoint:
+#   POST /prediksi/<model>   body: bytes JPEG/PNG -> {"prediksi": ..., ...}
+#   GET  /metrik             latensi p50/p95/p99, distribusi ukuran batch
+#   GET  /sehat
+#
+# Contoh:
+#   python server_prediksi.py --model umur=model_umur_int8.tflite --model pawpularity=model_paw_int8.tflite
+#   python server_prediksi.py --model umur=model_umur_int8.tflite --unix /tmp/prediksi.sock
+#   python server_prediksi.py --model umur=model_umur_int8.tflite --batch-maks 1   # pembanding tanpa batching
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+
+MAKS_BODY = 20 * 1024 * 1024
+STATUS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+def decode_gambar(data: bytes, ukuran: int) -> np.ndarray:
+    """Bytes JPEG/PNG -> citra RGB float32 0..1 [ukuran, ukuran, 3] (sama seperti load_and_preprocess)."""
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Gambar tidak bisa di-decode")
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    img = cv2.resize(img, (ukuran, ukuran), interpolation=cv2.INTER_LINEAR)
+    return img.astype(np.float32) / 255.0
+
+class Metrik:
+    def __init__(self, maks_sampel: int = 10_000):
+        self.latensi_ms = deque(maxlen=maks_sampel)
+        self.tunggu_ms = deque(maxlen=maks_sampel)
+        self.inferensi_ms = deque(maxlen=maks_sampel)
+        self.ukuran_batch = Counter()
+        self.permintaan = 0
+        self.error = 0
+
+    def ringkas(self) -> dict:
+        def persentil(data):
+            if not data:
+                return {}
+            p50, p95, p99 = np.percentile(np.fromiter(data, dtype=np.float64), [50, 95, 99])
+            return {"p50": round(p50, 2), "p95": round(p95, 2), "p99": round(p99, 2)}
+        jumlah_batch = sum(self.ukuran_batch.values())
+        return {
+            "permintaan": self.permintaan, "error": self.error, "batch": jumlah_batch,
+            "rata2_ukuran_batch": round(sum(k * v for k, v in self.ukuran_batch.items()) / jumlah_batch, 2) if jumlah_batch else 0.0,
+            "distribusi_ukuran_batch": dict(sorted(self.ukuran_batch.items())),
+            "latensi_ms": persentil(self.latensi_ms), "tunggu_antrean_ms": persentil(self.tunggu_ms),
+            "inferensi_batch_ms": persentil(self.inferensi_ms),
+        }
+
+class PenggabungBatch:
+    """Antrean asyncio yang menggabungkan permintaan bersamaan menjadi batch dinamis."""
+    def __init__(self, nama: str, path_model: str, batch_maks: int = 32, tunggu_ms: float = 5.0, jumlah_thread: int | None = None):
+        from ekspor_model import ModelTFLite
+        self.nama = nama
+        self.batch_maks = batch_maks
+        self.tunggu_detik = tunggu_ms / 1000
+        self.metrik = Metrik()
+        self._antrean: asyncio.Queue | None = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=f"inferensi-{nama}")
+        self._buat_model = lambda: ModelTFLite(path_model, jumlah_thread)
+        self._model_per_ukuran = {1: self._buat_model()}
+        self.ukuran_input = int(self._model_per_ukuran[1]._input["shape"][1])
+        # Warm up semua ukuran batch yang mungkin dipakai
+        ukuran = 1
+        while True:
+            self._inferensi(np.zeros((ukuran, self.ukuran_input, self.ukuran_input, 3), dtype=np.float32))
+            if ukuran >= batch_maks:
+                break
+            ukuran = min(ukuran * 2, batch_maks)
+
+    def _inferensi(self, batch: np.ndarray) -> np.ndarray:
+        n = len(batch)
+        ukuran = 1
+        while ukuran < n:
+            ukuran = min(ukuran * 2, self.batch_maks)
+        if ukuran not in self._model_per_ukuran:
+            self._model_per_ukuran[ukuran] = self._buat_model()
+        if ukuran > n:
+            batch = np.concatenate([batch, np.zeros((ukuran - n, *batch.shape[1:]), dtype=batch.dtype)])
+        return self._model_per_ukuran[ukuran].predict_on_batch(batch)[:n].reshape(n, -1)
+
+    async def prediksi(self, citra: np.ndarray) -> tuple[list[float], int]:
+        masa_depan = asyncio.get_running_loop().create_future()
+        await self._antrean.put((citra, masa_depan, time.perf_counter()))
+        return await masa_depan
+
+    async def jalankan(self):
+        self._antrean = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._antrean.get()]
+            batas = loop.time() + self.tunggu_detik
+            while len(batch) < self.batch_maks:
+                try:
+                    batch.append(self._antrean.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                sisa = batas - loop.time()
+                if sisa <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._antrean.get(), sisa))
+                except asyncio.TimeoutError:
+                    break
+            mulai = time.perf_counter()
+            try:
+                hasil = await loop.run_in_executor(self._executor, self._inferensi, np.stack([b[0] for b in batch]))
+            except Exception as e:
+                self.metrik.error += len(batch)
+                for _, masa_depan, _ in batch:
+                    if not masa_depan.done():
+                        masa_depan.set_exception(e)
+                continue
+            selesai = time.perf_counter()
+            self.metrik.ukuran_batch[len(batch)] += 1
+            self.metrik.inferensi_ms.append((selesai - mulai) * 1000)
+            for (_, masa_depan, masuk), nilai in zip(batch, hasil):
+                self.metrik.tunggu_ms.append((mulai - masuk) * 1000)
+                if not masa_depan.done():
+                    masa_depan.set_result((nilai.tolist(), len(batch)))
+
+class ServerPrediksi:
+    def __init__(self, model: dict[str, str], batch_maks: int = 32, tunggu_ms: float = 5.0, jumlah_thread_decode: int = 4):
+        self.penggabung = {nama: PenggabungBatch(nama, path, batch_maks, tunggu_ms) for nama, path in model.items()}
+        self._executor_decode = ThreadPoolExecutor(jumlah_thread_decode, thread_name_prefix="decode")
+        self._mulai = time.time()
+
+    async def _prediksi(self, nama: str, body: bytes) -> tuple[int, dict]:
+        penggabung = self.penggabung.get(nama)
+        if penggabung is None:
+            return 404, {"error": f"Model '{nama}' tidak ada", "model": list(self.penggabung)}
+        mulai = time.perf_counter()
+        penggabung.metrik.permintaan += 1
+        try:
+            citra = await asyncio.get_running_loop().run_in_executor(
+                self._executor_decode, decode_gambar, body, penggabung.ukuran_input)
+        except ValueError as e:
+            penggabung.metrik.error += 1
+            return 400, {"error": str(e)}
+        nilai, ukuran_batch = await penggabung.prediksi(citra)
+        latensi = (time.perf_counter() - mulai) * 1000
+        penggabung.metrik.latensi_ms.append(latensi)
+        return 200, {"model": nama, "prediksi": nilai[0] if len(nilai) == 1 else nilai,
+                     "ukuran_batch": ukuran_batch, "latensi_ms": round(latensi, 2)}
+
+    async def route(self, metode: str, path: str, body: bytes) -> tuple[int, dict]:
+        if path == "/sehat":
+            return 200, {"status": "ok", "model": list(self.penggabung), "uptime_detik": round(time.time() - self._mulai, 1)}
+        if path == "/metrik":
+            return 200, {nama: p.metrik.ringkas() for nama, p in self.penggabung.items()}
+        if path.startswith("/prediksi/"):
+            if metode != "POST":
+                return 405, {"error": "Gunakan POST dengan body gambar"}
+            return await self._prediksi(path[len("/prediksi/"):], body)
+        return 404, {"error": f"Path '{path}' tidak dikenal"}
+
+    async def tangani_koneksi(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                baris = await reader.readline()
+                if not baris:
+                    break
+                metode, path, _ = baris.decode("latin-1").split(" ", 2)
+                header = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    kunci, nilai = h.decode("latin-1").split(":", 1)
+                    header[kunci.strip().lower()] = nilai.strip()
+                panjang = int(header.get("content-length", 0))
+                if panjang > MAKS_BODY:
+                    await self._kirim(writer, 413, {"error": "Body terlalu besar"}, tutup=True)
+                    break
+                body = await reader.readexactly(panjang) if panjang else b""
+                try:
+                    status, isi = await self.route(metode, path.split("?", 1)[0], body)
+                except Exception as e:
+                    status, isi = 500, {"error": f"{type(e).__name__}: {e}"}
+                tutup = header.get("connection", "").lower() == "close"
+                await self._kirim(writer, status, isi, tutup)
+                if tutup:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _kirim(writer: asyncio.StreamWriter, status: int, isi: dict, tutup: bool = False):
+        data = json.dumps(isi).encode()
+        writer.write((f"HTTP/1.1 {status} {STATUS_HTTP.get(status, '')}\r\nContent-Type: application/json\r\n"
+                      f"Content-Length: {len(data)}\r\nConnection: {'close' if tutup else 'keep-alive'}\r\n\r\n").encode() + data)
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8500, unix: str | None = None):
+        tugas = [asyncio.create_task(p.jalankan()) for p in self.penggabung.values()]
+        if unix:
+            if os.path.exists(unix):
+                os.remove(unix)
+            server = await asyncio.start_unix_server(self.tangani_koneksi, path=unix)
+            print(f"Server prediksi di unix:{unix} | model: {', '.join(self.penggabung)}")
+        else:
+            server = await asyncio.start_server(self.tangani_koneksi, host, port)
+            print(f"Server prediksi di http://{host}:{port} | model: {', '.join(self.penggabung)}")
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                for t in tugas:
+                    t.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description="Server prediksi lokal dengan micro-batching.")
+    parser.add_argument("--model", action="append", required=True, metavar="NAMA=PATH",
+                        help="Model .tflite, misal umur=model_umur_int8.tflite (boleh berulang)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8500)
+    parser.add_argument("--unix", default=None, help="Path Unix socket (menggantikan host/port)")
+    parser.add_argument("--batch-maks", type=int, default=32)
+    parser.add_argument("--tunggu-ms", type=float, default=5.0, help="Tunggu maksimum sejak permintaan pertama di batch")
+    parser.add_argument("--thread-decode", type=int, default=4)
+    args = parser.parse_args()
+
+    model = dict(m.split("=", 1) for m in args.model)
+    server = ServerPrediksi(model, args.batch_maks, args.tunggu_ms, args.thread_decode)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\nServer dihentikan.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# uji_beban_server.py
+# Generator beban offline untuk server_prediksi.py. Tidak butuh TensorFlow:
+# hanya asyncio + OpenCV untuk membuat gambar uji (atau membaca folder).
+#
+# Menjalankan --klien koneksi keep-alive yang masing-masing mengirim
+# --permintaan POST /prediksi/<model> berturut-turut, lalu melaporkan
+# throughput, latensi p50/p95/p99 dari sisi klien, dan ringkasan /metrik
+# server (rata-rata ukuran batch).
+#
+# Contoh:
+#   python uji_beban_server.py --model umur --klien 32 --permintaan 50
+#   python uji_beban_server.py --unix /tmp/prediksi.sock --folder foto/ --json hasil.json
+import argparse
+import asyncio
+import json
+import os
+import time
+import cv2
+import numpy as np
+
+def gambar_uji(folder: str | None, jumlah: int = 16, ukuran: int = 320, seed: int = 0) -> list[bytes]:
+    if folder:
+        ekstensi = (".jpg", ".jpeg", ".png")
+        paths = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(ekstensi))[:jumlah]
+        hasil = []
+        for path in paths:
+            with open(path, "rb") as f:
+                hasil.append(f.read())
+        if hasil:
+            return hasil
+    rng = np.random.default_rng(seed)
+    return [cv2.imencode(".jpg", rng.integers(0, 256, (ukuran, ukuran, 3), dtype=np.uint8))[1].tobytes()
+            for _ in range(jumlah)]
+
+async def _buka(host: str, port: int, unix: str | None):
+    if unix:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+async def kirim(reader, writer, metode: str, path: str, body: bytes = b"") -> tuple[int, dict]:
+    writer.write((f"{metode} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: image/jpeg\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    panjang = 0
+    while (baris := await reader.readline()) not in (b"\r\n", b""):
+        kunci, nilai = baris.decode("latin-1").split(":", 1)
+        if kunci.strip().lower() == "content-length":
+            panjang = int(nilai)
+    return status, json.loads(await reader.readexactly(panjang))
+
+async def _klien(nomor: int, args, gambar: list[bytes], latensi: list, error: list):
+    reader, writer = await _buka(args.host, args.port, args.unix)
+    try:
+        for i in range(args.permintaan):
+            body = gambar[(nomor + i) % len(gambar)]
+            mulai = time.perf_counter()
+            status, _ = await kirim(reader, writer, "POST", f"/prediksi/{args.model}", body)
+            if status == 200:
+                latensi.append((time.perf_counter() - mulai) * 1000)
+            else:
+                error.append(status)
+    finally:
+        writer.close()
+
+async def jalankan_uji(args) -> dict:
+    gambar = gambar_uji(args.folder)
+    reader, writer = await _buka(args.host, args.port, args.unix)
+    status, sehat = await kirim(reader, writer, "GET", "/sehat")
+    if args.model not in sehat.get("model", []):
+        raise SystemExit(f"Model '{args.model}' tidak dilayani server (tersedia: {sehat.get('model')})")
+    _, metrik_awal = await kirim(reader, writer, "GET", "/metrik")
+
+    latensi, error = [], []
+    mulai = time.perf_counter()
+    await asyncio.gather(*(_klien(n, args, gambar, latensi, error) for n in range(args.klien)))
+    durasi = time.perf_counter() - mulai
+
+    _, metrik = await kirim(reader, writer, "GET", "/metrik")
+    writer.close()
+    m_awal, m = metrik_awal.get(args.model, {}), metrik.get(args.model, {})
+    # Rata-rata ukuran batch khusus selama uji ini (selisih terhadap metrik awal)
+    batch = m.get("batch", 0) - m_awal.get("batch", 0)
+    permintaan = m.get("permintaan", 0) - m_awal.get("permintaan", 0) - m.get("error", 0) + m_awal.get("error", 0)
+    p50, p95, p99 = np.percentile(latensi, [50, 95, 99]) if latensi else (0.0, 0.0, 0.0)
+    return {
+        "klien": args.klien, "permintaan_per_klien": args.permintaan, "berhasil": len(latensi), "error": len(error),
+        "durasi_detik": round(durasi, 2), "permintaan_per_detik": round(len(latensi) / durasi, 1),
+        "latensi_ms": {"p50": round(p50, 2), "p95": round(p95, 2), "p99": round(p99, 2)},
+        "rata2_ukuran_batch": round(permintaan / batch, 2) if batch else 0.0,
+        "metrik_server": m,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban server_prediksi.py.")
+    parser.add_argument("--model", default="umur")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8500)
+    parser.add_argument("--unix", default=None)
+    parser.add_argument("--klien", type=int, default=16, help="Jumlah koneksi bersamaan")
+    parser.add_argument("--permintaan", type=int, default=50, help="Permintaan per klien")
+    parser.add_argument("--folder", default=None, help="Folder gambar uji (default: gambar sintetis)")
+    parser.add_argument("--json", default=None, help="Simpan laporan ke file JSON")
+    args = parser.parse_args()
+
+    laporan = asyncio.run(jalankan_uji(args))
+    print(f"{laporan['berhasil']:,} berhasil | {laporan['error']:,} error | {laporan['durasi_detik']} s")
+    print(f"Throughput: {laporan['permintaan_per_detik']:,} permintaan/detik | rata-rata batch {laporan['rata2_ukuran_batch']}")
+    lat = laporan["latensi_ms"]
+    print(f"Latensi klien: p50 {lat['p50']} ms | p95 {lat['p95']} ms | p99 {lat['p99']} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(laporan, f, indent=2)
+        print(f"Laporan disimpan ke {args.json}")
+
+if __name__ == "__main__":
+    main()